@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from database.init_db import init_database, load_initial_data, check_attendance_today
 from utils.quiz_generator import get_statistics, get_today_words
+from utils.learner import get_current_user_id, track_study_time, render_learner_selector
 
 # 페이지 설정
 st.set_page_config(
@@ -25,8 +26,12 @@ def setup_database():
 
 setup_database()
 
+# 현재 학습자
+user_id = get_current_user_id()
+track_study_time(user_id)
+
 # 출석 체크
-check_attendance_today()
+check_attendance_today(user_id)
 
 # 커스텀 CSS
 st.markdown("""
@@ -83,7 +88,7 @@ st.markdown('<div class="main-header">🇯🇵 일본어 학습</div>', unsafe_a
 st.markdown('<div class="sub-header">매일 조금씩, 꾸준히 일본어 실력을 키워보세요!</div>', unsafe_allow_html=True)
 
 # 통계 가져오기
-stats = get_statistics()
+stats = get_statistics(user_id)
 
 # 대시보드 통계 카드
 col1, col2, col3, col4 = st.columns(4)
@@ -126,7 +131,7 @@ st.markdown("---")
 # 오늘의 학습
 st.subheader("📖 오늘의 학습 단어")
 
-today_words = get_today_words(5)
+today_words = get_today_words(5, user_id)
 
 if today_words:
     cols = st.columns(len(today_words))
@@ -177,8 +182,13 @@ with col3:
 
 # 사이드바
 with st.sidebar:
+    render_learner_selector()
+    st.markdown("---")
+    
     st.markdown("### 📅 학습 정보")
     st.markdown(f"**총 학습일:** {stats['total_study_days']}일")
+    if stats['longest_streak'] > 0:
+        st.markdown(f"**최장 연속 학습:** {stats['longest_streak']}일")
     st.markdown(f"**학습 진도:** {stats['learned_words']}/{stats['total_words']} 단어")
     
     user_added = stats.get('user_added_words', 0)
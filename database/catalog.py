@@ -0,0 +1,58 @@
+import threading
+
+from database.connection import get_connection
+
+# 카탈로그(단어/문법) 읽기 캐시 - {이름: (버전, 값)}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_catalog_version(cursor=None):
+    """카탈로그 데이터 버전 (단어/문법이 바뀔 때마다 증가)"""
+    conn = None
+    if cursor is None:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+    cursor.execute("SELECT value FROM app_meta WHERE key = 'catalog_version'")
+    row = cursor.fetchone()
+
+    if conn is not None:
+        conn.close()
+    return row[0] if row else 0
+
+
+def bump_catalog_version(cursor):
+    """카탈로그 버전 증가 (호출한 쪽 트랜잭션 안에서 실행)"""
+    cursor.execute("UPDATE app_meta SET value = value + 1 WHERE key = 'catalog_version'")
+
+
+def cached_catalog(name, loader):
+    """카탈로그 버전이 같으면 메모리에 있는 결과를 반환
+
+    loader 가 리스트를 돌려주면 호출한 쪽이 리스트를 바꿔도 캐시가 오염되지 않도록
+    얕은 복사본을 반환합니다. 그 밖의 값은 읽기 전용으로 공유합니다.
+    """
+    version = get_catalog_version()
+
+    entry = _cache.get(name)
+    if entry is not None and entry[0] == version:
+        return _shared(entry[1])
+
+    value = loader()
+    with _cache_lock:
+        current = _cache.get(name)
+        # 더 최신 버전이 이미 들어와 있으면 덮어쓰지 않음
+        if current is None or current[0] <= version:
+            _cache[name] = (version, value)
+    return _shared(value)
+
+
+def _shared(value):
+    return list(value) if isinstance(value, list) else value
+
+
+def clear_catalog_cache():
+    """메모리 캐시 비우기"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,152 @@
+import sqlite3
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+DB_PATH = os.path.join(os.path.dirname(__file__), 'nihongo.db')
+
+# 연결 풀 설정
+POOL_SIZE = 8
+EXTRA_POOL_SIZE = 2           # 학습자별 DB 파일 등 보조 DB 의 풀 크기
+MAX_EXTRA_POOLS = 32          # 보조 DB 풀은 최근에 쓴 것만 유지 (연결마다 파일/WAL/메모리 맵을 열어 둠)
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 16384        # 16MB 페이지 캐시
+MMAP_SIZE = 64 * 1024 * 1024  # 64MB 메모리 맵
+
+_pools = OrderedDict()   # {(경로, attach): 풀} - 보조 DB 풀은 최근에 쓴 순서
+_pools_lock = threading.Lock()
+_local = threading.local()
+
+
+class PooledConnection(sqlite3.Connection):
+    """풀에서 빌려온 연결 - close()는 실제로 닫지 않고 풀에 반납"""
+
+    def close(self):
+        release_connection(self)
+
+    def _close(self):
+        sqlite3.Connection.close(self)
+
+
+def _configure(conn):
+    """연결 단위 PRAGMA 설정"""
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.close()
+
+
+def _new_connection(path, attach):
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        factory=PooledConnection
+    )
+    _configure(conn)
+    for alias, attach_path in attach:
+        conn.execute(f"ATTACH DATABASE ? AS {alias}", (attach_path,))
+    conn.pool_key = (path, attach)
+    return conn
+
+
+def _close_pool(pool):
+    """풀에 남아 있는 연결을 모두 닫기"""
+    while True:
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            break
+        conn._close()
+
+
+def _get_pool(key):
+    """key 의 풀 (없으면 만듦) - 보조 DB 풀이 MAX_EXTRA_POOLS 개를 넘으면 가장 오래 안 쓴 풀을 닫음"""
+    main = key == (DB_PATH, ())
+    evicted = []
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = queue.LifoQueue(maxsize=POOL_SIZE if main else EXTRA_POOL_SIZE)
+            extra = [k for k in _pools if k != (DB_PATH, ())]
+            for old_key in extra[:max(0, len(extra) - MAX_EXTRA_POOLS)]:
+                evicted.append(_pools.pop(old_key))
+        elif not main:
+            _pools.move_to_end(key)
+    # 빌려 간 연결은 반납할 때 풀이 없으므로 닫힘 (release_connection)
+    for old_pool in evicted:
+        _close_pool(old_pool)
+    return pool
+
+
+def _checked_out():
+    checked_out = getattr(_local, 'checked_out', None)
+    if checked_out is None:
+        checked_out = _local.checked_out = {}
+    return checked_out
+
+
+def get_connection(path=None, attach=None):
+    """데이터베이스 연결 반환 (스레드별로 풀에서 빌려옴)
+
+    같은 스레드에서 중첩 호출하면 같은 연결을 돌려주며,
+    마지막 close() 호출 시 풀에 반납됩니다.
+    attach 는 {별칭: 경로} 형태로, 새 연결을 만들 때 ATTACH 합니다.
+    """
+    key = (path or DB_PATH, tuple(sorted((attach or {}).items())))
+    checked_out = _checked_out()
+
+    entry = checked_out.get(key)
+    if entry is not None:
+        entry[1] += 1
+        return entry[0]
+
+    try:
+        conn = _get_pool(key).get_nowait()
+    except queue.Empty:
+        conn = _new_connection(*key)
+
+    checked_out[key] = [conn, 1]
+    return conn
+
+
+def release_connection(conn):
+    """연결을 풀에 반납 (커밋되지 않은 변경은 롤백)"""
+    key = conn.pool_key
+    checked_out = _checked_out()
+    entry = checked_out.get(key)
+    if entry is None or entry[0] is not conn:
+        # 다른 스레드의 연결이거나 이미 반납된 연결
+        return
+
+    entry[1] -= 1
+    if entry[1] > 0:
+        return
+
+    del checked_out[key]
+    if conn.in_transaction:
+        conn.rollback()
+
+    # 풀이 가득 찼거나 오래 안 써서 정리된 DB 의 연결은 닫음
+    pool = _pools.get(key)
+    if pool is not None:
+        try:
+            pool.put_nowait(conn)
+            return
+        except queue.Full:
+            pass
+    conn._close()
+
+
+def close_all_connections():
+    """풀에 남아 있는 연결을 모두 닫기"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        _close_pool(pool)
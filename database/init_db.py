@@ -1,217 +1,70 @@
-import sqlite3
-import json
 import os
-from datetime import datetime, date
+import sys
+import threading
+from collections import Counter
+from datetime import date
 
-DB_PATH = os.path.join(os.path.dirname(__file__), 'nihongo.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def get_connection():
-    """데이터베이스 연결 반환"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+from database.migrations import SCHEMA_VERSION, run_migrations
+from database.seed_loader import sync_seed_data
+from database.router import DEFAULT_USER_ID, get_user_connection
 
 def init_database():
-    """데이터베이스 테이블 초기화"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # 단어 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS words (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            japanese TEXT NOT NULL,
-            hiragana TEXT,
-            kanji TEXT,
-            korean TEXT NOT NULL,
-            level TEXT DEFAULT 'N5',
-            category TEXT,
-            example_sentence TEXT,
-            example_korean TEXT,
-            memo_tip TEXT,
-            is_user_added INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # is_user_added 컬럼이 없으면 추가 (기존 DB 호환)
-    try:
-        cursor.execute("ALTER TABLE words ADD COLUMN is_user_added INTEGER DEFAULT 0")
-    except:
-        pass  # 이미 존재하면 무시
-    
-    # 문법 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS grammars (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            pattern TEXT NOT NULL,
-            meaning TEXT NOT NULL,
-            explanation TEXT,
-            level TEXT DEFAULT 'N5',
-            connection_rule TEXT,
-            example_sentence TEXT,
-            example_korean TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # 학습 기록 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS learning_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            content_type TEXT NOT NULL,
-            content_id INTEGER NOT NULL,
-            learned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            review_count INTEGER DEFAULT 0,
-            next_review DATE,
-            mastery_level INTEGER DEFAULT 0
-        )
-    ''')
-    
-    # 퀴즈 결과 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS quiz_results (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            quiz_type TEXT NOT NULL,
-            score INTEGER NOT NULL,
-            total_questions INTEGER NOT NULL,
-            details TEXT,
-            completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # 오답 기록 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS wrong_answers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            question_type TEXT NOT NULL,
-            content_type TEXT NOT NULL,
-            content_id INTEGER NOT NULL,
-            wrong_count INTEGER DEFAULT 1,
-            last_wrong_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            resolved INTEGER DEFAULT 0
-        )
-    ''')
-    
-    # 출석 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS attendance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date DATE UNIQUE NOT NULL,
-            study_minutes INTEGER DEFAULT 0,
-            words_learned INTEGER DEFAULT 0,
-            quiz_taken INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # 일일 학습 할당 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS daily_assignment (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date DATE NOT NULL,
-            content_type TEXT NOT NULL,
-            content_id INTEGER NOT NULL,
-            completed INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-    print("✅ 데이터베이스 초기화 완료!")
+    """데이터베이스 테이블 초기화 (필요한 마이그레이션만 적용)"""
+    applied = run_migrations()
+    if applied:
+        print(f"✅ 데이터베이스 초기화 완료! (스키마 v{SCHEMA_VERSION})")
 
 def load_initial_data():
-    """초기 데이터 로드"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # 이미 데이터가 있는지 확인
-    cursor.execute("SELECT COUNT(*) FROM words")
-    if cursor.fetchone()[0] > 0:
-        print("ℹ️ 이미 데이터가 존재합니다.")
-        conn.close()
-        return
-    
-    # 단어 데이터 로드
-    data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-    words_file = os.path.join(data_dir, 'words_n5.json')
-    grammar_file = os.path.join(data_dir, 'grammar_n5.json')
-    
-    if os.path.exists(words_file):
-        with open(words_file, 'r', encoding='utf-8') as f:
-            words = json.load(f)
-            for word in words:
-                cursor.execute('''
-                    INSERT INTO words (japanese, hiragana, kanji, korean, level, category, example_sentence, example_korean, memo_tip)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    word.get('japanese', ''),
-                    word.get('hiragana', ''),
-                    word.get('kanji', ''),
-                    word.get('korean', ''),
-                    word.get('level', 'N5'),
-                    word.get('category', ''),
-                    word.get('example_sentence', ''),
-                    word.get('example_korean', ''),
-                    word.get('memo_tip', '')
-                ))
-        print(f"✅ {len(words)}개의 단어 데이터 로드 완료!")
-    
-    if os.path.exists(grammar_file):
-        with open(grammar_file, 'r', encoding='utf-8') as f:
-            grammars = json.load(f)
-            for grammar in grammars:
-                cursor.execute('''
-                    INSERT INTO grammars (pattern, meaning, explanation, level, connection_rule, example_sentence, example_korean)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    grammar.get('pattern', ''),
-                    grammar.get('meaning', ''),
-                    grammar.get('explanation', ''),
-                    grammar.get('level', 'N5'),
-                    grammar.get('connection_rule', ''),
-                    grammar.get('example_sentence', ''),
-                    grammar.get('example_korean', '')
-                ))
-        print(f"✅ {len(grammars)}개의 문법 데이터 로드 완료!")
-    
-    conn.commit()
-    conn.close()
+    """초기 데이터 로드 (내용이 바뀐 시드 파일만 다시 동기화)"""
+    changed = sync_seed_data()
+    if not changed:
+        print("ℹ️ 시드 데이터가 최신 상태입니다.")
+    return changed
 
-def check_attendance_today():
-    """오늘 출석 체크"""
-    conn = get_connection()
-    cursor = conn.cursor()
+# 이미 출석 처리한 학습자 {user_id: 날짜} - 날짜가 바뀌기 전까지는 DB 에 묻지 않음
+_checked_in = {}
+_checked_in_lock = threading.Lock()
+
+def check_attendance_today(user_id=DEFAULT_USER_ID):
+    """오늘 출석 체크 (학습자별로 하루 한 번만 INSERT OR IGNORE)"""
     today = date.today().isoformat()
-    
-    cursor.execute("SELECT * FROM attendance WHERE date = ?", (today,))
-    result = cursor.fetchone()
-    
-    if not result:
-        cursor.execute("INSERT INTO attendance (date) VALUES (?)", (today,))
+    if _checked_in.get(user_id) == today:
+        return True
+    
+    with _checked_in_lock:
+        if _checked_in.get(user_id) == today:
+            return True
+        
+        conn = get_user_connection(user_id)
+        cursor = conn.cursor()
+        cursor.execute("INSERT OR IGNORE INTO attendance (user_id, date) VALUES (?, ?)", (user_id, today))
+        if cursor.rowcount:
+            print("✅ 오늘 출석 체크!")
         conn.commit()
-        print("✅ 오늘 출석 체크!")
-    
-    conn.close()
+        conn.close()
+        
+        _checked_in[user_id] = today
     return True
 
-def update_attendance(words_learned=0, quiz_taken=0, study_minutes=0):
-    """출석 정보 업데이트"""
-    conn = get_connection()
+def add_study_minutes(items, user_id=DEFAULT_USER_ID):
+    """날짜별 학습 시간 누적 - [(날짜, 분), ...] 를 한 트랜잭션으로 (출석 행이 없으면 만듦)"""
+    totals = Counter()
+    for day, minutes in items:
+        totals[day] += minutes
+    if not totals:
+        return 0
+    
+    conn = get_user_connection(user_id)
     cursor = conn.cursor()
-    today = date.today().isoformat()
-    
-    cursor.execute('''
-        UPDATE attendance 
-        SET words_learned = words_learned + ?,
-            quiz_taken = quiz_taken + ?,
-            study_minutes = study_minutes + ?
-        WHERE date = ?
-    ''', (words_learned, quiz_taken, study_minutes, today))
-    
+    cursor.executemany('''
+        INSERT INTO attendance (user_id, date, study_minutes) VALUES (?, ?, ?)
+        ON CONFLICT (user_id, date) DO UPDATE SET study_minutes = study_minutes + excluded.study_minutes
+    ''', [(user_id, day, minutes) for day, minutes in totals.items()])
     conn.commit()
     conn.close()
+    return len(totals)
 
 if __name__ == "__main__":
     init_database()
@@ -0,0 +1,81 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import get_connection
+from database.router import PROGRESS_BACKEND, get_users, get_user_connection
+
+# 결과 화면이 다시 그려질 때마다 저장되던 중복 퀴즈 결과를 찾는 기준 (직전 결과와의 간격, 초)
+DUPLICATE_WINDOW_SECONDS = 600
+
+# 같은 학습자의 바로 앞 결과와 내용이 같고 짧은 간격 안에 저장된 토큰 없는 결과
+_DUPLICATE_QUIZ_SQL = '''
+    SELECT id FROM (
+        SELECT id, session_token, quiz_type, score, total_questions, details, completed_at,
+            LAG(quiz_type) OVER w AS prev_type,
+            LAG(score) OVER w AS prev_score,
+            LAG(total_questions) OVER w AS prev_total,
+            LAG(details) OVER w AS prev_details,
+            LAG(completed_at) OVER w AS prev_at
+        FROM quiz_results
+        {where}
+        WINDOW w AS (PARTITION BY user_id ORDER BY id)
+    )
+    WHERE session_token IS NULL
+      AND quiz_type = prev_type AND score = prev_score AND total_questions = prev_total
+      AND details IS prev_details
+      AND (julianday(completed_at) - julianday(prev_at)) * 86400 <= ?
+'''
+
+
+def _dedupe_quiz_results(cursor, user_id=None, window_seconds=DUPLICATE_WINDOW_SECONDS, dry_run=False):
+    """중복 퀴즈 결과 삭제 후 출석의 퀴즈 횟수를 남은 결과 수로 다시 맞춤 - 삭제(대상) 수 반환"""
+    where = '' if user_id is None else 'WHERE user_id = ?'
+    params = ([] if user_id is None else [user_id]) + [window_seconds]
+
+    cursor.execute(_DUPLICATE_QUIZ_SQL.format(where=where), params)
+    ids = [row[0] for row in cursor.fetchall()]
+    if dry_run or not ids:
+        return len(ids)
+
+    cursor.executemany("DELETE FROM quiz_results WHERE id = ?", [(i,) for i in ids])
+
+    # quiz_taken 은 퀴즈 완료 때만 늘어나므로 날짜별 결과 수로 다시 계산
+    user_filter = '' if user_id is None else 'AND a.user_id = ?'
+    cursor.execute(f'''
+        UPDATE attendance AS a
+        SET quiz_taken = (
+            SELECT COUNT(*) FROM quiz_results q
+            WHERE q.user_id = a.user_id AND DATE(q.completed_at, 'localtime') = a.date
+        )
+        WHERE 1 {user_filter}
+    ''', [] if user_id is None else [user_id])
+    return len(ids)
+
+
+def dedupe_quiz_results(window_seconds=DUPLICATE_WINDOW_SECONDS, dry_run=False):
+    """모든 학습자의 중복 퀴즈 결과 정리 (dry_run 이면 개수만 셈)"""
+    if PROGRESS_BACKEND == 'per_user':
+        targets = [(get_user_connection(u['id']), u['id']) for u in get_users()]
+    else:
+        targets = [(get_connection(), None)]
+
+    removed = 0
+    for conn, user_id in targets:
+        cursor = conn.cursor()
+        # dry_run 은 읽기만 하므로 쓰기 잠금을 잡지 않는 읽기 트랜잭션
+        cursor.execute("BEGIN" if dry_run else "BEGIN IMMEDIATE")
+        removed += _dedupe_quiz_results(cursor, user_id, window_seconds, dry_run)
+        conn.commit()
+        conn.close()
+
+    if dry_run:
+        print(f"ℹ️ 중복 퀴즈 결과 {removed}건 발견 (삭제하지 않음)")
+    else:
+        print(f"✅ 중복 퀴즈 결과 {removed}건 정리 완료!")
+    return removed
+
+
+if __name__ == "__main__":
+    dedupe_quiz_results(dry_run='--dry-run' in sys.argv[1:])
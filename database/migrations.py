@@ -0,0 +1,797 @@
+from database.connection import get_connection
+
+
+def _column_exists(cursor, table, column):
+    cursor.execute(f"PRAGMA main.table_info({table})")
+    return any(row['name'] == column for row in cursor.fetchall())
+
+
+def _create_catalog_tables(cursor):
+    """단어/문법 카탈로그 테이블 (공용 DB 에만 존재)"""
+    # 단어 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS words (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            japanese TEXT NOT NULL,
+            hiragana TEXT,
+            kanji TEXT,
+            korean TEXT NOT NULL,
+            level TEXT DEFAULT 'N5',
+            category TEXT,
+            example_sentence TEXT,
+            example_korean TEXT,
+            memo_tip TEXT,
+            is_user_added INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # is_user_added 컬럼이 없으면 추가 (기존 DB 호환)
+    if not _column_exists(cursor, 'words', 'is_user_added'):
+        cursor.execute("ALTER TABLE words ADD COLUMN is_user_added INTEGER DEFAULT 0")
+
+    # 문법 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS grammars (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pattern TEXT NOT NULL,
+            meaning TEXT NOT NULL,
+            explanation TEXT,
+            level TEXT DEFAULT 'N5',
+            connection_rule TEXT,
+            example_sentence TEXT,
+            example_korean TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _migrate_v1(cursor, catalog):
+    """기본 스키마"""
+    if catalog:
+        _create_catalog_tables(cursor)
+
+    # 학습 기록 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS learning_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_type TEXT NOT NULL,
+            content_id INTEGER NOT NULL,
+            learned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            review_count INTEGER DEFAULT 0,
+            next_review DATE,
+            mastery_level INTEGER DEFAULT 0
+        )
+    ''')
+
+    # 퀴즈 결과 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS quiz_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            quiz_type TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            total_questions INTEGER NOT NULL,
+            details TEXT,
+            completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # 오답 기록 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS wrong_answers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question_type TEXT NOT NULL,
+            content_type TEXT NOT NULL,
+            content_id INTEGER NOT NULL,
+            wrong_count INTEGER DEFAULT 1,
+            last_wrong_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            resolved INTEGER DEFAULT 0
+        )
+    ''')
+
+    # 출석 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attendance (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE UNIQUE NOT NULL,
+            study_minutes INTEGER DEFAULT 0,
+            words_learned INTEGER DEFAULT 0,
+            quiz_taken INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # 일일 학습 할당 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS daily_assignment (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE NOT NULL,
+            content_type TEXT NOT NULL,
+            content_id INTEGER NOT NULL,
+            completed INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _migrate_v2(cursor, catalog):
+    """조회 컬럼 인덱스 및 중복 방지 유니크 제약"""
+    # 기존 DB의 중복 학습 기록 정리 (가장 오래된 행에 복습 횟수 합산)
+    cursor.execute('''
+        UPDATE learning_history
+        SET review_count = (
+            SELECT SUM(review_count) + COUNT(*) - 1 FROM learning_history lh
+            WHERE lh.content_type = learning_history.content_type
+              AND lh.content_id = learning_history.content_id
+        )
+        WHERE id IN (
+            SELECT MIN(id) FROM learning_history
+            GROUP BY content_type, content_id HAVING COUNT(*) > 1
+        )
+    ''')
+    cursor.execute('''
+        DELETE FROM learning_history
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM learning_history GROUP BY content_type, content_id
+        )
+    ''')
+
+    # 기존 DB의 중복 오답 기록 정리 (가장 오래된 행에 틀린 횟수 합산)
+    cursor.execute('''
+        UPDATE wrong_answers
+        SET (wrong_count, last_wrong_at, resolved) = (
+            SELECT SUM(wrong_count), MAX(last_wrong_at), MIN(resolved) FROM wrong_answers wa
+            WHERE wa.question_type = wrong_answers.question_type
+              AND wa.content_type = wrong_answers.content_type
+              AND wa.content_id = wrong_answers.content_id
+        )
+        WHERE id IN (
+            SELECT MIN(id) FROM wrong_answers
+            GROUP BY question_type, content_type, content_id HAVING COUNT(*) > 1
+        )
+    ''')
+    cursor.execute('''
+        DELETE FROM wrong_answers
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM wrong_answers
+            GROUP BY question_type, content_type, content_id
+        )
+    ''')
+
+    cursor.execute('''
+        DELETE FROM daily_assignment
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM daily_assignment
+            GROUP BY date, content_type, content_id
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_learning_history_content
+        ON learning_history (content_type, content_id)
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_wrong_answers_content
+        ON wrong_answers (question_type, content_type, content_id)
+    ''')
+    # 오답노트 조회용 (content_type, resolved 필터 + 정렬 컬럼 포함)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_wrong_answers_open
+        ON wrong_answers (content_type, resolved, wrong_count DESC, last_wrong_at DESC)
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_daily_assignment_content
+        ON daily_assignment (date, content_type, content_id)
+    ''')
+    if catalog:
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS ix_words_user_added
+            ON words (is_user_added, id)
+        ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_quiz_results_completed
+        ON quiz_results (completed_at)
+    ''')
+
+
+def _migrate_v3(cursor, catalog):
+    """시드 데이터 출처 추적 (파일별 해시 및 행 단위 자연키)"""
+    if not catalog:
+        return
+
+    for table in ('words', 'grammars'):
+        if not _column_exists(cursor, table, 'source'):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN source TEXT")
+        if not _column_exists(cursor, table, 'seed_key'):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN seed_key TEXT")
+
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_words_seed
+        ON words (source, seed_key) WHERE source IS NOT NULL
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_grammars_seed
+        ON grammars (source, seed_key) WHERE source IS NOT NULL
+    ''')
+
+    # 시드 파일별 내용 해시
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS seed_sources (
+            source TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            row_count INTEGER DEFAULT 0,
+            loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _migrate_v4(cursor, catalog):
+    """학습자 구분 - 학습 진도 테이블에 user_id 추가"""
+    if catalog:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        # 기존 데이터는 기본 학습자(1번) 소유
+        cursor.execute("INSERT OR IGNORE INTO users (id, name) VALUES (1, '기본 학습자')")
+
+    for table in ('learning_history', 'quiz_results', 'wrong_answers', 'daily_assignment'):
+        if not _column_exists(cursor, table, 'user_id'):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN user_id INTEGER NOT NULL DEFAULT 1")
+
+    # 유니크 제약에 user_id 포함
+    for index in ('ux_learning_history_content', 'ux_wrong_answers_content', 'ix_wrong_answers_open',
+                  'ux_daily_assignment_content', 'ix_quiz_results_completed'):
+        cursor.execute(f"DROP INDEX IF EXISTS main.{index}")
+
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_learning_history_content
+        ON learning_history (user_id, content_type, content_id)
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_wrong_answers_content
+        ON wrong_answers (user_id, question_type, content_type, content_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_wrong_answers_open
+        ON wrong_answers (user_id, content_type, resolved, wrong_count DESC, last_wrong_at DESC)
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_daily_assignment_content
+        ON daily_assignment (user_id, date, content_type, content_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_quiz_results_completed
+        ON quiz_results (user_id, completed_at)
+    ''')
+
+    # attendance 는 date 단독 UNIQUE 제약이 있어 테이블을 다시 만듦
+    if not _column_exists(cursor, 'attendance', 'user_id'):
+        cursor.execute('''
+            CREATE TABLE attendance_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL DEFAULT 1,
+                date DATE NOT NULL,
+                study_minutes INTEGER DEFAULT 0,
+                words_learned INTEGER DEFAULT 0,
+                quiz_taken INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (user_id, date)
+            )
+        ''')
+        cursor.execute('''
+            INSERT INTO attendance_new (id, date, study_minutes, words_learned, quiz_taken, created_at)
+            SELECT id, date, study_minutes, words_learned, quiz_taken, created_at FROM main.attendance
+        ''')
+        cursor.execute("DROP TABLE main.attendance")
+        cursor.execute("ALTER TABLE attendance_new RENAME TO attendance")
+
+
+def _migrate_v5(cursor, catalog):
+    """카탈로그 데이터 버전 카운터 (읽기 캐시 무효화용)"""
+    if not catalog:
+        return
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS app_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO app_meta (key, value) VALUES ('catalog_version', 0)")
+
+
+# FTS5 색인 대상 컬럼 (trigram 토크나이저 - 3글자 이상 부분 문자열 검색)
+FTS_TABLES = {
+    'words_fts': ('words', ['japanese', 'hiragana', 'kanji', 'korean']),
+    'grammars_fts': ('grammars', ['pattern', 'meaning', 'explanation']),
+}
+
+
+def _migrate_v6(cursor, catalog):
+    """단어/문법 전문 검색 색인 (FTS5) 과 동기화 트리거"""
+    if not catalog:
+        return
+
+    for fts, (table, columns) in FTS_TABLES.items():
+        col_list = ', '.join(columns)
+        new_values = ', '.join(f"new.{c}" for c in columns)
+        old_values = ', '.join(f"old.{c}" for c in columns)
+
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {col_list},
+                content='{table}', content_rowid='id', tokenize='trigram'
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {col_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts} (rowid, {col_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def _migrate_v7(cursor, catalog):
+    """단어 목록 필터 + keyset 페이지 조회용 인덱스 (is_user_added DESC, id DESC 순서)"""
+    if not catalog:
+        return
+
+    # keyset 비교가 NULL 에서 끊기지 않도록 기본값으로 채움
+    cursor.execute("UPDATE words SET is_user_added = 0 WHERE is_user_added IS NULL")
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_words_category_page
+        ON words (category, is_user_added, id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_words_level_page
+        ON words (level, is_user_added, id)
+    ''')
+
+
+# (트리거 이름, 테이블, 이벤트, 조건, 실행할 문장) - stats_snapshot 증분 갱신
+_QUIZ_PCT = "{row}.score * 100.0 / NULLIF({row}.total_questions, 0)"
+
+STATS_TRIGGERS = [
+    ('stats_learning_ai', 'learning_history', 'AFTER INSERT', "new.content_type = 'word'",
+     "UPDATE stats_snapshot SET learned_words = learned_words + 1 WHERE user_id = new.user_id"),
+    ('stats_learning_ad', 'learning_history', 'AFTER DELETE', "old.content_type = 'word'",
+     "UPDATE stats_snapshot SET learned_words = learned_words - 1 WHERE user_id = old.user_id"),
+    ('stats_quiz_ai', 'quiz_results', 'AFTER INSERT', None, f'''
+        UPDATE stats_snapshot SET
+            quiz_count = quiz_count + 1,
+            scored_quiz_count = scored_quiz_count + (new.total_questions > 0),
+            score_pct_sum = score_pct_sum + COALESCE({_QUIZ_PCT.format(row='new')}, 0),
+            best_score = MAX(best_score, COALESCE({_QUIZ_PCT.format(row='new')}, 0))
+        WHERE user_id = new.user_id'''),
+    ('stats_quiz_ad', 'quiz_results', 'AFTER DELETE', None, f'''
+        UPDATE stats_snapshot SET
+            quiz_count = quiz_count - 1,
+            scored_quiz_count = scored_quiz_count - (old.total_questions > 0),
+            score_pct_sum = score_pct_sum - COALESCE({_QUIZ_PCT.format(row='old')}, 0),
+            best_score = (SELECT COALESCE(MAX(score * 100.0 / total_questions), 0) FROM quiz_results
+                          WHERE user_id = old.user_id AND total_questions > 0)
+        WHERE user_id = old.user_id'''),
+    ('stats_attendance_ai', 'attendance', 'AFTER INSERT', None,
+     "UPDATE stats_snapshot SET study_days = study_days + 1 WHERE user_id = new.user_id"),
+    ('stats_attendance_ad', 'attendance', 'AFTER DELETE', None,
+     "UPDATE stats_snapshot SET study_days = study_days - 1 WHERE user_id = old.user_id"),
+]
+
+# words 변경 시 app_meta 의 단어 수 갱신
+WORD_COUNT_TRIGGERS = [
+    ('word_count_ai', 'AFTER INSERT', '''
+        UPDATE app_meta SET value = value + 1 WHERE key = 'word_count';
+        UPDATE app_meta SET value = value + (new.is_user_added = 1) WHERE key = 'user_added_word_count';'''),
+    ('word_count_ad', 'AFTER DELETE', '''
+        UPDATE app_meta SET value = value - 1 WHERE key = 'word_count';
+        UPDATE app_meta SET value = value - (old.is_user_added = 1) WHERE key = 'user_added_word_count';'''),
+    ('word_count_au', 'AFTER UPDATE OF is_user_added', '''
+        UPDATE app_meta SET value = value + (new.is_user_added = 1) - (old.is_user_added = 1)
+        WHERE key = 'user_added_word_count';'''),
+]
+
+
+# 트리거 안의 INSERT OR IGNORE 는 트리거를 실행한 문장이 UPSERT 이면 그 충돌 처리로 바뀌어
+# (DO UPDATE 쪽에서 실행된 UPDATE 트리거) 오류가 나므로 ON CONFLICT DO NOTHING 으로 씀
+_ENSURE_SNAPSHOT_ROW = "INSERT INTO stats_snapshot (user_id) VALUES ({row}.user_id) ON CONFLICT (user_id) DO NOTHING"
+
+HISTORY_TRIGGER_EVENTS = (('INSERT', 'new'), ('UPDATE', 'new'), ('DELETE', 'old'))
+
+
+def _create_stats_triggers(cursor):
+    for name, table, event, condition, statement in STATS_TRIGGERS:
+        row = 'old' if 'DELETE' in event else 'new'
+        when = f"WHEN {condition}" if condition else ''
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {name} {event} ON {table} {when} BEGIN
+                {_ENSURE_SNAPSHOT_ROW.format(row=row)};
+                {statement};
+            END
+        ''')
+
+
+def _create_history_triggers(cursor):
+    for event, row in HISTORY_TRIGGER_EVENTS:
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS stats_history_{event.lower()} AFTER {event} ON learning_history BEGIN
+                {_ENSURE_SNAPSHOT_ROW.format(row=row)};
+                UPDATE stats_snapshot SET history_version = history_version + 1 WHERE user_id = {row}.user_id;
+            END
+        ''')
+
+
+def _migrate_v8(cursor, catalog):
+    """학습 통계 스냅샷 테이블과 증분 갱신 트리거 (대시보드는 한 행만 조회)"""
+    # 마이그레이션 모듈이 로드될 때 router 를 순환 import 하지 않도록 여기서 import
+    from database.stats import refresh_catalog_counts, refresh_stats_snapshot
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stats_snapshot (
+            user_id INTEGER PRIMARY KEY,
+            learned_words INTEGER NOT NULL DEFAULT 0,
+            quiz_count INTEGER NOT NULL DEFAULT 0,
+            scored_quiz_count INTEGER NOT NULL DEFAULT 0,
+            score_pct_sum REAL NOT NULL DEFAULT 0,
+            best_score REAL NOT NULL DEFAULT 0,
+            study_days INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    _create_stats_triggers(cursor)
+    refresh_stats_snapshot(cursor)
+
+    if catalog:
+        for name, event, statements in WORD_COUNT_TRIGGERS:
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {name} {event} ON words BEGIN
+                    {statements}
+                END
+            ''')
+        refresh_catalog_counts(cursor)
+
+
+def _migrate_v9(cursor, catalog):
+    """복습 일정 (SM-2) 컬럼과 복습 대기열 인덱스"""
+    if not _column_exists(cursor, 'learning_history', 'ease_factor'):
+        cursor.execute("ALTER TABLE learning_history ADD COLUMN ease_factor REAL NOT NULL DEFAULT 2.5")
+    if not _column_exists(cursor, 'learning_history', 'interval_days'):
+        cursor.execute("ALTER TABLE learning_history ADD COLUMN interval_days INTEGER NOT NULL DEFAULT 0")
+
+    # 일정이 없던 기존 기록은 학습한 날부터 복습 대상
+    cursor.execute('''
+        UPDATE learning_history
+        SET next_review = DATE(learned_at, 'localtime'), mastery_level = COALESCE(mastery_level, 0)
+        WHERE next_review IS NULL
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_learning_history_due
+        ON learning_history (user_id, next_review, mastery_level)
+    ''')
+
+
+def _migrate_v10(cursor, catalog):
+    """미리 만들어 둔 퀴즈 보관 테이블과 학습 기록 변경 카운터"""
+    if not _column_exists(cursor, 'stats_snapshot', 'history_version'):
+        cursor.execute("ALTER TABLE stats_snapshot ADD COLUMN history_version INTEGER NOT NULL DEFAULT 0")
+
+    _create_history_triggers(cursor)
+
+    # questions 는 id 만 담은 JSON (compact_quiz)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS quiz_pool (
+            user_id INTEGER NOT NULL,
+            quiz_type TEXT NOT NULL,
+            quiz_date DATE NOT NULL,
+            stamp TEXT NOT NULL,
+            questions TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, quiz_type, quiz_date)
+        )
+    ''')
+
+
+def _migrate_v11(cursor, catalog):
+    """퀴즈 완료 토큰 - 같은 퀴즈 세션의 결과는 한 번만 저장"""
+    if not _column_exists(cursor, 'quiz_results', 'session_token'):
+        cursor.execute("ALTER TABLE quiz_results ADD COLUMN session_token TEXT")
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_quiz_results_session
+        ON quiz_results (user_id, session_token) WHERE session_token IS NOT NULL
+    ''')
+
+
+def _migrate_v12(cursor, catalog):
+    """문제별 답안 이벤트 로그 (추가만 가능, 값은 정수 코드 - utils/answer_log.py 참고)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS answer_events (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            session INTEGER NOT NULL,
+            quiz_kind INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            item_kind INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            question_kind INTEGER NOT NULL,
+            chosen INTEGER NOT NULL,
+            chosen_id INTEGER NOT NULL,
+            correct INTEGER NOT NULL,
+            response_ms INTEGER,
+            answered_at INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_answer_events_user
+        ON answer_events (user_id, answered_at)
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS answer_events_no_update BEFORE UPDATE ON answer_events BEGIN
+            SELECT RAISE(ABORT, 'answer_events 는 추가만 가능합니다');
+        END
+    ''')
+
+
+def _migrate_v13(cursor, catalog):
+    """문항 난이도 / 학습자 실력 추정 (utils/irt.py) 용 응답 집계와 결과 보관 테이블"""
+    # 학습자 x 문항별 응답 수 - 추정은 이벤트 대신 이 집계만 읽음
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS item_response_counts (
+            user_id INTEGER NOT NULL,
+            item_kind INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            correct INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, item_kind, item_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS answer_events_counts_ai AFTER INSERT ON answer_events BEGIN
+            INSERT INTO item_response_counts (user_id, item_kind, item_id, attempts, correct)
+            VALUES (new.user_id, new.item_kind, new.item_id, 1, new.correct)
+            ON CONFLICT (user_id, item_kind, item_id) DO UPDATE
+            SET attempts = attempts + 1, correct = correct + excluded.correct;
+        END
+    ''')
+    cursor.execute('''
+        INSERT OR REPLACE INTO item_response_counts (user_id, item_kind, item_id, attempts, correct)
+        SELECT user_id, item_kind, item_id, COUNT(*), SUM(correct)
+        FROM answer_events GROUP BY user_id, item_kind, item_id
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS learner_ability (
+            user_id INTEGER PRIMARY KEY,
+            ability REAL NOT NULL,
+            se REAL NOT NULL,
+            attempts INTEGER NOT NULL,
+            fitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # 문항 난이도는 모든 학습자의 응답으로 추정하므로 카탈로그 DB 에 보관
+    if catalog:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS item_difficulty (
+                item_kind INTEGER NOT NULL,
+                item_id INTEGER NOT NULL,
+                difficulty REAL NOT NULL,
+                se REAL NOT NULL,
+                attempts INTEGER NOT NULL,
+                correct INTEGER NOT NULL,
+                fitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (item_kind, item_id)
+            ) WITHOUT ROWID
+        ''')
+
+
+# 일/주 단위 집계 - 같은 열을 daily_rollup(day) 과 weekly_rollup(week_start, 월요일) 에 함께 더함
+ROLLUP_COLUMNS = ('quiz_count', 'quiz_questions', 'quiz_correct', 'items_learned', 'study_minutes', 'attended')
+
+# (트리거 이름, 테이블, 이벤트, 날짜 식, {열: 더할 값})
+ROLLUP_TRIGGERS = [
+    ('rollup_quiz_ai', 'quiz_results', 'AFTER INSERT', "DATE(new.completed_at, 'localtime')",
+     {'quiz_count': '1', 'quiz_questions': 'new.total_questions', 'quiz_correct': 'new.score'}),
+    ('rollup_quiz_ad', 'quiz_results', 'AFTER DELETE', "DATE(old.completed_at, 'localtime')",
+     {'quiz_count': '-1', 'quiz_questions': '-old.total_questions', 'quiz_correct': '-old.score'}),
+    ('rollup_learning_ai', 'learning_history', 'AFTER INSERT', "DATE(new.learned_at, 'localtime')",
+     {'items_learned': '1'}),
+    ('rollup_learning_ad', 'learning_history', 'AFTER DELETE', "DATE(old.learned_at, 'localtime')",
+     {'items_learned': '-1'}),
+    ('rollup_attendance_ai', 'attendance', 'AFTER INSERT', "new.date",
+     {'attended': '1', 'study_minutes': 'COALESCE(new.study_minutes, 0)'}),
+    ('rollup_attendance_au', 'attendance', 'AFTER UPDATE OF study_minutes', "new.date",
+     {'study_minutes': 'COALESCE(new.study_minutes, 0) - COALESCE(old.study_minutes, 0)'}),
+    ('rollup_attendance_ad', 'attendance', 'AFTER DELETE', "old.date",
+     {'attended': '-1', 'study_minutes': '-COALESCE(old.study_minutes, 0)'}),
+]
+
+
+def week_start_sql(day_expr):
+    """날짜 식이 속한 주의 월요일 (SQL 식)"""
+    return f"DATE({day_expr}, '-6 days', 'weekday 1')"
+
+
+def _create_rollup_trigger(cursor, name, table, event, day_expr, deltas, row, when=''):
+    """row(new/old) 의 day_expr 날짜가 속한 일/주 집계에 deltas 를 더하는 트리거"""
+    names = ', '.join(deltas)
+    values = ', '.join(deltas.values())
+    updates = ', '.join(f"{col} = {col} + excluded.{col}" for col in deltas)
+    statements = []
+    for rollup, key, key_expr in (('daily_rollup', 'day', day_expr),
+                                  ('weekly_rollup', 'week_start', week_start_sql(day_expr))):
+        statements.append(f'''
+            INSERT INTO {rollup} (user_id, {key}, {names}) VALUES ({row}.user_id, {key_expr}, {values})
+            ON CONFLICT (user_id, {key}) DO UPDATE SET {updates};''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {name} {event} ON {table} WHEN {day_expr} IS NOT NULL {when} BEGIN
+            {''.join(statements)}
+        END
+    ''')
+
+
+def _migrate_v14(cursor, catalog):
+    """성과 페이지용 일/주 단위 집계 테이블과 증분 갱신 트리거"""
+    from database.stats import refresh_rollups
+
+    columns = ',\n'.join(f"            {col} INTEGER NOT NULL DEFAULT 0" for col in ROLLUP_COLUMNS)
+    for table, key in (('daily_rollup', 'day'), ('weekly_rollup', 'week_start')):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                user_id INTEGER NOT NULL,
+                {key} DATE NOT NULL,
+{columns},
+                PRIMARY KEY (user_id, {key})
+            ) WITHOUT ROWID
+        ''')
+
+    for name, table, event, day_expr, deltas in ROLLUP_TRIGGERS:
+        row = 'old' if 'DELETE' in event else 'new'
+        _create_rollup_trigger(cursor, name, table, event, day_expr, deltas, row)
+    refresh_rollups(cursor)
+
+
+def _migrate_v15(cursor, catalog):
+    """스냅샷 트리거를 UPSERT 에서도 동작하는 형태로 다시 만듦
+
+    예전 v8/v10 트리거는 INSERT OR IGNORE 로 스냅샷 행을 만들어, 학습 기록 UPSERT 의
+    DO UPDATE 쪽에서 실행되면 UNIQUE 제약 오류가 났습니다.
+    """
+    for name, *_ in STATS_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for event, _ in HISTORY_TRIGGER_EVENTS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS stats_history_{event.lower()}")
+    _create_stats_triggers(cursor)
+    _create_history_triggers(cursor)
+
+
+def _migrate_v16(cursor, catalog):
+    """answer_events 삭제도 막음 - v12 는 UPDATE 만 막아서 추가 전용이 아니었음"""
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS answer_events_no_delete BEFORE DELETE ON answer_events BEGIN
+            SELECT RAISE(ABORT, 'answer_events 는 추가만 가능합니다');
+        END
+    ''')
+
+
+def _migrate_v17(cursor, catalog):
+    """학습자별 답안 수 - 실력 추정을 다시 해야 하는지 한 행만 읽고 판단 (utils/irt.py)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS answer_totals (
+            user_id INTEGER PRIMARY KEY,
+            attempts INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS answer_events_totals_ai AFTER INSERT ON answer_events BEGIN
+            INSERT INTO answer_totals (user_id, attempts) VALUES (new.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET attempts = attempts + 1;
+        END
+    ''')
+    cursor.execute('''
+        INSERT OR REPLACE INTO answer_totals (user_id, attempts)
+        SELECT user_id, COUNT(*) FROM answer_events GROUP BY user_id
+    ''')
+
+
+# 다시 학습하면 UPSERT 가 learned_at 을 바꾸므로 학습 항목 수를 옛 날짜에서 새 날짜로 옮김
+# (트리거 이름, 날짜 식, 행, {열: 더할 값})
+LEARNING_MOVE_TRIGGERS = [
+    ('rollup_learning_au_old', "DATE(old.learned_at, 'localtime')", 'old', {'items_learned': '-1'}),
+    ('rollup_learning_au_new', "DATE(new.learned_at, 'localtime')", 'new', {'items_learned': '1'}),
+]
+
+
+def _migrate_v18(cursor, catalog):
+    """학습 기록의 learned_at 변경을 일/주 집계에 반영
+
+    v14 트리거는 INSERT/DELETE 만 다뤄, 다시 학습한 항목이 집계에서는 처음 날짜에 남고
+    refresh_rollups 는 새 날짜로 세어 둘이 달라졌습니다.
+    """
+    from database.stats import refresh_rollups
+
+    changed = "AND DATE(old.learned_at, 'localtime') IS NOT DATE(new.learned_at, 'localtime')"
+    for name, day_expr, row, deltas in LEARNING_MOVE_TRIGGERS:
+        _create_rollup_trigger(cursor, name, 'learning_history', 'AFTER UPDATE OF learned_at', day_expr, deltas,
+                               row, changed)
+    refresh_rollups(cursor)
+
+
+# 순서대로 적용되는 마이그레이션 (인덱스 + 1 = 스키마 버전)
+MIGRATIONS = [
+    _migrate_v1,
+    _migrate_v2,
+    _migrate_v3,
+    _migrate_v4,
+    _migrate_v5,
+    _migrate_v6,
+    _migrate_v7,
+    _migrate_v8,
+    _migrate_v9,
+    _migrate_v10,
+    _migrate_v11,
+    _migrate_v12,
+    _migrate_v13,
+    _migrate_v14,
+    _migrate_v15,
+    _migrate_v16,
+    _migrate_v17,
+    _migrate_v18,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(cursor):
+    cursor.execute("PRAGMA main.user_version")
+    return cursor.fetchone()[0]
+
+
+def run_migrations(conn=None, catalog=True):
+    """PRAGMA user_version 기준으로 필요한 마이그레이션만 적용
+
+    conn 을 주지 않으면 공용 DB 에 적용합니다. 학습자별 DB 파일처럼
+    학습 진도 테이블만 있는 DB 에는 catalog=False 로 호출합니다.
+    적용한 마이그레이션 수를 반환하며, 스키마가 최신이면 DDL을 실행하지 않습니다.
+    """
+    if conn is None:
+        conn = get_connection()
+    cursor = conn.cursor()
+
+    current = get_schema_version(cursor)
+    if current >= SCHEMA_VERSION:
+        conn.close()
+        return 0
+
+    applied = 0
+    try:
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            cursor.execute("BEGIN IMMEDIATE")
+            # 다른 프로세스가 먼저 적용했을 수 있으므로 잠금 후 다시 확인
+            if get_schema_version(cursor) >= version:
+                conn.rollback()
+                continue
+            MIGRATIONS[version - 1](cursor, catalog)
+            cursor.execute(f"PRAGMA main.user_version = {version}")
+            conn.commit()
+            applied += 1
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return applied
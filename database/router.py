@@ -0,0 +1,95 @@
+import os
+import re
+import threading
+
+from database.connection import DB_PATH, get_connection
+from database.migrations import run_migrations
+
+DEFAULT_USER_ID = 1
+
+# 학습 진도 저장 방식
+#   shared   - 공용 DB 의 user_id 컬럼으로 구분 (기본값)
+#   per_user - 학습자마다 별도 SQLite 파일 (카탈로그 DB 는 ATTACH)
+PROGRESS_BACKEND = os.environ.get('NIHONGO_PROGRESS_BACKEND', 'shared')
+USER_DB_DIR = os.path.join(os.path.dirname(__file__), 'users')
+
+_ready_paths = set()
+_ready_lock = threading.Lock()
+
+
+def user_db_path(user_id):
+    """학습자별 DB 파일 경로"""
+    return os.path.join(USER_DB_DIR, f"user_{int(user_id)}.db")
+
+
+def _ensure_user_db(path, user_id):
+    """학습자별 DB 파일의 진도 테이블 스키마 준비 (등록된 학습자만, 프로세스당 한 번)"""
+    if path in _ready_paths:
+        return
+    with _ready_lock:
+        if path in _ready_paths:
+            return
+        if not user_exists(user_id):
+            # 없는 학습자 id 로 DB 파일이 생기지 않도록
+            raise ValueError(f"등록되지 않은 학습자입니다: {user_id}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        run_migrations(get_connection(path, {'catalog': DB_PATH}), catalog=False)
+        _ready_paths.add(path)
+
+
+def get_user_connection(user_id=DEFAULT_USER_ID):
+    """학습자의 진도 데이터가 있는 DB 연결 반환
+
+    어느 방식이든 words/grammars 는 이름만으로 조회할 수 있고,
+    진도 테이블은 user_id 컬럼으로 걸러서 사용합니다.
+    """
+    if PROGRESS_BACKEND != 'per_user':
+        return get_connection()
+
+    path = user_db_path(user_id)
+    _ensure_user_db(path, user_id)
+    return get_connection(path, {'catalog': DB_PATH})
+
+
+def get_users():
+    """학습자 목록"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, name FROM users ORDER BY id")
+    users = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return users
+
+
+def user_exists(user_id):
+    """users 테이블에 있는 학습자 id 인지"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM users WHERE id = ?", (user_id,))
+    found = cursor.fetchone() is not None
+    conn.close()
+    return found
+
+
+def resolve_user_id(value):
+    """URL 등에서 받은 학습자 id 문자열 - 숫자가 아니거나 없는 학습자면 기본 학습자"""
+    value = (value or '').strip()
+    if value.isdigit() and user_exists(int(value)):
+        return int(value)
+    return DEFAULT_USER_ID
+
+
+def create_user(name):
+    """학습자 추가 (이미 있으면 기존 id 반환)"""
+    name = re.sub(r'\s+', ' ', name).strip()
+    if not name:
+        raise ValueError("학습자 이름이 비어 있습니다.")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("INSERT OR IGNORE INTO users (name) VALUES (?)", (name,))
+    cursor.execute("SELECT id FROM users WHERE name = ?", (name,))
+    user_id = cursor.fetchone()['id']
+    conn.commit()
+    conn.close()
+    return user_id
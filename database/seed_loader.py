@@ -0,0 +1,225 @@
+import glob
+import hashlib
+import json
+import os
+
+from database.catalog import bump_catalog_version
+from database.connection import get_connection
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+
+READ_SIZE = 64 * 1024
+CHUNK_SIZE = 1000
+
+# 시드 파일 종류별 설정 (파일명 접두사 → 테이블)
+SEED_TABLES = {
+    'words': {
+        'pattern': 'words_*.json',
+        'columns': ['japanese', 'hiragana', 'kanji', 'korean', 'level', 'category',
+                    'example_sentence', 'example_korean', 'memo_tip'],
+        'defaults': {'level': 'N5'},
+        'key': lambda item: item.get('japanese', '') + '\x1f' + (item.get('kanji') or ''),
+        # 예전 로더가 출처 없이 넣은 기본 데이터를 시드 키로 연결
+        'adopt_sql': '''
+            UPDATE words SET source = ?, seed_key = ?
+            WHERE id = (
+                SELECT MIN(id) FROM words
+                WHERE source IS NULL AND (is_user_added = 0 OR is_user_added IS NULL)
+                  AND japanese = ? AND COALESCE(kanji, '') = ?
+            )
+        ''',
+        'adopt_args': lambda item: (item.get('japanese', ''), item.get('kanji') or ''),
+    },
+    'grammars': {
+        'pattern': 'grammar_*.json',
+        'columns': ['pattern', 'meaning', 'explanation', 'level', 'connection_rule',
+                    'example_sentence', 'example_korean'],
+        'defaults': {'level': 'N5'},
+        'key': lambda item: item.get('pattern', ''),
+        'adopt_sql': '''
+            UPDATE grammars SET source = ?, seed_key = ?
+            WHERE id = (
+                SELECT MIN(id) FROM grammars WHERE source IS NULL AND pattern = ?
+            )
+        ''',
+        'adopt_args': lambda item: (item.get('pattern', ''),),
+    },
+}
+
+
+def file_hash(path):
+    """파일 내용 SHA-256 (블록 단위로 읽음)"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+# 배열 원소 뒤에 올 수 있는 문자
+_VALUE_END = ' \t\r\n,]'
+
+
+def iter_json_array(path, read_size=READ_SIZE):
+    """최상위 JSON 배열의 원소를 하나씩 반환 (파일 전체를 메모리에 올리지 않음)"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        buf = ''
+        pos = 0
+        eof = False
+        started = False
+
+        while True:
+            # 공백/구분자 건너뛰기
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+
+            if pos >= len(buf):
+                if eof:
+                    raise ValueError(f"JSON 배열이 닫히지 않았습니다: {path}")
+                more = f.read(read_size)
+                eof = not more
+                buf, pos = more, 0
+                continue
+
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError(f"최상위가 JSON 배열이 아닙니다: {path}")
+                started = True
+                pos += 1
+                continue
+
+            if buf[pos] == ']':
+                return
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                end = None
+
+            # 버퍼 끝에서 잘렸을 수 있으면 더 읽고 다시 시도
+            #   값 바로 뒤가 구분자가 아니면 잘린 숫자일 수 있음 ("3." 까지만 읽으면 3 으로 읽힘)
+            if end is None or (not eof and (end == len(buf) or buf[end] not in _VALUE_END)):
+                if eof:
+                    raise ValueError(f"JSON 형식 오류: {path}")
+                more = f.read(read_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+
+            yield item
+            pos = end
+
+
+def _iter_chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def sync_seed_file(cursor, table, path, content_hash, chunk_size=CHUNK_SIZE):
+    """시드 파일 하나를 테이블에 동기화 (호출한 쪽에서 트랜잭션 관리)
+
+    파일에 있는 항목은 자연키 기준으로 추가/갱신하고,
+    이전에 같은 파일에서 들어왔지만 지금은 없는 항목은 삭제합니다.
+    """
+    spec = SEED_TABLES[table]
+    source = os.path.basename(path)
+    columns = spec['columns']
+    defaults = spec['defaults']
+
+    cursor.execute("SELECT 1 FROM seed_sources WHERE source = ?", (source,))
+    first_sync = cursor.fetchone() is None
+
+    col_list = ', '.join(columns)
+    placeholders = ', '.join('?' for _ in columns)
+    updates = ', '.join(f"{c} = excluded.{c}" for c in columns)
+    upsert_sql = f'''
+        INSERT INTO {table} ({col_list}, source, seed_key)
+        VALUES ({placeholders}, ?, ?)
+        ON CONFLICT (source, seed_key) WHERE source IS NOT NULL DO UPDATE
+        SET {updates}
+    '''
+
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS seed_seen (seed_key TEXT PRIMARY KEY)")
+    cursor.execute("DELETE FROM temp.seed_seen")
+
+    row_count = 0
+    for chunk in _iter_chunks(iter_json_array(path), chunk_size):
+        keys = [spec['key'](item) for item in chunk]
+
+        if first_sync:
+            cursor.executemany(spec['adopt_sql'], [
+                (source, key) + spec['adopt_args'](item)
+                for item, key in zip(chunk, keys)
+            ])
+
+        cursor.executemany(upsert_sql, [
+            tuple(item.get(c) or defaults.get(c, '') for c in columns) + (source, key)
+            for item, key in zip(chunk, keys)
+        ])
+        cursor.executemany(
+            "INSERT OR IGNORE INTO temp.seed_seen (seed_key) VALUES (?)",
+            [(key,) for key in keys]
+        )
+        row_count += len(chunk)
+
+    # 파일에서 빠진 항목 삭제
+    cursor.execute(f'''
+        DELETE FROM {table}
+        WHERE source = ? AND seed_key NOT IN (SELECT seed_key FROM temp.seed_seen)
+    ''', (source,))
+    removed = cursor.rowcount
+
+    bump_catalog_version(cursor)
+
+    cursor.execute('''
+        INSERT INTO seed_sources (source, content_hash, row_count, loaded_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (source) DO UPDATE
+        SET content_hash = excluded.content_hash,
+            row_count = excluded.row_count,
+            loaded_at = excluded.loaded_at
+    ''', (source, content_hash, row_count))
+
+    return row_count, removed
+
+
+def sync_seed_data(data_dir=DATA_DIR):
+    """data 폴더의 시드 파일 중 내용이 바뀐 것만 동기화
+
+    변경되어 다시 불러온 파일 수를 반환합니다.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT source, content_hash FROM seed_sources")
+    known = {row['source']: row['content_hash'] for row in cursor.fetchall()}
+
+    changed = 0
+    try:
+        for table, spec in SEED_TABLES.items():
+            for path in sorted(glob.glob(os.path.join(data_dir, spec['pattern']))):
+                source = os.path.basename(path)
+                content_hash = file_hash(path)
+                if known.get(source) == content_hash:
+                    continue
+
+                cursor.execute("BEGIN IMMEDIATE")
+                row_count, removed = sync_seed_file(cursor, table, path, content_hash)
+                conn.commit()
+                changed += 1
+                print(f"✅ {source}: {row_count}개 항목 동기화 완료!" +
+                      (f" ({removed}개 삭제)" if removed else ""))
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return changed
@@ -0,0 +1,238 @@
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import get_connection
+from database.migrations import ROLLUP_COLUMNS, week_start_sql
+from database.router import PROGRESS_BACKEND, get_users, get_user_connection
+
+# stats_snapshot 은 학습 기록/퀴즈/출석 테이블의 트리거가, app_meta 의 단어 수는
+# words 테이블의 트리거가 갱신합니다. 아래 함수는 처음부터 다시 계산할 때 사용합니다.
+
+_SNAPSHOT_SELECT = '''
+    SELECT u.user_id,
+        (SELECT COUNT(*) FROM learning_history
+         WHERE user_id = u.user_id AND content_type = 'word'),
+        (SELECT COUNT(*) FROM quiz_results WHERE user_id = u.user_id),
+        (SELECT COUNT(*) FROM quiz_results WHERE user_id = u.user_id AND total_questions > 0),
+        (SELECT COALESCE(SUM(score * 100.0 / total_questions), 0) FROM quiz_results
+         WHERE user_id = u.user_id AND total_questions > 0),
+        (SELECT COALESCE(MAX(score * 100.0 / total_questions), 0) FROM quiz_results
+         WHERE user_id = u.user_id AND total_questions > 0),
+        (SELECT COUNT(*) FROM attendance WHERE user_id = u.user_id)
+    FROM (
+        SELECT user_id FROM learning_history
+        UNION SELECT user_id FROM quiz_results
+        UNION SELECT user_id FROM attendance
+    ) u
+'''
+
+
+def refresh_stats_snapshot(cursor, user_id=None):
+    """학습자 통계 스냅샷 재계산 (호출한 쪽 트랜잭션 안에서 실행)"""
+    where = '' if user_id is None else 'WHERE u.user_id = ?'
+    params = () if user_id is None else (user_id,)
+
+    if user_id is None:
+        cursor.execute("DELETE FROM main.stats_snapshot")
+    else:
+        cursor.execute("DELETE FROM main.stats_snapshot WHERE user_id = ?", params)
+
+    cursor.execute(f'''
+        INSERT INTO main.stats_snapshot
+            (user_id, learned_words, quiz_count, scored_quiz_count,
+             score_pct_sum, best_score, study_days)
+        {_SNAPSHOT_SELECT} {where}
+    ''', params)
+
+
+def refresh_catalog_counts(cursor):
+    """app_meta 의 단어 수 재계산 (호출한 쪽 트랜잭션 안에서 실행)"""
+    cursor.execute('''
+        INSERT INTO app_meta (key, value)
+        VALUES ('word_count', (SELECT COUNT(*) FROM words)),
+               ('user_added_word_count', (SELECT COUNT(*) FROM words WHERE is_user_added = 1))
+        ON CONFLICT (key) DO UPDATE SET value = excluded.value
+    ''')
+
+
+def get_stats_snapshot(user_id):
+    """학습자 통계 스냅샷 + 단어 수 (한 번의 조회)"""
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT s.*,
+            (SELECT value FROM app_meta WHERE key = 'word_count') AS total_words,
+            (SELECT value FROM app_meta WHERE key = 'user_added_word_count') AS user_added_words
+        FROM (SELECT 1) LEFT JOIN stats_snapshot s ON s.user_id = ?
+    ''', (user_id,))
+    snapshot = dict(cursor.fetchone())
+    conn.close()
+    return snapshot
+
+
+# 일 단위 집계의 원본 - 기록 한 건이 하루 집계에 더하는 값 (ROLLUP_COLUMNS 순서)
+_ROLLUP_SOURCE = '''
+    SELECT user_id, DATE(completed_at, 'localtime') AS day,
+        1, total_questions, score, 0, 0, 0
+    FROM quiz_results
+    UNION ALL
+    SELECT user_id, DATE(learned_at, 'localtime'), 0, 0, 0, 1, 0, 0
+    FROM learning_history
+    UNION ALL
+    SELECT user_id, date, 0, 0, 0, 0, COALESCE(study_minutes, 0), 1
+    FROM attendance
+'''
+
+
+def refresh_rollups(cursor, user_id=None):
+    """일/주 단위 집계 재계산 (호출한 쪽 트랜잭션 안에서 실행)"""
+    where = '' if user_id is None else 'WHERE user_id = ?'
+    params = () if user_id is None else (user_id,)
+    columns = ', '.join(ROLLUP_COLUMNS)
+    sums = ', '.join(f"SUM({col})" for col in ROLLUP_COLUMNS)
+    source_columns = ', '.join(('user_id', 'day') + ROLLUP_COLUMNS)
+
+    cursor.execute(f"DELETE FROM main.daily_rollup {where}", params)
+    cursor.execute(f"DELETE FROM main.weekly_rollup {where}", params)
+    cursor.execute(f'''
+        WITH source ({source_columns}) AS ({_ROLLUP_SOURCE})
+        INSERT INTO main.daily_rollup (user_id, day, {columns})
+        SELECT user_id, day, {sums}
+        FROM source
+        WHERE day IS NOT NULL {'' if user_id is None else 'AND user_id = ?'}
+        GROUP BY user_id, day
+    ''', params)
+    cursor.execute(f'''
+        INSERT INTO main.weekly_rollup (user_id, week_start, {columns})
+        SELECT user_id, {week_start_sql('day')}, {sums}
+        FROM main.daily_rollup {where}
+        GROUP BY 1, 2
+    ''', params)
+
+
+def _rollup_rows(table, key, user_id, start, end):
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT {key}, {', '.join(ROLLUP_COLUMNS)} FROM {table}
+        WHERE user_id = ? AND {key} BETWEEN ? AND ?
+        ORDER BY {key}
+    ''', (user_id, start, end))
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def get_daily_rollup(user_id, start, end):
+    """start ~ end (포함, YYYY-MM-DD) 의 하루 단위 집계 - 기록이 있는 날만"""
+    return _rollup_rows('daily_rollup', 'day', user_id, start, end)
+
+
+def get_weekly_rollup(user_id, start, end):
+    """start ~ end 사이에 시작하는 주(월요일 기준) 단위 집계"""
+    return _rollup_rows('weekly_rollup', 'week_start', user_id, start, end)
+
+
+def get_rollup_totals(user_id, start, end):
+    """start ~ end (포함) 의 집계 합계 (하루 단위 집계를 DB 에서 합산)"""
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT {', '.join(f"COALESCE(SUM({col}), 0) AS {col}" for col in ROLLUP_COLUMNS)}
+        FROM daily_rollup
+        WHERE user_id = ? AND day BETWEEN ? AND ?
+    ''', (user_id, start, end))
+    totals = dict(cursor.fetchone())
+    conn.close()
+    return totals
+
+
+# 연속 출석 계산 결과 캐시 - {user_id: ((날짜, 출석일 수), 결과)}
+_streak_cache = {}
+
+
+def get_streaks(user_id, study_days=None):
+    """연속 출석 현황 - 현재/최장 연속 출석일과 시작일
+
+    연속된 날짜 묶음(island)을 윈도 함수로 한 번에 구합니다. 결과는 날짜와 출석일 수가
+    같은 동안 재사용하므로, 하루에 출석 기록이 새로 생길 때만 다시 계산합니다.
+    study_days 는 호출한 쪽이 스냅샷에서 이미 읽은 출석일 수입니다.
+    """
+    today = date.today().isoformat()
+    if study_days is None:
+        study_days = get_stats_snapshot(user_id)['study_days'] or 0
+
+    key = (today, study_days)
+    cached = _streak_cache.get(user_id)
+    if cached is not None and cached[0] == key:
+        return dict(cached[1])
+
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    # 날짜 - 순번 이 같은 행끼리 연속된 날짜
+    cursor.execute('''
+        WITH numbered AS (
+            SELECT date, julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS island
+            FROM attendance
+            WHERE user_id = :user_id
+        ), islands AS (
+            SELECT MIN(date) AS start_date, MAX(date) AS end_date, COUNT(*) AS length
+            FROM numbered
+            GROUP BY island
+        )
+        SELECT
+            (SELECT length FROM islands WHERE end_date = :today) AS current_streak,
+            (SELECT start_date FROM islands WHERE end_date = :today) AS current_start,
+            longest.length AS longest_streak,
+            longest.start_date AS longest_start,
+            longest.end_date AS longest_end
+        FROM (SELECT 1)
+        LEFT JOIN (
+            SELECT * FROM islands ORDER BY length DESC, end_date DESC LIMIT 1
+        ) longest
+    ''', {'user_id': user_id, 'today': today})
+    row = cursor.fetchone()
+    conn.close()
+
+    streaks = {
+        'current_streak': row['current_streak'] or 0,
+        'current_start': row['current_start'],
+        'longest_streak': row['longest_streak'] or 0,
+        'longest_start': row['longest_start'],
+        'longest_end': row['longest_end'],
+    }
+    _streak_cache[user_id] = (key, streaks)
+    return dict(streaks)
+
+
+def rebuild_stats():
+    """단어 수와 모든 학습자의 통계 스냅샷 / 일·주 단위 집계를 처음부터 다시 계산"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    refresh_catalog_counts(cursor)
+    if PROGRESS_BACKEND != 'per_user':
+        refresh_stats_snapshot(cursor)
+        refresh_rollups(cursor)
+    conn.commit()
+    conn.close()
+
+    if PROGRESS_BACKEND == 'per_user':
+        for user in get_users():
+            conn = get_user_connection(user['id'])
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            refresh_stats_snapshot(cursor, user['id'])
+            refresh_rollups(cursor, user['id'])
+            conn.commit()
+            conn.close()
+
+    _streak_cache.clear()
+    print("✅ 통계 스냅샷 재계산 완료!")
+
+
+if __name__ == "__main__":
+    rebuild_stats()
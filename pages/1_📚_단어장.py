@@ -4,12 +4,17 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from utils.quiz_generator import get_all_words, get_today_words, mark_word_learned
+from utils.quiz_generator import get_today_words, mark_word_learned, get_word_categories, count_words, get_words_page
+from utils.learner import get_current_user_id, track_study_time
+from utils.search import search_words
 
 st.set_page_config(page_title="단어장 - 일본어 학습", page_icon="📚", layout="wide")
 
 st.title("📚 단어장")
 
+user_id = get_current_user_id()
+track_study_time(user_id)
+
 # 탭 생성
 tab1, tab2, tab3 = st.tabs(["📖 오늘의 단어", "📚 전체 단어", "🔍 검색"])
 
@@ -17,7 +22,7 @@ tab1, tab2, tab3 = st.tabs(["📖 오늘의 단어", "📚 전체 단어", "🔍
 with tab1:
     st.subheader("오늘 학습할 단어")
     
-    today_words = get_today_words(5)
+    today_words = get_today_words(5, user_id)
     
     if not today_words:
         st.info("오늘 학습할 단어가 없습니다.")
@@ -49,7 +54,7 @@ with tab1:
                         st.markdown(f"> {word['example_korean']}")
                 
                 if st.button(f"✅ 학습 완료", key=f"learn_{word['id']}"):
-                    mark_word_learned(word['id'])
+                    mark_word_learned(word['id'], user_id)
                     st.success("학습 완료로 표시했습니다!")
                     st.rerun()
 
@@ -57,52 +62,46 @@ with tab1:
 with tab2:
     st.subheader("전체 단어 목록")
     
-    all_words = get_all_words()
-    
     # 필터
     col1, col2 = st.columns(2)
     with col1:
-        categories = list(set(w.get('category', '기타') for w in all_words if w.get('category')))
-        categories = ['전체'] + sorted(categories)
+        categories = ['전체'] + get_word_categories()
         selected_category = st.selectbox("카테고리", categories)
     
     with col2:
         levels = ['전체', 'N5', 'N4', 'N3', 'N2', 'N1']
         selected_level = st.selectbox("레벨", levels)
     
-    # 필터 적용
-    filtered_words = all_words
-    if selected_category != '전체':
-        filtered_words = [w for w in filtered_words if w.get('category') == selected_category]
-    if selected_level != '전체':
-        filtered_words = [w for w in filtered_words if w.get('level') == selected_level]
+    category = None if selected_category == '전체' else selected_category
+    level = None if selected_level == '전체' else selected_level
     
-    st.markdown(f"**총 {len(filtered_words)}개의 단어**")
+    total_words = count_words(category, level)
+    st.markdown(f"**총 {total_words}개의 단어**")
     
-    # 페이지네이션
+    # 페이지네이션 (각 페이지 시작 커서를 쌓아 두고 필요한 10개만 조회)
     items_per_page = 10
-    total_pages = (len(filtered_words) - 1) // items_per_page + 1 if filtered_words else 1
+    total_pages = (total_words - 1) // items_per_page + 1 if total_words else 1
+    
+    if st.session_state.get('vocab_filter') != (category, level):
+        st.session_state.vocab_filter = (category, level)
+        st.session_state.vocab_cursors = [None]
     
-    if 'vocab_page' not in st.session_state:
-        st.session_state.vocab_page = 1
+    cursors = st.session_state.vocab_cursors
+    page_words, next_cursor = get_words_page(category, level, after=cursors[-1], limit=items_per_page)
     
     col1, col2, col3 = st.columns([1, 2, 1])
     with col1:
-        if st.button("◀ 이전", disabled=st.session_state.vocab_page <= 1):
-            st.session_state.vocab_page -= 1
+        if st.button("◀ 이전", disabled=len(cursors) <= 1):
+            cursors.pop()
             st.rerun()
     with col2:
-        st.markdown(f"<center>{st.session_state.vocab_page} / {total_pages}</center>", unsafe_allow_html=True)
+        st.markdown(f"<center>{len(cursors)} / {total_pages}</center>", unsafe_allow_html=True)
     with col3:
-        if st.button("다음 ▶", disabled=st.session_state.vocab_page >= total_pages):
-            st.session_state.vocab_page += 1
+        if st.button("다음 ▶", disabled=next_cursor is None):
+            cursors.append(next_cursor)
             st.rerun()
     
     # 단어 표시
-    start_idx = (st.session_state.vocab_page - 1) * items_per_page
-    end_idx = start_idx + items_per_page
-    page_words = filtered_words[start_idx:end_idx]
-    
     for word in page_words:
         with st.expander(f"**{word['japanese']}** ({word.get('hiragana', '')}) - {word['korean']}"):
             col1, col2 = st.columns([2, 1])
@@ -126,18 +125,35 @@ with tab2:
 with tab3:
     st.subheader("단어 검색")
     
-    search_query = st.text_input("검색어를 입력하세요 (일본어/한국어)")
+    search_query = st.text_input("검색어를 입력하세요 (일본어/로마자/한국어)")
     
     if search_query:
-        all_words = get_all_words()
-        results = [
-            w for w in all_words 
-            if search_query.lower() in w.get('japanese', '').lower()
-            or search_query.lower() in w.get('korean', '').lower()
-            or search_query.lower() in w.get('hiragana', '').lower()
-        ]
+        # 검색어가 바뀌면 첫 페이지부터
+        if st.session_state.get('word_search_query') != search_query:
+            st.session_state.word_search_query = search_query
+            st.session_state.word_search_page = 1
+        
+        results_per_page = 10
+        page = st.session_state.word_search_page
+        results, total = search_words(
+            search_query, limit=results_per_page, offset=(page - 1) * results_per_page
+        )
+        total_pages = (total - 1) // results_per_page + 1 if total else 1
         
-        st.markdown(f"**{len(results)}개의 결과**")
+        st.markdown(f"**{total}개의 결과**")
+        
+        if total_pages > 1:
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                if st.button("◀ 이전", key="search_prev", disabled=page <= 1):
+                    st.session_state.word_search_page -= 1
+                    st.rerun()
+            with col2:
+                st.markdown(f"<center>{page} / {total_pages}</center>", unsafe_allow_html=True)
+            with col3:
+                if st.button("다음 ▶", key="search_next", disabled=page >= total_pages):
+                    st.session_state.word_search_page += 1
+                    st.rerun()
         
         for word in results:
             with st.expander(f"**{word['japanese']}** - {word['korean']}"):
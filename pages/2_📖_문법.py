@@ -5,11 +5,16 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from utils.quiz_generator import get_all_grammars
+from utils.search import search_grammars
+from utils.learner import get_current_user_id, track_study_time
 
 st.set_page_config(page_title="문법 - 일본어 학습", page_icon="📖", layout="wide")
 
 st.title("📖 문법")
 
+# 학습 시간 기록
+track_study_time(get_current_user_id())
+
 # 문법 데이터 가져오기
 all_grammars = get_all_grammars()
 
@@ -49,14 +54,32 @@ with tab2:
     search_query = st.text_input("검색어를 입력하세요 (문법 패턴/의미)")
     
     if search_query:
-        results = [
-            g for g in all_grammars
-            if search_query.lower() in g.get('pattern', '').lower()
-            or search_query.lower() in g.get('meaning', '').lower()
-            or search_query.lower() in g.get('explanation', '').lower()
-        ]
+        # 검색어가 바뀌면 첫 페이지부터
+        if st.session_state.get('grammar_search_query') != search_query:
+            st.session_state.grammar_search_query = search_query
+            st.session_state.grammar_search_page = 1
+        
+        results_per_page = 10
+        page = st.session_state.grammar_search_page
+        results, total = search_grammars(
+            search_query, limit=results_per_page, offset=(page - 1) * results_per_page
+        )
+        total_pages = (total - 1) // results_per_page + 1 if total else 1
+        
+        st.markdown(f"**{total}개의 결과**")
         
-        st.markdown(f"**{len(results)}개의 결과**")
+        if total_pages > 1:
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                if st.button("◀ 이전", key="grammar_search_prev", disabled=page <= 1):
+                    st.session_state.grammar_search_page -= 1
+                    st.rerun()
+            with col2:
+                st.markdown(f"<center>{page} / {total_pages}</center>", unsafe_allow_html=True)
+            with col3:
+                if st.button("다음 ▶", key="grammar_search_next", disabled=page >= total_pages):
+                    st.session_state.grammar_search_page += 1
+                    st.rerun()
         
         for grammar in results:
             with st.expander(f"**{grammar['pattern']}** - {grammar['meaning']}"):
@@ -1,20 +1,27 @@
 import streamlit as st
 import sys
 import os
+import time
+import uuid
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from utils.quiz_generator import (
-    generate_full_quiz, save_quiz_result, save_wrong_answer,
-    get_today_words, get_learned_words
-)
-from database.init_db import update_attendance
+from utils.quiz_generator import complete_quiz, expand_question, is_correct_option
+from utils.answer_queue import get_answer_writer
+from utils.answer_log import encode_answer_event, session_key
+from utils.quiz_pool import QUIZ_SIZES, get_quiz_prefetcher, take_quiz
+from utils.learner import get_current_user_id, track_study_time
 
 st.set_page_config(page_title="퀴즈 - 일본어 학습", page_icon="🎯", layout="wide")
 
 st.title("🎯 퀴즈")
 
+user_id = get_current_user_id()
+track_study_time(user_id)
+
 # 세션 상태 초기화
+# quiz_questions 는 compact_quiz 형식(id 만), answers 는 문제별로 고른 보기 번호 -
+# 문제/보기 글자는 화면에 그릴 때 공용 카탈로그에서 찾음
 if 'quiz_started' not in st.session_state:
     st.session_state.quiz_started = False
 if 'quiz_questions' not in st.session_state:
@@ -29,17 +36,31 @@ if 'quiz_type' not in st.session_state:
     st.session_state.quiz_type = 'today'
 if 'show_result' not in st.session_state:
     st.session_state.show_result = False
+# 퀴즈 한 번(시작~결과)을 구분하는 토큰 - 결과는 토큰마다 한 번만 저장
+if 'quiz_token' not in st.session_state:
+    st.session_state.quiz_token = None
+if 'result_saved' not in st.session_state:
+    st.session_state.result_saved = False
 
 def reset_quiz():
+    # 아직 기록되지 않은 오답 이벤트 반영
+    get_answer_writer().flush()
     st.session_state.quiz_started = False
     st.session_state.quiz_questions = []
     st.session_state.current_question = 0
     st.session_state.score = 0
     st.session_state.answers = []
     st.session_state.show_result = False
+    st.session_state.quiz_token = None
+    st.session_state.shown_question = None
+    st.session_state.result_saved = False
 
 # 퀴즈 시작 전
 if not st.session_state.quiz_started:
+    # 시작 버튼을 누르기 전에 두 종류의 퀴즈를 백그라운드에서 미리 만들어 둠
+    for quiz_type in QUIZ_SIZES:
+        get_quiz_prefetcher().request(quiz_type, user_id)
+    
     st.markdown("""
     ### 📋 퀴즈 유형을 선택하세요
     
@@ -57,7 +78,8 @@ if not st.session_state.quiz_started:
         """)
         if st.button("1단계 시작", key="start_today", use_container_width=True):
             st.session_state.quiz_type = 'today'
-            st.session_state.quiz_questions = generate_full_quiz('today', 14, 6)
+            st.session_state.quiz_token = uuid.uuid4().hex
+            st.session_state.quiz_questions = take_quiz('today', user_id)
             if st.session_state.quiz_questions:
                 st.session_state.quiz_started = True
                 st.rerun()
@@ -68,12 +90,14 @@ if not st.session_state.quiz_started:
         st.markdown("""
         #### 2️⃣ 종합 복습 퀴즈
         - 지금까지 배운 모든 범위
+        - 복습할 때가 된 단어 먼저 출제
         - 실력 점검에 적합
         - 난이도: ⭐⭐⭐
         """)
         if st.button("2단계 시작", key="start_all", use_container_width=True):
             st.session_state.quiz_type = 'all'
-            st.session_state.quiz_questions = generate_full_quiz('all', 14, 6)
+            st.session_state.quiz_token = uuid.uuid4().hex
+            st.session_state.quiz_questions = take_quiz('all', user_id)
             if st.session_state.quiz_questions:
                 st.session_state.quiz_started = True
                 st.rerun()
@@ -85,8 +109,21 @@ elif st.session_state.quiz_started and not st.session_state.show_result:
     questions = st.session_state.quiz_questions
     current_idx = st.session_state.current_question
     
-    if current_idx < len(questions):
-        question = questions[current_idx]
+    question = expand_question(questions[current_idx]) if current_idx < len(questions) else None
+    
+    if current_idx < len(questions) and question is None:
+        # 퀴즈 도중 삭제된 단어/문법 문제는 건너뜀
+        st.session_state.answers.append(None)
+        st.session_state.current_question += 1
+        if st.session_state.current_question >= len(questions):
+            st.session_state.show_result = True
+        st.rerun()
+    
+    if question is not None:
+        # 응답 시간 측정용 - 문제가 처음 그려진 시각
+        if st.session_state.get('shown_question') != current_idx:
+            st.session_state.shown_question = current_idx
+            st.session_state.shown_at = time.monotonic()
         
         # 진행 상황
         progress = (current_idx) / len(questions)
@@ -103,7 +140,6 @@ elif st.session_state.quiz_started and not st.session_state.show_result:
         # 보기
         st.markdown("---")
         
-        selected = None
         cols = st.columns(2)
         
         for idx, option in enumerate(question['options']):
@@ -114,29 +150,37 @@ elif st.session_state.quiz_started and not st.session_state.show_result:
                     key=f"option_{current_idx}_{idx}",
                     use_container_width=True
                 ):
-                    selected = option
-                    
                     # 정답 체크
-                    is_correct = selected == question['correct_answer']
+                    is_correct = is_correct_option(questions[current_idx], idx)
+                    st.session_state.answers.append(idx)
+                    
+                    # 문제별 답안 로그 (백그라운드에서 일괄 저장)
+                    get_answer_writer().submit('answer_event', (user_id, encode_answer_event(
+                        session_key(st.session_state.quiz_token),
+                        st.session_state.quiz_type,
+                        current_idx,
+                        questions[current_idx],
+                        idx,
+                        (time.monotonic() - st.session_state.shown_at) * 1000
+                    )))
+                    
+                    content_type = question['type']
+                    content_id = question.get('word_id') or question.get('grammar_id')
                     
-                    st.session_state.answers.append({
-                        'question': question,
-                        'selected': selected,
-                        'correct': is_correct
-                    })
+                    # 복습 일정 갱신 (백그라운드에서 일괄 저장)
+                    if content_id:
+                        get_answer_writer().submit('review', (user_id, content_type, content_id, is_correct))
                     
                     if is_correct:
                         st.session_state.score += 1
-                    else:
-                        # 오답 기록
-                        content_type = question['type']
-                        content_id = question.get('word_id') or question.get('grammar_id')
-                        if content_id:
-                            save_wrong_answer(
-                                question.get('question_type', 'general'),
-                                content_type,
-                                content_id
-                            )
+                    elif content_id:
+                        # 오답 기록 (백그라운드에서 일괄 저장)
+                        get_answer_writer().submit('wrong_answer', (
+                            user_id,
+                            question.get('question_type', 'general'),
+                            content_type,
+                            content_id
+                        ))
                     
                     # 다음 문제로
                     st.session_state.current_question += 1
@@ -160,18 +204,28 @@ elif st.session_state.quiz_started and not st.session_state.show_result:
 # 결과 화면
 elif st.session_state.show_result:
     questions = st.session_state.quiz_questions
+    answers = st.session_state.answers
     score = st.session_state.score
     total = len(questions)
     percentage = (score / total) * 100 if total > 0 else 0
     
-    # 결과 저장
-    save_quiz_result(
-        st.session_state.quiz_type,
-        score,
-        total,
-        {'answers': [{'correct': a['correct']} for a in st.session_state.answers]}
-    )
-    update_attendance(quiz_taken=1)
+    # 결과 저장 (대기 중인 오답 기록 먼저 반영)
+    # 결과 화면은 버튼을 누를 때마다 다시 그려지므로 처음 그릴 때만 기록
+    # (complete_quiz 도 토큰으로 한 번만 기록 - 출석 퀴즈 횟수 포함)
+    if not st.session_state.result_saved:
+        get_answer_writer().flush()
+        complete_quiz(
+            st.session_state.quiz_token,
+            st.session_state.quiz_type,
+            score,
+            total,
+            {'answers': [
+                {'correct': a is not None and is_correct_option(q, a)}
+                for q, a in zip(questions, answers)
+            ]},
+            user_id=user_id
+        )
+        st.session_state.result_saved = True
     
     # 결과 표시
     st.markdown("---")
@@ -221,15 +275,20 @@ elif st.session_state.show_result:
     st.markdown("---")
     
     # 오답 확인
-    wrong_answers = [a for a in st.session_state.answers if not a['correct']]
+    wrong_answers = [
+        (q, a) for q, a in zip(questions, answers)
+        if a is not None and not is_correct_option(q, a)
+    ]
     
     if wrong_answers:
         st.subheader(f"❌ 틀린 문제 ({len(wrong_answers)}개)")
         
-        for idx, answer in enumerate(wrong_answers):
-            q = answer['question']
+        for idx, (entry, selected) in enumerate(wrong_answers):
+            q = expand_question(entry)
+            if q is None:
+                continue
             with st.expander(f"문제 {idx + 1}: {q['question']}"):
-                st.error(f"**내 답:** {answer['selected']}")
+                st.error(f"**내 답:** {q['options'][selected]}")
                 st.success(f"**정답:** {q['correct_answer']}")
                 if q.get('hint'):
                     st.info(f"💡 **팁:** {q['hint']}")
@@ -4,7 +4,9 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from utils.quiz_generator import get_wrong_answers, resolve_wrong_answer
+from utils.quiz_generator import get_wrong_answers, resolve_wrong_answer, describe_item
+from utils.irt import TARGET_SUCCESS, get_item_estimates, request_refresh
+from utils.learner import get_current_user_id, track_study_time
 
 st.set_page_config(page_title="오답노트 - 일본어 학습", page_icon="📝", layout="wide")
 
@@ -16,7 +18,9 @@ st.markdown("""
 """)
 
 # 오답 데이터 가져오기
-wrong_data = get_wrong_answers()
+user_id = get_current_user_id()
+track_study_time(user_id)
+wrong_data = get_wrong_answers(user_id)
 word_wrongs = wrong_data['words']
 grammar_wrongs = wrong_data['grammars']
 
@@ -64,7 +68,7 @@ with tab1:
                     st.markdown(f"**마지막 오답:** {wrong['last_wrong_at'][:10]}")
                     
                     if st.button("✅ 이해했어요!", key=f"resolve_word_{wrong['id']}"):
-                        resolve_wrong_answer(wrong['id'])
+                        resolve_wrong_answer(wrong['id'], user_id)
                         st.success("복습 완료!")
                         st.rerun()
 
@@ -93,7 +97,7 @@ with tab2:
                     st.markdown(f"**틀린 횟수:** {wrong_count}회")
                     
                     if st.button("✅ 이해했어요!", key=f"resolve_grammar_{wrong['id']}"):
-                        resolve_wrong_answer(wrong['id'])
+                        resolve_wrong_answer(wrong['id'], user_id)
                         st.success("복습 완료!")
                         st.rerun()
 
@@ -101,27 +105,47 @@ with tab2:
 with tab3:
     st.subheader("📊 오답 분석")
     
-    if total_wrongs == 0:
+    # 답안 기록으로 추정한 문항 난이도 / 실력 (응답이 늘었으면 백그라운드에서 다시 계산)
+    request_refresh(user_id)
+    estimates = get_item_estimates(user_id)
+    
+    if total_wrongs == 0 and not estimates:
         st.info("분석할 오답 데이터가 없습니다.")
     else:
+        import pandas as pd
+        
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("### 유형별 분포")
-            
-            import pandas as pd
-            
-            data = {
-                '유형': ['단어', '문법'],
-                '개수': [len(word_wrongs), len(grammar_wrongs)]
-            }
-            df = pd.DataFrame(data)
-            st.bar_chart(df.set_index('유형'))
+            if estimates:
+                st.markdown("### 유형별 예상 정답률")
+                st.caption("퀴즈 답안으로 추정한 실력과 문항 난이도 기준 (푼 문항 평균)")
+                
+                df = pd.DataFrame(estimates)
+                df['유형'] = df['item_kind'].map({'word': '단어', 'grammar': '문법'})
+                by_type = (df.groupby('유형')['p_correct'].mean() * 100).round(1)
+                st.bar_chart(by_type.rename('예상 정답률(%)'))
+                
+                # 예상 정답률이 낮을수록 취약
+                word_weakness = 100 - by_type.get('단어', 100)
+                grammar_weakness = 100 - by_type.get('문법', 100)
+            else:
+                st.markdown("### 유형별 분포")
+                
+                data = {
+                    '유형': ['단어', '문법'],
+                    '개수': [len(word_wrongs), len(grammar_wrongs)]
+                }
+                df = pd.DataFrame(data)
+                st.bar_chart(df.set_index('유형'))
+                
+                word_weakness = len(word_wrongs)
+                grammar_weakness = len(grammar_wrongs)
         
         with col2:
             st.markdown("### 취약 분야")
             
-            if len(word_wrongs) > len(grammar_wrongs):
+            if word_weakness > grammar_weakness:
                 st.error("📚 **단어** 학습에 더 집중이 필요합니다!")
                 st.markdown("""
                 **추천 학습법:**
@@ -129,7 +153,7 @@ with tab3:
                 - 암기 팁 활용하기
                 - 매일 5개씩 복습
                 """)
-            elif len(grammar_wrongs) > len(word_wrongs):
+            elif grammar_weakness > word_weakness:
                 st.error("📖 **문법** 학습에 더 집중이 필요합니다!")
                 st.markdown("""
                 **추천 학습법:**
@@ -140,6 +164,25 @@ with tab3:
             else:
                 st.warning("단어와 문법 모두 고르게 복습이 필요합니다.")
         
+        # 예상 정답률이 낮은 항목
+        st.markdown("---")
+        st.markdown(f"### 🎯 예상 정답률이 낮은 항목 ({TARGET_SUCCESS:.0%} 미만)")
+        
+        weak_items = [e for e in estimates if e['p_correct'] < TARGET_SUCCESS]
+        shown = 0
+        for item in weak_items:
+            if shown >= 10:
+                break
+            label = describe_item(item['item_kind'], item['item_id'])
+            if label is None:
+                continue
+            icon = "📚" if item['item_kind'] == 'word' else "📖"
+            st.markdown(f"- {icon} **{label}** - 예상 정답률 {item['p_correct']:.0%} "
+                        f"(지금까지 {item['correct']}/{item['attempts']} 정답)")
+            shown += 1
+        if not shown:
+            st.success("예상 정답률이 낮은 항목이 없습니다!" if estimates else "퀴즈를 풀면 항목별 분석이 표시됩니다.")
+        
         # 자주 틀리는 항목
         st.markdown("---")
         st.markdown("### 🔴 자주 틀리는 항목 (3회 이상)")
@@ -5,18 +5,20 @@ from datetime import datetime, timedelta
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from utils.quiz_generator import (
-    get_statistics, get_recent_quiz_results, get_attendance_history
-)
+from utils.quiz_generator import get_statistics, get_recent_quiz_results
+from database.stats import get_daily_rollup, get_rollup_totals, get_weekly_rollup
+from utils.learner import get_current_user_id, track_study_time
+from utils.irt import TARGET_SUCCESS, get_item_estimates, get_learner_ability, request_refresh
 
 st.set_page_config(page_title="성과 - 일본어 학습", page_icon="📊", layout="wide")
 
 st.title("📊 학습 성과")
 
 # 통계 가져오기
-stats = get_statistics()
-recent_quizzes = get_recent_quiz_results(10)
-attendance = get_attendance_history(30)
+user_id = get_current_user_id()
+track_study_time(user_id)
+stats = get_statistics(user_id)
+recent_quizzes = get_recent_quiz_results(10, user_id)
 
 # 상단 요약 카드
 st.subheader("🏆 학습 현황")
@@ -57,58 +59,70 @@ tab1, tab2, tab3 = st.tabs(["📅 출석 현황", "📈 퀴즈 기록", "🎯 
 
 # 출석 현황 탭
 with tab1:
-    st.subheader("📅 출석 캘린더")
+    st.subheader("📅 학습 캘린더 (최근 1년)")
     
-    if not attendance:
+    # 첫 열이 월요일부터 시작하도록 53주 전 월요일부터 (하루 집계 최대 371행)
+    today = datetime.now().date()
+    year_start = today - timedelta(days=today.weekday() + 52 * 7)
+    daily = get_daily_rollup(user_id, year_start.isoformat(), today.isoformat())
+    
+    if not daily:
         st.info("아직 출석 기록이 없습니다. 오늘부터 시작해보세요!")
     else:
-        # 최근 30일 캘린더 표시
         import pandas as pd
+        import plotly.graph_objects as go
         
-        today = datetime.now().date()
-        
-        # 캘린더 데이터 준비
-        attendance_dates = {a['date'] for a in attendance}
+        metrics = {
+            '학습 시간(분)': 'study_minutes',
+            '퀴즈 수': 'quiz_count',
+            '학습 항목': 'items_learned',
+            '출석': 'attended',
+        }
+        metric_label = st.radio("표시할 값", list(metrics), horizontal=True, label_visibility="collapsed")
+        column = metrics[metric_label]
         
-        # 주간 캘린더 표시 (최근 4주)
-        st.markdown("**최근 4주 출석 현황**")
+        # 기록이 없는 날은 0 으로 채워 주 x 요일 격자로
+        df = pd.DataFrame(daily)
+        df['day'] = pd.to_datetime(df['day'])
+        grid = pd.DataFrame({'day': pd.date_range(year_start, today)}).merge(df, on='day', how='left').fillna(0)
+        grid['week'] = (grid['day'] - pd.Timestamp(year_start)).dt.days // 7
+        grid['weekday'] = grid['day'].dt.weekday
+        grid['label'] = grid['day'].dt.strftime('%Y-%m-%d')
         
-        weeks = []
-        for week in range(4):
-            week_start = today - timedelta(days=today.weekday() + 7 * week)
-            week_data = []
-            for day in range(7):
-                d = week_start + timedelta(days=day)
-                date_str = d.isoformat()
-                if date_str in attendance_dates:
-                    week_data.append("✅")
-                elif d > today:
-                    week_data.append("⬜")
-                else:
-                    week_data.append("❌")
-            weeks.append(week_data)
+        values = grid.pivot(index='weekday', columns='week', values=column)
+        labels = grid.pivot(index='weekday', columns='week', values='label')
+        week_starts = [(year_start + timedelta(weeks=w)).strftime('%m/%d') for w in values.columns]
         
-        # 요일 헤더
-        days = ['월', '화', '수', '목', '금', '토', '일']
+        fig = go.Figure(go.Heatmap(
+            z=values.values,
+            x=week_starts,
+            y=['월', '화', '수', '목', '금', '토', '일'],
+            customdata=labels.values,
+            hovertemplate=f"%{{customdata}}<br>{metric_label}: %{{z}}<extra></extra>",
+            colorscale='Greens',
+            showscale=False,
+            xgap=2,
+            ygap=2
+        ))
+        fig.update_layout(height=230, margin=dict(l=0, r=0, t=10, b=0), yaxis=dict(autorange='reversed'))
+        st.plotly_chart(fig, use_container_width=True)
         
-        # 테이블 형태로 표시
-        df = pd.DataFrame(weeks[::-1], columns=days)
-        df.index = [f'{4-i}주 전' if i < 3 else '이번 주' for i in range(4)]
-        st.dataframe(df, use_container_width=True)
-        
-        # 출석 통계
-        col1, col2, col3 = st.columns(3)
+        # 출석 통계 (하루 집계를 DB 에서 합산)
+        totals = get_rollup_totals(user_id, year_start.isoformat(), today.isoformat())
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.markdown(f"**총 학습일:** {len(attendance)}일")
+            st.markdown(f"**총 학습일:** {totals['attended']}일")
         
         with col2:
-            total_words = sum(a.get('words_learned', 0) for a in attendance)
-            st.markdown(f"**총 학습 단어:** {total_words}개")
+            st.markdown(f"**총 학습 항목:** {totals['items_learned']}개")
         
         with col3:
-            total_quizzes = sum(a.get('quiz_taken', 0) for a in attendance)
-            st.markdown(f"**총 퀴즈 수:** {total_quizzes}회")
+            st.markdown(f"**총 퀴즈 수:** {totals['quiz_count']}회")
+        
+        with col4:
+            total_minutes = totals['study_minutes']
+            st.markdown(f"**총 학습 시간:** {total_minutes // 60}시간 {total_minutes % 60}분")
 
 # 퀴즈 기록 탭
 with tab2:
@@ -157,6 +171,58 @@ with tab2:
         with col3:
             recent_avg = df['정답률_수치'].head(5).mean()
             st.metric("최근 5회 평균", f"{recent_avg:.1f}%")
+        
+        # 주간 추이 (주 단위 집계 최대 53행)
+        week_from = datetime.now().date() - timedelta(weeks=52)
+        weekly = get_weekly_rollup(user_id, week_from.isoformat(), datetime.now().date().isoformat())
+        weekly = [w for w in weekly if w['quiz_questions'] > 0]
+        if len(weekly) > 1:
+            st.markdown("---")
+            st.markdown("**주간 정답률 / 퀴즈 수 (최근 1년)**")
+            
+            weekly_df = pd.DataFrame(weekly)
+            weekly_df['정답률'] = (weekly_df['quiz_correct'] * 100 / weekly_df['quiz_questions']).round(1)
+            weekly_df = weekly_df.rename(columns={'week_start': '주', 'quiz_count': '퀴즈 수'}).set_index('주')
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.line_chart(weekly_df['정답률'])
+            with col2:
+                st.bar_chart(weekly_df['퀴즈 수'])
+    
+    # 문항 난이도 / 실력 추정 (응답이 늘었으면 백그라운드에서 다시 계산)
+    request_refresh(user_id)
+    ability = get_learner_ability(user_id)
+    
+    if ability:
+        st.markdown("---")
+        st.subheader("🧠 실력 추정")
+        st.caption("퀴즈 답안 기록으로 추정한 실력 (0 = 문항 평균 난이도)")
+        
+        estimates = get_item_estimates(user_id)
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("실력 추정치", f"{ability['ability']:+.2f}", help=f"표준오차 ±{ability['se']:.2f}")
+        
+        with col2:
+            expected = sum(e['p_correct'] for e in estimates) / len(estimates) * 100 if estimates else 0
+            st.metric("푼 문항 예상 정답률", f"{expected:.1f}%")
+        
+        with col3:
+            weak_count = sum(1 for e in estimates if e['p_correct'] < TARGET_SUCCESS)
+            st.metric("취약 문항", f"{weak_count}개", help=f"예상 정답률 {TARGET_SUCCESS:.0%} 미만")
+        
+        if estimates:
+            import pandas as pd
+            
+            # 유형별 예상 정답률 분포
+            est_df = pd.DataFrame(estimates)
+            est_df['유형'] = est_df['item_kind'].map({'word': '단어', 'grammar': '문법'})
+            est_df['구간'] = pd.cut(est_df['p_correct'] * 100, [0, 50, 70, 90, 100],
+                                   labels=['~50%', '50~70%', '70~90%', '90%~'], include_lowest=True)
+            st.bar_chart(est_df.pivot_table(index='구간', columns='유형', values='item_id',
+                                            aggfunc='count', fill_value=0, observed=False))
 
 # 목표 달성 탭
 with tab3:
@@ -184,6 +250,12 @@ with tab3:
         st.markdown("### 🔥 연속 출석")
         streak = stats['streak']
         
+        if streak > 0:
+            st.markdown(f"**현재:** {streak}일 ({stats['streak_start']}부터)")
+        if stats['longest_streak'] > 0:
+            st.markdown(f"**최장 기록:** {stats['longest_streak']}일 "
+                        f"({stats['longest_streak_start']} ~ {stats['longest_streak_end']})")
+        
         # 출석 배지
         badges = [
             (3, "🌱 새싹", "3일 연속"),
@@ -5,7 +5,8 @@ import json
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from database.init_db import get_connection
+from utils.quiz_generator import get_all_words, get_user_added_words, get_word_store, add_words, delete_word
+from utils.search import search_words
 
 st.set_page_config(page_title="단어 관리 - 일본어 학습", page_icon="⚙️", layout="wide")
 
@@ -59,18 +60,17 @@ with tab1:
             if not japanese or not korean:
                 st.error("일본어와 한국어 뜻은 필수입니다!")
             else:
-                conn = get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT INTO words (japanese, hiragana, kanji, korean, level, category, 
-                                      example_sentence, example_korean, memo_tip, is_user_added)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (japanese, hiragana, kanji, korean, level, category,
-                      example_sentence, example_korean, memo_tip, 1 if is_user_added else 0))
-                
-                conn.commit()
-                conn.close()
+                add_words([{
+                    'japanese': japanese,
+                    'hiragana': hiragana,
+                    'kanji': kanji,
+                    'korean': korean,
+                    'level': level,
+                    'category': category,
+                    'example_sentence': example_sentence,
+                    'example_korean': example_korean,
+                    'memo_tip': memo_tip
+                }], is_user_added=is_user_added)
                 
                 st.success(f"✅ '{japanese}' 단어가 추가되었습니다!")
                 st.balloons()
@@ -154,34 +154,10 @@ with tab1:
                         if not isinstance(data, list):
                             st.error("배열 또는 객체 형태여야 합니다.")
                         else:
-                            conn = get_connection()
-                            cursor = conn.cursor()
-                            
-                            added_count = 0
-                            for word in data:
-                                japanese = word.get('japanese', '')
-                                korean = word.get('korean', '')
-                                
-                                if japanese and korean:
-                                    cursor.execute('''
-                                        INSERT INTO words (japanese, hiragana, kanji, korean, level, category,
-                                                          example_sentence, example_korean, memo_tip, is_user_added)
-                                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
-                                    ''', (
-                                        japanese,
-                                        word.get('hiragana', ''),
-                                        word.get('kanji', ''),
-                                        korean,
-                                        word.get('level', 'N5'),
-                                        word.get('category', '기타'),
-                                        word.get('example_sentence', ''),
-                                        word.get('example_korean', ''),
-                                        word.get('memo_tip', '')
-                                    ))
-                                    added_count += 1
-                            
-                            conn.commit()
-                            conn.close()
+                            added_count = add_words(
+                                [word for word in data if isinstance(word, dict)],
+                                is_user_added=True
+                            )
                             
                             st.success(f"✅ {added_count}개 단어가 추가되었습니다!")
                             st.balloons()
@@ -195,18 +171,7 @@ with tab1:
 with tab2:
     st.subheader("📋 내가 추가한 단어")
     
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # is_user_added 컬럼 존재 확인 및 조회
-    try:
-        cursor.execute("SELECT * FROM words WHERE is_user_added = 1 ORDER BY id DESC")
-        user_words = [dict(row) for row in cursor.fetchall()]
-    except:
-        # 컬럼이 없으면 빈 리스트
-        user_words = []
-    
-    conn.close()
+    user_words = get_user_added_words()
     
     if not user_words:
         st.info("아직 추가한 단어가 없습니다. '단어 추가' 탭에서 단어를 추가해보세요!")
@@ -217,9 +182,7 @@ with tab2:
         search = st.text_input("🔍 검색", placeholder="단어 검색...")
         
         if search:
-            user_words = [w for w in user_words 
-                        if search.lower() in w.get('japanese', '').lower()
-                        or search.lower() in w.get('korean', '').lower()]
+            user_words, _ = search_words(search, limit=len(user_words), user_added=True)
         
         for word in user_words:
             col1, col2, col3 = st.columns([3, 1, 1])
@@ -243,11 +206,7 @@ with tab2:
             
             with col3:
                 if st.button("🗑️", key=f"del_{word['id']}", help="삭제"):
-                    conn = get_connection()
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM words WHERE id = ?", (word['id'],))
-                    conn.commit()
-                    conn.close()
+                    delete_word(word['id'])
                     st.rerun()
 
 # ===== 탭 3: 데이터 내보내기 =====
@@ -262,19 +221,10 @@ with tab3:
         horizontal=True
     )
     
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     if export_option == "내가 추가한 단어만":
-        try:
-            cursor.execute("SELECT * FROM words WHERE is_user_added = 1")
-        except:
-            cursor.execute("SELECT * FROM words WHERE 1=0")  # 빈 결과
+        words = get_user_added_words()
     else:
-        cursor.execute("SELECT * FROM words")
-    
-    words = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+        words = get_all_words()
     
     if words:
         # JSON 변환
@@ -311,19 +261,9 @@ with tab3:
 with st.sidebar:
     st.markdown("### 📊 단어 통계")
     
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT COUNT(*) FROM words")
-    total = cursor.fetchone()[0]
-    
-    try:
-        cursor.execute("SELECT COUNT(*) FROM words WHERE is_user_added = 1")
-        user_added = cursor.fetchone()[0]
-    except:
-        user_added = 0
-    
-    conn.close()
+    store = get_word_store()
+    total = len(store)
+    user_added = store.count_user_added()
     
     st.markdown(f"**전체 단어:** {total}개")
     st.markdown(f"**기본 단어:** {total - user_added}개")
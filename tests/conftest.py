@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database.catalog as catalog
+import database.connection as connection
+import database.init_db as init_db
+import database.router as router
+import database.stats as stats
+
+
+def _reset_state():
+    """모듈에 남아 있는 연결 풀 / 캐시 비우기"""
+    connection.close_all_connections()
+    connection._pools.clear()
+    router._ready_paths.clear()
+    catalog._cache.clear()
+    init_db._checked_in.clear()
+    stats._streak_cache.clear()
+
+
+@pytest.fixture
+def empty_db(tmp_path, monkeypatch):
+    """임시 경로의 빈 DB (스키마 없음)"""
+    db_path = str(tmp_path / 'nihongo.db')
+    monkeypatch.setattr(connection, 'DB_PATH', db_path)
+    monkeypatch.setattr(router, 'DB_PATH', db_path)
+    monkeypatch.setattr(router, 'USER_DB_DIR', str(tmp_path / 'users'))
+    _reset_state()
+    yield db_path
+    _reset_state()
+
+
+@pytest.fixture
+def db(empty_db):
+    """마이그레이션과 시드 데이터가 들어간 임시 DB"""
+    init_db.init_database()
+    init_db.load_initial_data()
+    return empty_db
+
+
+@pytest.fixture
+def per_user(db, monkeypatch):
+    """학습자별 DB 파일 방식으로 전환 (PROGRESS_BACKEND 를 가져다 쓰는 모듈 모두)"""
+    for module in list(sys.modules.values()):
+        if getattr(module, 'PROGRESS_BACKEND', None) is not None and hasattr(module, '__file__'):
+            monkeypatch.setattr(module, 'PROGRESS_BACKEND', 'per_user')
+    return db
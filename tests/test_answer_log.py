@@ -0,0 +1,75 @@
+import csv
+import json
+import sqlite3
+
+import pytest
+
+from database.connection import get_connection
+from utils.answer_log import (
+    EVENT_COLUMNS, append_answer_events, encode_answer_event, export_answer_events, iter_answer_events,
+)
+
+ENTRY = ['w', 7, 'kr_to_jp', [3, 7, 9, 12]]
+
+
+def _events(count, start=1000):
+    return [encode_answer_event(42, 'today', i, ENTRY, i % 4, response_ms=1500, answered_at=start + i)
+            for i in range(count)]
+
+
+def test_encode_answer_event():
+    assert encode_answer_event(42, 'all', 3, ENTRY, 1, response_ms=812.6, answered_at=1000) == (
+        42, 1, 3, 0, 7, 1, 1, 7, 1, 812, 1000)
+    assert encode_answer_event(42, 'today', 0, ['g', 5, [5, 1, 2, 3]], 2, answered_at=1000) == (
+        42, 0, 0, 1, 5, 2, 2, 2, 0, None, 1000)
+
+
+def test_iter_reads_in_batches_within_range(db):
+    assert append_answer_events(_events(10)) == 10
+    append_answer_events(_events(3), user_id=2)
+
+    rows = list(iter_answer_events(1, batch_rows=3))
+    assert [row[EVENT_COLUMNS.index('position')] for row in rows] == list(range(10))
+    assert {row[1] for row in rows} == {1}
+
+    # since 포함, until 제외
+    rows = list(iter_answer_events(1, since=1002, until=1005, batch_rows=2))
+    assert [row[-1] for row in rows] == [1002, 1003, 1004]
+
+
+def test_export_chunks(db, tmp_path):
+    append_answer_events(_events(5))
+    append_answer_events(_events(2), user_id=2)
+
+    paths = export_answer_events(str(tmp_path / 'csv'), 'csv', user_ids=[1, 2], chunk_rows=3)
+    assert len(paths) == 3
+    rows = []
+    for path in paths:
+        with open(path, encoding='utf-8', newline='') as f:
+            header, *body = list(csv.reader(f))
+        assert header == list(EVENT_COLUMNS)
+        rows.extend(body)
+    assert [row[1] for row in rows] == ['1'] * 5 + ['2'] * 2
+
+    paths = export_answer_events(str(tmp_path / 'jsonl'), 'jsonl', user_ids=[1], decode=True)
+    with open(paths[0], encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 5
+    assert records[1]['quiz_kind'] == 'today' and records[1]['question_kind'] == 'kr_to_jp'
+    assert records[1]['correct'] is True and records[0]['correct'] is False
+
+
+def test_export_rejects_unknown_format(db, tmp_path):
+    with pytest.raises(ValueError):
+        export_answer_events(str(tmp_path), 'xml')
+
+
+@pytest.mark.parametrize('sql', ["UPDATE answer_events SET correct = 1", "DELETE FROM answer_events"])
+def test_events_are_append_only(db, sql):
+    append_answer_events(_events(2))
+    conn = get_connection()
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(sql)
+    conn.rollback()
+    conn.close()
+    assert len(list(iter_answer_events(1))) == 2
@@ -0,0 +1,134 @@
+import json
+import threading
+
+from utils.answer_queue import AnswerWriter
+
+
+def _recording_writer(tmp_path, **kwargs):
+    written = []
+    writer = AnswerWriter({'event': written.extend}, flush_interval=60,
+                          failed_path=str(tmp_path / 'failed.jsonl'), **kwargs)
+    return writer, written
+
+
+def test_flush_writes_pending_events(tmp_path):
+    writer, written = _recording_writer(tmp_path)
+    for i in range(5):
+        writer.submit('event', (1, i))
+    assert writer.flush()
+    assert written == [(1, i) for i in range(5)]
+    assert writer.get_metrics()['event_count'] == 5
+    writer.stop()
+
+
+def test_flush_times_out_when_queue_is_full(tmp_path):
+    gate = threading.Event()
+    started = threading.Event()
+
+    def slow(payloads):
+        started.set()
+        gate.wait(5)
+
+    writer = AnswerWriter({'event': slow}, maxsize=1, max_batch=1, failed_path=None)
+    writer.submit('event', 1)
+    assert started.wait(5)
+    writer.submit('event', 2)     # 스레드가 막혀 있으므로 큐에 남음
+
+    assert writer.flush(timeout=0.1) is False
+    gate.set()
+    assert writer.flush(timeout=5)
+    writer.stop()
+
+
+def test_failed_batch_is_retried_in_order(tmp_path):
+    written = []
+    failures = [RuntimeError("database is locked")]
+
+    def flaky(payloads):
+        if failures:
+            raise failures.pop()
+        written.extend(payloads)
+
+    writer = AnswerWriter({'event': flaky}, failed_path=str(tmp_path / 'failed.jsonl'))
+    writer.submit('event', 1)
+    writer.flush()
+    assert written == [] and writer.get_metrics()['retry_depth'] == 1
+
+    writer.submit('event', 2)
+    writer.flush()
+    assert written == [1, 2]
+    assert writer.get_metrics()['retry_depth'] == 0
+    writer.stop()
+
+
+def test_batch_saved_after_max_attempts_and_replayed(tmp_path):
+    failed_path = tmp_path / 'failed.jsonl'
+
+    def broken(payloads):
+        raise RuntimeError("disk I/O error")
+
+    writer = AnswerWriter({'event': broken}, max_attempts=2, failed_path=str(failed_path))
+    writer.submit('event', (1, 'jp_to_kr', 'word', 7))
+    writer.flush()
+    assert not failed_path.exists()
+    writer.flush()
+    writer.submit('event', (1, 'kr_to_jp', 'word', 8))
+    writer.flush()
+    writer.stop()    # 남은 재시도 배치도 파일로
+    assert [json.loads(line) for line in failed_path.read_text(encoding='utf-8').splitlines()] == [
+        ['event', [1, 'jp_to_kr', 'word', 7]], ['event', [1, 'kr_to_jp', 'word', 8]]]
+
+    replayed, written = _recording_writer(tmp_path)
+    assert replayed.replay_failed() == 2
+    replayed.flush()
+    assert written == [(1, 'jp_to_kr', 'word', 7), (1, 'kr_to_jp', 'word', 8)]
+    assert not failed_path.exists()
+    replayed.stop()
+
+
+def test_stop_writes_remaining_events(tmp_path):
+    writer, written = _recording_writer(tmp_path)
+    writer.submit('event', 1)
+    writer.stop()
+    assert written == [1]
+
+
+def test_bad_payload_is_saved_alone(tmp_path):
+    failed_path = tmp_path / 'failed.jsonl'
+    written = []
+
+    def strict(payloads):
+        if 'bad' in payloads:
+            raise ValueError("bad payload")
+        written.extend(payloads)
+
+    writer = AnswerWriter({'event': strict}, max_attempts=2, failed_path=str(failed_path))
+    for payload in (1, 'bad', 2):
+        writer.submit('event', payload)
+    writer.flush()
+    writer.submit('event', 3)     # 다시 시도하는 묶음과 섞이지 않음
+    writer.flush()
+    writer.stop()
+
+    assert written == [1, 2, 3]
+    assert [json.loads(line) for line in failed_path.read_text(encoding='utf-8').splitlines()] == [['event', 'bad']]
+
+
+def test_only_failed_learner_is_retried(per_user, tmp_path):
+    from utils.answer_queue import _write_wrong_answers
+    from utils.quiz_generator import get_wrong_answers
+
+    failed_path = tmp_path / 'failed.jsonl'
+    writer = AnswerWriter({'wrong_answer': _write_wrong_answers}, failed_path=str(failed_path))
+    writer.submit('wrong_answer', (1, 'jp_to_kr', 'word', 1))
+    writer.submit('wrong_answer', (999, 'jp_to_kr', 'word', 1))    # 없는 학습자
+    writer.flush()
+    writer.submit('wrong_answer', (1, 'kr_to_jp', 'word', 2))
+    writer.flush()
+    writer.flush()
+    writer.stop()
+
+    wrongs = get_wrong_answers(user_id=1)['words']
+    assert sorted((w['question_type'], w['wrong_count']) for w in wrongs) == [('jp_to_kr', 1), ('kr_to_jp', 1)]
+    assert [json.loads(line) for line in failed_path.read_text(encoding='utf-8').splitlines()] == [
+        ['wrong_answer', [999, 'jp_to_kr', 'word', 1]]]
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from utils.batch_quiz import _synthetic_store, generate_word_quiz_batch
+from utils.sampling import normalize_option
+from utils.word_store import WORD_COLUMNS, WordStore
+
+
+def _check_quiz(quiz, num_questions):
+    assert len(quiz) == num_questions
+    assert len({q['word_id'] for q in quiz}) == num_questions
+    for q in quiz:
+        assert q['correct_answer'] in q['options']
+        assert len({normalize_option(o) for o in q['options']}) == len(q['options'])
+        assert q['option_ids'][q['options'].index(q['correct_answer'])] == q['word_id']
+
+
+def test_batch_quizzes_are_valid():
+    store = _synthetic_store(50)
+    batch = generate_word_quiz_batch(200, 10, store=store, rng=np.random.default_rng(0))
+    assert len(batch) == 200
+    for quiz in batch:
+        _check_quiz(quiz, 10)
+
+
+def test_batch_respects_rows_and_compact_format():
+    store = _synthetic_store(100)
+    rows = np.arange(20, 30)
+    batch = generate_word_quiz_batch(20, 10, rows=rows, store=store, rng=np.random.default_rng(1))
+    allowed = {store.ids[r] for r in rows.tolist()}
+
+    for i in range(len(batch)):
+        compact = batch.compact(i)
+        quiz = batch.quiz(i)
+        assert [entry[1] for entry in compact] == [q['word_id'] for q in quiz]
+        assert [entry[3] for entry in compact] == [q['option_ids'] for q in quiz]
+        assert all(set(entry[3]) <= allowed for entry in compact)
+
+
+def test_duplicate_texts_never_share_a_question():
+    # 뜻이 같은 단어가 많아도 보기 글자는 서로 다름 (다시 뽑기 → sample_distinct)
+    rows = []
+    for i in range(12):
+        row = {col: f"{col}-{i}" for col in WORD_COLUMNS}
+        row.update(id=i + 1, korean='같은 뜻' if i < 8 else f'뜻 {i}', is_user_added=0)
+        rows.append(row)
+    batch = generate_word_quiz_batch(100, 4, store=WordStore(rows), rng=np.random.default_rng(2))
+    for quiz in batch:
+        for q in quiz:
+            if q['question_type'] == 'jp_to_kr':
+                assert len(set(q['options'])) == 4
+
+
+def test_pool_smaller_than_options():
+    with pytest.raises(ValueError):
+        generate_word_quiz_batch(1, store=_synthetic_store(3))
@@ -0,0 +1,43 @@
+from database.catalog import cached_catalog, get_catalog_version
+from utils.quiz_generator import add_words, delete_word, get_all_words, get_word_categories
+
+
+def test_loader_runs_once_per_version(db):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ['a']
+
+    assert cached_catalog('test', loader) == ['a']
+    assert cached_catalog('test', loader) == ['a']
+    assert len(calls) == 1
+
+
+def test_returned_lists_do_not_leak_into_cache(db):
+    first = cached_catalog('test', lambda: [1, 2])
+    first.append(3)
+    assert cached_catalog('test', lambda: [9]) == [1, 2]
+
+
+def test_catalog_writes_invalidate_cache(db):
+    version = get_catalog_version()
+    count = len(get_all_words())
+
+    assert add_words([{'japanese': 'テスト', 'korean': '테스트', 'category': '새 카테고리'}]) == 1
+    assert get_catalog_version() == version + 1
+    words = get_all_words()
+    assert len(words) == count + 1
+    # 사용자 추가 단어가 맨 앞
+    assert words[0]['japanese'] == 'テスト' and words[0]['is_user_added'] == 1
+    assert '새 카테고리' in get_word_categories()
+
+    delete_word(words[0]['id'])
+    assert len(get_all_words()) == count
+    assert '새 카테고리' not in get_word_categories()
+
+
+def test_rows_without_meaning_are_skipped(db):
+    version = get_catalog_version()
+    assert add_words([{'japanese': 'テスト'}, {'korean': '테스트'}]) == 0
+    assert get_catalog_version() == version
@@ -0,0 +1,95 @@
+import sqlite3
+import threading
+
+import pytest
+
+from database.connection import get_connection
+
+
+def test_nested_calls_share_connection(empty_db):
+    outer = get_connection()
+    inner = get_connection()
+    assert inner is outer
+    inner.close()
+    # 바깥 close() 전까지는 풀에 반납되지 않음
+    assert get_connection() is outer
+    outer.close()
+    outer.close()
+
+
+def test_released_connection_is_reused(empty_db):
+    conn = get_connection()
+    conn.close()
+    assert get_connection() is conn
+    conn.close()
+
+
+def test_pragmas(empty_db):
+    conn = get_connection()
+    cursor = conn.cursor()
+    assert cursor.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert cursor.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    assert cursor.execute("PRAGMA synchronous").fetchone()[0] == 1
+    conn.close()
+
+
+def test_release_rolls_back_open_transaction(empty_db):
+    conn = get_connection()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.close()
+
+    conn = get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    conn.close()
+
+
+def test_threads_get_separate_connections(empty_db):
+    conn = get_connection()
+    seen = []
+
+    def worker():
+        other = get_connection()
+        seen.append(other)
+        other.close()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert seen[0] is not conn
+    conn.close()
+
+
+def test_least_recently_used_extra_pools_are_closed(empty_db, tmp_path, monkeypatch):
+    import database.connection as connection
+
+    monkeypatch.setattr(connection, 'MAX_EXTRA_POOLS', 2)
+    paths = [str(tmp_path / f'user_{i}.db') for i in range(3)]
+    conns = []
+    for path in paths[:2]:
+        conn = get_connection(path)
+        conn.close()
+        conns.append(conn)
+    get_connection(paths[0]).close()    # paths[1] 이 가장 오래 안 쓴 풀
+
+    third = get_connection(paths[2])
+    assert (paths[1], ()) not in connection._pools
+    with pytest.raises(sqlite3.ProgrammingError):
+        conns[1].execute("SELECT 1")
+    assert get_connection(paths[0]) is conns[0]
+    conns[0].close()
+    third.close()
+
+
+def test_connection_of_evicted_pool_is_closed_on_release(empty_db, tmp_path, monkeypatch):
+    import database.connection as connection
+
+    monkeypatch.setattr(connection, 'MAX_EXTRA_POOLS', 1)
+    first = get_connection(str(tmp_path / 'a.db'))
+    get_connection(str(tmp_path / 'b.db')).close()
+    # 빌려 간 동안 풀이 정리되어도 쓸 수 있고, 반납하면 닫힘
+    assert first.execute("SELECT 1").fetchone()[0] == 1
+    first.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
@@ -0,0 +1,77 @@
+import threading
+
+import numpy as np
+import pytest
+
+import utils.irt as irt
+from utils.answer_log import append_answer_events, encode_answer_event
+from utils.irt import estimates_stale, fit_rasch, get_learner_ability, refresh_estimates, request_refresh
+
+
+def test_fit_rasch_recovers_simulated_parameters():
+    rng = np.random.default_rng(7)
+    true_ability = np.array([-1.5, -0.5, 0.5, 1.5])
+    true_difficulty = np.linspace(-2, 2, 30)
+    users, items = [a.ravel() for a in np.meshgrid(np.arange(4), np.arange(30), indexing='ij')]
+    attempts = np.full(len(users), 40)
+    p = 1 / (1 + np.exp(-(true_ability[users] - true_difficulty[items])))
+    correct = rng.binomial(attempts, p)
+
+    theta, theta_se, b, b_se, iterations = fit_rasch(users, items, attempts, correct)
+    assert iterations < irt.MAX_ITER
+    assert list(np.argsort(theta)) == [0, 1, 2, 3]
+    assert np.corrcoef(b, true_difficulty)[0, 1] > 0.95
+    assert (theta_se > 0).all() and (b_se > 0).all()
+
+
+def test_fit_rasch_keeps_perfect_scores_finite():
+    theta, _, b, _, _ = fit_rasch([0, 1], [0, 0], [5, 5], [5, 0])
+    assert np.isfinite(theta).all() and np.isfinite(b).all()
+    assert theta[0] > theta[1]
+
+
+def _answer(user_id, item_id, correct, count=1):
+    entry = ['w', item_id, 'jp_to_kr', [item_id, item_id + 100, item_id + 200, item_id + 300]]
+    rows = [encode_answer_event(1, 'all', i, entry, 0 if correct else 1, answered_at=1000 + i) for i in range(count)]
+    append_answer_events(rows, user_id)
+
+
+@pytest.mark.parametrize('backend', ['shared', 'per_user'])
+def test_refresh_only_when_answers_grow(request, backend):
+    request.getfixturevalue('per_user' if backend == 'per_user' else 'db')
+    if backend == 'per_user':
+        from database.router import create_user
+        other = create_user('학습자 2')
+    else:
+        other = 2
+
+    assert not estimates_stale(1)
+    assert refresh_estimates() is False
+
+    _answer(1, 1, True, 3)
+    _answer(other, 1, False, 2)
+    assert estimates_stale(1) and estimates_stale(other)
+
+    assert refresh_estimates() is True
+    assert not estimates_stale(1) and not estimates_stale(other)
+    assert get_learner_ability(1)['attempts'] == 3
+    assert get_learner_ability(1)['ability'] > get_learner_ability(other)['ability']
+    assert refresh_estimates() is False
+
+    _answer(other, 2, True)
+    assert estimates_stale(other) and not estimates_stale(1)
+    assert refresh_estimates() is True
+    assert get_learner_ability(other)['attempts'] == 3
+
+
+def test_request_refresh_runs_in_background(db, monkeypatch):
+    ran = threading.Event()
+    monkeypatch.setattr(irt, 'refresh_estimates', ran.set)
+    monkeypatch.setattr(irt, '_refresher', None)
+
+    assert request_refresh(1) is False
+    assert irt._refresher is None
+
+    _answer(1, 1, True)
+    assert request_refresh(1) is True
+    assert ran.wait(5)
@@ -0,0 +1,68 @@
+import pytest
+
+from utils.kana_index import KanaIndex, normalize_kana, romaji_to_kana
+from utils.word_store import WORD_COLUMNS, WordStore
+
+
+@pytest.mark.parametrize('query, target', [
+    ('taberu', 'たべる'),
+    ('タベル', 'たべる'),
+    ('ﾀﾍﾞﾙ', 'たべる'),
+    ('koohii', 'コーヒー'),
+    ('kōhī', 'コーヒー'),
+    ('KŌHĪ', 'こーひー'),
+    ('sensee', 'せんせい'),
+    ('せんせー', 'せんせい'),
+    ('sensei', 'せんせい'),
+    ('とーきょー', 'とうきょう'),
+    ('tōkyō', 'とうきょう'),
+    ('toukyou', 'とうきょう'),
+    ('tôkyô', 'トウキョウ'),
+    ('おとーと', 'おとうと'),
+    ('gakkou', 'がっこう'),
+    ('がっこー', 'がっこう'),
+    ('ra-men', 'ラーメン'),
+    ('ｶﾞｯｺｳ', 'がっこう'),
+    ('ki nou', 'きのう'),
+])
+def test_equivalent_spellings(query, target):
+    assert normalize_kana(query, transliterate=True) == normalize_kana(target)
+
+
+@pytest.mark.parametrize('query, target', [
+    ('obasan', 'おばあさん'),
+    ('ojisan', 'おじいさん'),
+    ('ie', 'いいえ'),
+    ('kaeru', 'かいえる'),
+])
+def test_short_and_long_vowels_stay_distinct(query, target):
+    assert normalize_kana(query, transliterate=True) != normalize_kana(target)
+
+
+@pytest.mark.parametrize('romaji, kana', [
+    ('kippu', 'きっぷ'),
+    ('konnichiwa', 'こんにちわ'),
+    ("kin'en", 'きんえん'),
+    ('shinbun', 'しんぶん'),
+    ('kyou', 'きょう'),
+])
+def test_romaji_to_kana(romaji, kana):
+    assert romaji_to_kana(romaji) == kana
+
+
+def _store(*kana):
+    rows = []
+    for i, text in enumerate(kana, 1):
+        row = {col: None for col in WORD_COLUMNS}
+        row.update(id=i, japanese=text, hiragana=text, korean=str(i), is_user_added=0)
+        rows.append(row)
+    return WordStore(rows)
+
+
+def test_lookup_ranks_exact_then_prefix():
+    store = _store('せんせい', 'せんせいがた', 'がっこうのせんせい', 'とうきょう')
+    index = KanaIndex(store)
+
+    assert [store.ids[r] for r in index.lookup('sensee')] == [1, 2, 3]
+    assert [store.ids[r] for r in index.lookup('トーキョー')] == [4]
+    assert index.lookup('ぱん') == []
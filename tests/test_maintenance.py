@@ -0,0 +1,76 @@
+import sqlite3
+import uuid
+from datetime import date
+
+from database.connection import get_connection
+from database.maintenance import dedupe_quiz_results
+from utils.quiz_generator import complete_quiz
+
+
+def _scalar(sql, params=()):
+    conn = get_connection()
+    value = conn.execute(sql, params).fetchone()[0]
+    conn.close()
+    return value
+
+
+def _quiz_taken():
+    return _scalar("SELECT quiz_taken FROM attendance WHERE user_id = 1 AND date = ?", (date.today().isoformat(),))
+
+
+def test_complete_quiz_is_idempotent(db):
+    token = uuid.uuid4().hex
+    assert complete_quiz(token, 'today', 8, 10, details={'wrong': [1]})
+    assert not complete_quiz(token, 'today', 8, 10, details={'wrong': [1]})
+    assert complete_quiz(uuid.uuid4().hex, 'today', 8, 10)
+
+    assert _scalar("SELECT COUNT(*) FROM quiz_results") == 2
+    assert _quiz_taken() == 2
+
+
+def test_same_token_for_different_learners(db):
+    token = uuid.uuid4().hex
+    assert complete_quiz(token, 'all', 5, 10, user_id=1)
+    assert complete_quiz(token, 'all', 5, 10, user_id=2)
+
+
+def _legacy_results(*rows):
+    """토큰 없이 저장되던 예전 결과 (quiz_type, score, completed_at)"""
+    conn = get_connection()
+    conn.executemany('''
+        INSERT INTO quiz_results (user_id, quiz_type, score, total_questions, completed_at)
+        VALUES (1, ?, ?, 10, ?)
+    ''', rows)
+    conn.execute("INSERT INTO attendance (user_id, date, quiz_taken) VALUES (1, '2026-01-05', ?)", (len(rows),))
+    conn.commit()
+    conn.close()
+
+
+def test_dedupe_removes_rerendered_results(db):
+    _legacy_results(
+        ('today', 8, '2026-01-05 01:00:00'),
+        ('today', 8, '2026-01-05 01:00:30'),   # 다시 그려진 결과
+        ('today', 8, '2026-01-05 01:01:00'),   # 다시 그려진 결과
+        ('today', 9, '2026-01-05 01:02:00'),
+        ('today', 9, '2026-01-05 03:00:00'),   # 간격이 길어 다른 퀴즈
+    )
+
+    assert dedupe_quiz_results(dry_run=True) == 2
+    assert _scalar("SELECT COUNT(*) FROM quiz_results") == 5
+
+    assert dedupe_quiz_results() == 2
+    assert _scalar("SELECT COUNT(*) FROM quiz_results") == 3
+    assert _scalar("SELECT quiz_taken FROM attendance WHERE date = '2026-01-05'") == 3
+    assert dedupe_quiz_results() == 0
+
+
+def test_dry_run_does_not_wait_for_writers(db):
+    _legacy_results(('today', 8, '2026-01-05 01:00:00'), ('today', 8, '2026-01-05 01:00:30'))
+
+    writer = sqlite3.connect(db, timeout=0)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert dedupe_quiz_results(dry_run=True) == 1
+    finally:
+        writer.rollback()
+        writer.close()
@@ -0,0 +1,124 @@
+import sqlite3
+
+from database.connection import get_connection
+from database.migrations import SCHEMA_VERSION, get_schema_version, run_migrations
+
+# 마이그레이션 도입 전 init_database() 가 만들던 스키마
+BASELINE_SCHEMA = '''
+    CREATE TABLE words (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, japanese TEXT NOT NULL, hiragana TEXT, kanji TEXT,
+        korean TEXT NOT NULL, level TEXT DEFAULT 'N5', category TEXT, example_sentence TEXT,
+        example_korean TEXT, memo_tip TEXT, is_user_added INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE grammars (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, pattern TEXT NOT NULL, meaning TEXT NOT NULL,
+        explanation TEXT, level TEXT DEFAULT 'N5', connection_rule TEXT, example_sentence TEXT,
+        example_korean TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE learning_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, content_type TEXT NOT NULL, content_id INTEGER NOT NULL,
+        learned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, review_count INTEGER DEFAULT 0,
+        next_review DATE, mastery_level INTEGER DEFAULT 0
+    );
+    CREATE TABLE quiz_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, quiz_type TEXT NOT NULL, score INTEGER NOT NULL,
+        total_questions INTEGER NOT NULL, details TEXT, completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE wrong_answers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, question_type TEXT NOT NULL, content_type TEXT NOT NULL,
+        content_id INTEGER NOT NULL, wrong_count INTEGER DEFAULT 1,
+        last_wrong_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, resolved INTEGER DEFAULT 0
+    );
+    CREATE TABLE attendance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, date DATE UNIQUE NOT NULL, study_minutes INTEGER DEFAULT 0,
+        words_learned INTEGER DEFAULT 0, quiz_taken INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE daily_assignment (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, date DATE NOT NULL, content_type TEXT NOT NULL,
+        content_id INTEGER NOT NULL, completed INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    INSERT INTO words (japanese, hiragana, korean) VALUES ('ねこ', 'ねこ', '고양이'), ('いぬ', 'いぬ', '개');
+    INSERT INTO grammars (pattern, meaning) VALUES ('～です', '~입니다');
+    -- 예전 버전은 같은 단어를 여러 번 기록했음
+    INSERT INTO learning_history (content_type, content_id, learned_at, review_count) VALUES
+        ('word', 1, '2026-01-05 09:00:00', 2),
+        ('word', 1, '2026-01-06 09:00:00', 0),
+        ('word', 2, '2026-01-06 09:00:00', 0);
+    INSERT INTO wrong_answers (question_type, content_type, content_id, wrong_count, last_wrong_at) VALUES
+        ('jp_to_kr', 'word', 1, 1, '2026-01-05 09:00:00'),
+        ('jp_to_kr', 'word', 1, 2, '2026-01-06 09:00:00');
+    INSERT INTO quiz_results (quiz_type, score, total_questions, completed_at) VALUES
+        ('today', 8, 10, '2026-01-05 10:00:00');
+    INSERT INTO attendance (date, study_minutes, quiz_taken) VALUES ('2026-01-05', 15, 1);
+'''
+
+
+def _baseline_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.close()
+
+
+def _scalar(sql, params=()):
+    conn = get_connection()
+    value = conn.execute(sql, params).fetchone()[0]
+    conn.close()
+    return value
+
+
+def _rows(sql, params=()):
+    conn = get_connection()
+    rows = conn.execute(sql, params).fetchall()
+    conn.close()
+    return rows
+
+
+def test_upgrade_baseline_db(empty_db):
+    _baseline_db(empty_db)
+
+    assert run_migrations() == SCHEMA_VERSION
+    conn = get_connection()
+    assert get_schema_version(conn.cursor()) == SCHEMA_VERSION
+    conn.close()
+
+    # 중복 학습 기록은 가장 오래된 행 하나로 합쳐지고 복습 횟수가 더해짐
+    assert _scalar("SELECT COUNT(*) FROM learning_history") == 2
+    assert _scalar("SELECT review_count FROM learning_history WHERE content_id = 1") == 3
+    assert _scalar("SELECT wrong_count FROM wrong_answers") == 3
+
+    # 기존 진도는 기본 학습자 소유
+    assert _scalar("SELECT name FROM users WHERE id = 1") == '기본 학습자'
+    assert _scalar("SELECT COUNT(*) FROM attendance WHERE user_id = 1 AND study_minutes = 15") == 1
+
+    # 파생 테이블은 기존 데이터로 채워짐
+    assert _scalar("SELECT learned_words FROM stats_snapshot WHERE user_id = 1") == 2
+    assert _scalar("SELECT quiz_count FROM stats_snapshot WHERE user_id = 1") == 1
+    assert _scalar("SELECT value FROM app_meta WHERE key = 'word_count'") == 2
+    assert _scalar("SELECT quiz_correct FROM daily_rollup WHERE day = '2026-01-05'") == 8
+    assert _scalar("SELECT rowid FROM words_fts WHERE words_fts MATCH '고양이'") == 1
+
+
+def test_migrations_are_idempotent(empty_db):
+    assert run_migrations() == SCHEMA_VERSION
+    assert run_migrations() == 0
+
+
+def test_lookup_indexes_exist(db):
+    names = {row[0] for row in _rows("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'ux_learning_history_content', 'ux_wrong_answers_content', 'ix_wrong_answers_open',
+            'ux_daily_assignment_content', 'ix_quiz_results_completed', 'ux_words_seed'} <= names
+
+
+def test_user_db_has_progress_tables_only(per_user):
+    from database.router import create_user, get_user_connection
+
+    conn = get_user_connection(create_user('학습자 2'))
+    tables = {row[0] for row in conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")}
+    assert get_schema_version(conn.cursor()) == SCHEMA_VERSION
+    conn.close()
+    assert 'learning_history' in tables and 'answer_events' in tables
+    assert 'words' not in tables and 'users' not in tables
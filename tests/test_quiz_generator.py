@@ -0,0 +1,138 @@
+import json
+
+from database.connection import get_connection
+from utils.quiz_generator import (
+    _word_questions, add_words, compact_quiz, delete_word, describe_item, expand_question, generate_full_quiz,
+    generate_word_quiz, get_all_words, get_review_pool, get_today_words, get_wrong_answers, is_correct_option,
+    mark_items_learned, resolve_wrong_answer, save_wrong_answers,
+)
+
+
+def _rows(sql, params=()):
+    conn = get_connection()
+    rows = [tuple(row) for row in conn.execute(sql, params).fetchall()]
+    conn.close()
+    return rows
+
+
+def test_learning_same_item_twice_keeps_one_row(db):
+    mark_items_learned([('word', 1), ('grammar', 1)])
+    mark_items_learned([('word', 1)])
+
+    assert _rows("SELECT content_type, content_id, review_count FROM learning_history ORDER BY content_type") == [
+        ('grammar', 1, 0), ('word', 1, 1)]
+
+
+def test_learning_is_per_user(db):
+    mark_items_learned([('word', 1)], user_id=1)
+    mark_items_learned([('word', 1)], user_id=2)
+
+    assert _rows("SELECT user_id, review_count FROM learning_history ORDER BY user_id") == [(1, 0), (2, 0)]
+
+
+def test_wrong_answers_are_summed(db):
+    save_wrong_answers([('jp_to_kr', 'word', 1), ('jp_to_kr', 'word', 1), ('kr_to_jp', 'word', 1)])
+    save_wrong_answers([('jp_to_kr', 'word', 1)])
+
+    assert _rows("SELECT question_type, wrong_count FROM wrong_answers ORDER BY question_type") == [
+        ('jp_to_kr', 3), ('kr_to_jp', 1)]
+
+
+def test_wrong_answer_reopens_after_resolve(db):
+    save_wrong_answers([('jp_to_kr', 'word', 1)])
+    wrong_id = get_wrong_answers()['words'][0]['id']
+    resolve_wrong_answer(wrong_id)
+    assert get_wrong_answers()['words'] == []
+
+    save_wrong_answers([('jp_to_kr', 'word', 1)])
+    assert [w['wrong_count'] for w in get_wrong_answers()['words']] == [2]
+
+
+def test_today_words_are_stable_and_unlearned(db):
+    first = [w['id'] for w in get_today_words(5)]
+    assert len(first) == 5 and len(set(first)) == 5
+    assert [w['id'] for w in get_today_words(5)] == first
+
+    # 이미 학습한 단어는 그 학습자의 오늘 단어 후보에서 빠짐
+    mark_items_learned([('word', word_id) for word_id in first], user_id=2)
+    second = [w['id'] for w in get_today_words(5, user_id=2)]
+    assert not set(second) & set(first)
+
+
+def test_today_words_prefer_user_added(db):
+    add_words([{'japanese': 'テスト', 'korean': '테스트'}, {'japanese': 'ケーキ', 'korean': '케이크'}])
+    words = get_today_words(5, user_id=3)
+    assert sorted(w['japanese'] for w in words[:2]) == ['ケーキ', 'テスト']
+
+
+def test_review_pool_without_history_is_whole_catalog(db):
+    assert sorted(get_review_pool()) == sorted(w['id'] for w in get_all_words())
+
+
+def test_review_pool_is_user_added_then_learned(db):
+    add_words([{'japanese': 'テスト', 'korean': '테스트'}])
+    user_added = get_all_words()[0]['id']
+    mark_items_learned([('word', 3), ('word', 5), ('grammar', 1)])
+
+    assert get_review_pool() == [user_added, 5, 3]
+
+
+def test_full_review_quiz_uses_pool_words(db):
+    learned = list(range(1, 21))
+    mark_items_learned([('word', word_id) for word_id in learned])
+
+    questions = generate_full_quiz('all', word_count=7, grammar_count=3)
+    words = [q for q in questions if q['type'] == 'word']
+    assert len(words) == 7 and len(questions) == 10
+    assert {q['word_id'] for q in words} <= set(learned)
+    for q in questions:
+        assert len(q['options']) == 4 and len(set(q['options'])) == 4
+        assert q['correct_answer'] in q['options']
+
+
+def test_word_quiz_from_dicts(db):
+    words = get_all_words()[:12]
+    questions = generate_word_quiz(words, 10)
+    assert len(questions) == 10
+    assert len({q['word_id'] for q in questions}) == 10
+
+
+def test_word_questions_put_first_items_first(db):
+    words = get_all_words()[:12]
+    first = [words[3], words[7]]
+    questions = _word_questions(words, 5, lambda w, col: w[col], lambda w: w, first=first)
+    assert [q['word_id'] for q in questions[:2]] == [words[3]['id'], words[7]['id']]
+    assert len({q['word_id'] for q in questions}) == 5
+
+
+def test_today_quiz(db):
+    questions = generate_full_quiz('today', word_count=7, grammar_count=3)
+    assert len(questions) == 10
+    today_ids = {w['id'] for w in get_today_words(10)}
+    assert {q['word_id'] for q in questions if q['type'] == 'word'} <= today_ids
+
+
+def test_compact_quiz_round_trip(db):
+    questions = generate_full_quiz('today', word_count=5, grammar_count=3)
+    compact = compact_quiz(questions)
+    assert json.loads(json.dumps(compact)) == compact
+
+    for question, entry in zip(questions, compact):
+        expanded = expand_question(entry)
+        for key in ('type', 'question', 'correct_answer', 'options', 'option_ids'):
+            assert expanded[key] == question[key]
+        answer = question['options'].index(question['correct_answer'])
+        assert is_correct_option(entry, answer)
+        assert not is_correct_option(entry, (answer + 1) % len(question['options']))
+
+
+def test_expand_question_with_deleted_word(db):
+    add_words([{'japanese': 'テスト', 'korean': '테스트'}])
+    new_id = get_all_words()[0]['id']
+    entry = ['w', 1, 'jp_to_kr', [new_id, 2, 3]]
+    assert expand_question(entry)['word_id'] == 1
+
+    delete_word(new_id)
+    assert expand_question(entry) is None
+    assert describe_item('word', new_id) is None
+    assert describe_item('word', 1) == 'わたし (나, 저)'
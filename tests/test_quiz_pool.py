@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import utils.quiz_pool as quiz_pool
+from database.connection import get_connection
+from utils.quiz_generator import mark_items_learned
+
+
+class _Requests:
+    def __init__(self):
+        self.keys = []
+
+    def request(self, quiz_type, user_id=1):
+        self.keys.append((quiz_type, user_id))
+
+
+@pytest.fixture
+def requests(db, monkeypatch):
+    """백그라운드 스레드 대신 예약만 기록"""
+    recorder = _Requests()
+    monkeypatch.setattr(quiz_pool, 'get_quiz_prefetcher', lambda: recorder)
+    return recorder
+
+
+def _pooled(quiz_type):
+    conn = get_connection()
+    row = conn.execute("SELECT questions FROM quiz_pool WHERE quiz_type = ?", (quiz_type,)).fetchone()
+    conn.close()
+    return None if row is None else json.loads(row[0])
+
+
+def test_take_returns_prefetched_quiz(requests):
+    assert quiz_pool.prefetch_quiz('all')
+    assert not quiz_pool.prefetch_quiz('all')
+    stored = _pooled('all')
+
+    assert quiz_pool.take_quiz('all') == stored
+    assert _pooled('all') is None
+    assert requests.keys == [('all', 1)]
+
+
+def test_learning_invalidates_review_quiz_only(requests):
+    mark_items_learned([('word', word_id) for word_id in range(1, 11)])
+    quiz_pool.prefetch_quiz('all')
+    quiz_pool.prefetch_quiz('today')
+    today = _pooled('today')
+
+    mark_items_learned([('word', 11)])
+    mark_items_learned([('word', 11)])
+    assert quiz_pool.prefetch_quiz('all')
+    assert not quiz_pool.prefetch_quiz('today')
+    assert quiz_pool.take_quiz('today') == today
+
+
+def test_take_without_prefetch_builds_quiz(requests):
+    questions = quiz_pool.take_quiz('today')
+    # 오늘의 퀴즈는 오늘의 단어 10개 안에서만 출제
+    assert sum(entry[0] == 'w' for entry in questions) == 10
+    assert sum(entry[0] == 'g' for entry in questions) == quiz_pool.QUIZ_SIZES['today'][1]
+    assert requests.keys == [('today', 1)]
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from database.router import (
+    DEFAULT_USER_ID, create_user, get_user_connection, get_users, resolve_user_id, user_db_path,
+)
+from utils.quiz_generator import get_learned_words, mark_items_learned
+
+
+def test_create_user_normalizes_name(db):
+    user_id = create_user('  새   학습자 ')
+    assert create_user('새 학습자') == user_id
+    assert {'id': user_id, 'name': '새 학습자'} in get_users()
+    with pytest.raises(ValueError):
+        create_user('   ')
+
+
+@pytest.mark.parametrize('value', [None, '', 'abc', '-1', '999', ' 1 x'])
+def test_resolve_user_id_falls_back_to_default(db, value):
+    assert resolve_user_id(value) == DEFAULT_USER_ID
+
+
+def test_resolve_user_id_accepts_registered_user(db):
+    user_id = create_user('학습자')
+    assert resolve_user_id(str(user_id)) == user_id
+
+
+def test_per_user_progress_is_isolated(per_user):
+    other = create_user('학습자 2')
+    mark_items_learned([('word', 1), ('word', 2)], DEFAULT_USER_ID)
+    mark_items_learned([('word', 3)], other)
+
+    assert os.path.exists(user_db_path(DEFAULT_USER_ID)) and os.path.exists(user_db_path(other))
+    assert {w['id'] for w in get_learned_words(DEFAULT_USER_ID)} == {1, 2}
+    assert {w['id'] for w in get_learned_words(other)} == {3}
+
+    # 학습자 DB 에서도 카탈로그 테이블은 이름만으로 조회
+    conn = get_user_connection(other)
+    assert conn.execute("SELECT COUNT(*) FROM words").fetchone()[0] > 0
+    assert conn.execute("SELECT COUNT(*) FROM main.learning_history").fetchone()[0] == 1
+    conn.close()
+
+
+def test_unknown_user_gets_no_db_file(per_user):
+    with pytest.raises(ValueError):
+        get_user_connection(999)
+    assert not os.path.exists(user_db_path(999))
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from utils.sampling import keyed_permutation, normalize_option, sample_distinct
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 5, 16, 17, 76, 1000, 4097])
+def test_keyed_permutation_is_bijection(n):
+    order = list(keyed_permutation(n, 'seed'))
+    assert sorted(order) == list(range(n))
+
+
+def test_keyed_permutation_is_deterministic_per_seed():
+    assert list(keyed_permutation(100, '2026-10-17:1')) == list(keyed_permutation(100, '2026-10-17:1'))
+    assert list(keyed_permutation(100, '2026-10-17:1')) != list(keyed_permutation(100, '2026-10-18:1'))
+
+
+def test_keyed_permutation_empty():
+    assert list(keyed_permutation(0, 'seed')) == []
+
+
+def test_normalize_option():
+    assert normalize_option(' Ｔｅｓｔ  ing ') == normalize_option('test ing')
+    assert normalize_option(None) == ''
+
+
+def test_sample_distinct_skips_excluded_and_duplicates():
+    pool = ['개', '개', '고양이', 'ｃａｔ', 'cat', '새', '물고기']
+    for seed in range(50):
+        picked = sample_distinct(pool, str, exclude=['새'], rng=random.Random(seed))
+        texts = [normalize_option(p) for p in picked]
+        assert len(picked) == 3
+        assert len(set(texts)) == 3 and '새' not in texts
+
+
+def test_sample_distinct_returns_fewer_when_pool_runs_out():
+    pool = ['a', 'A', 'b', 'b', 'c']
+    assert sorted(sample_distinct(pool, str, exclude=['c'], rng=random.Random(1))) in (['a', 'b'], ['A', 'b'])
+    assert sample_distinct([], str) == []
+
+
+def test_sample_distinct_uses_key():
+    pool = [{'korean': '개'}, {'korean': '개'}, {'korean': '새'}]
+    picked = sample_distinct(pool, lambda w: w['korean'], k=2, rng=random.Random(0))
+    assert sorted(w['korean'] for w in picked) == ['개', '새']
@@ -0,0 +1,50 @@
+from database.connection import get_connection
+from utils.quiz_generator import add_words, delete_word
+from utils.search import search_grammars, search_words
+
+
+def _japanese(words):
+    return [w['japanese'] for w in words]
+
+
+def test_fts_substring_and_exact_first(db):
+    words, total = search_words('せんせい', backend='fts')
+    assert total >= 1 and words[0]['japanese'] == 'せんせい'
+
+    words, _ = search_words('회사원', backend='fts')
+    assert _japanese(words) == ['かいしゃいん']
+
+
+def test_short_query_uses_like(db):
+    words, total = search_words('친구', backend='fts')
+    assert total == 1 and _japanese(words) == ['ともだち']
+
+
+def test_fts_index_follows_word_writes(db):
+    add_words([{'japanese': 'しんかんせん', 'korean': '신칸센 고속철도'}])
+    words, _ = search_words('고속철도', backend='fts')
+    assert _japanese(words) == ['しんかんせん']
+
+    conn = get_connection()
+    conn.execute("UPDATE words SET korean = '탄환열차' WHERE id = ?", (words[0]['id'],))
+    conn.commit()
+    conn.close()
+    assert search_words('고속철도', backend='fts') == ([], 0)
+
+    delete_word(words[0]['id'])
+    assert search_words('탄환열차', backend='fts') == ([], 0)
+
+
+def test_user_added_filter(db):
+    add_words([{'japanese': 'せんせいがた', 'korean': '선생님들'}])
+    words, total = search_words('せんせい', backend='fts', user_added=True)
+    assert total == 1 and _japanese(words) == ['せんせいがた']
+
+
+def test_quotes_in_query_are_escaped(db):
+    assert search_words('"せん', backend='fts') == ([], 0)
+
+
+def test_search_grammars(db):
+    grammars, total = search_grammars('ませんでした')
+    assert total >= 1 and grammars[0]['pattern'] == '〜ませんでした'
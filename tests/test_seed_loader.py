@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from database.connection import get_connection
+from database.seed_loader import iter_json_array, sync_seed_data
+
+ARRAYS = [
+    '[1,22,3.25]',
+    '[]',
+    ' [ -1.5e3 , 2E-2,0 ,true,false,null ] ',
+    '[{"japanese": "ねこ", "korean": "고양이"}, {"nested": [1, [2, {"a": "]"}]]}]',
+    '["a\\"b", "\\u3042,", "", "x y"]',
+    '\n[\n  {"level": "N5"},\n  123456789\n]\n',
+]
+
+
+@pytest.mark.parametrize('text', ARRAYS)
+def test_every_read_size(tmp_path, text):
+    path = tmp_path / 'data.json'
+    path.write_text(text, encoding='utf-8')
+    expected = json.loads(text)
+
+    for read_size in range(1, len(text) + 1):
+        assert list(iter_json_array(str(path), read_size)) == expected, read_size
+
+
+@pytest.mark.parametrize('text', ['[1, 2', '{"a": 1}', '[1, 3.]', '[1 2x]'])
+def test_malformed_arrays(tmp_path, text):
+    path = tmp_path / 'bad.json'
+    path.write_text(text, encoding='utf-8')
+
+    for read_size in (1, 2, 3, 64):
+        with pytest.raises(ValueError):
+            list(iter_json_array(str(path), read_size))
+
+
+def _write_words(data_dir, words):
+    (data_dir / 'words_n5.json').write_text(json.dumps(words, ensure_ascii=False), encoding='utf-8')
+
+
+def _seed_words():
+    conn = get_connection()
+    rows = [tuple(row) for row in conn.execute(
+        "SELECT japanese, korean FROM words WHERE source = 'words_n5.json' ORDER BY japanese")]
+    conn.close()
+    return rows
+
+
+def test_sync_only_changed_files(empty_db, tmp_path):
+    from database.init_db import init_database
+
+    init_database()
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    _write_words(data_dir, [{'japanese': 'ねこ', 'korean': '고양이'}, {'japanese': 'いぬ', 'korean': '개'}])
+
+    assert sync_seed_data(str(data_dir)) == 1
+    assert sync_seed_data(str(data_dir)) == 0
+    assert _seed_words() == [('いぬ', '개'), ('ねこ', '고양이')]
+
+    # 바뀐 항목은 갱신, 빠진 항목은 삭제
+    _write_words(data_dir, [{'japanese': 'ねこ', 'korean': '고양이 (猫)'}])
+    assert sync_seed_data(str(data_dir)) == 1
+    assert _seed_words() == [('ねこ', '고양이 (猫)')]
@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+import pytest
+
+from database.router import get_user_connection
+from utils.quiz_generator import mark_items_learned
+from utils.srs import MAX_MASTERY, MIN_EASE, get_due_items, next_schedule, record_reviews
+
+TODAY = date(2026, 3, 2)
+
+
+def test_sm2_intervals_grow_on_correct_answers():
+    ease, interval, reps = 2.5, 0, 0
+    intervals = []
+    for _ in range(4):
+        ease, interval, reps = next_schedule(ease, interval, reps, 4)
+        intervals.append(interval)
+    assert intervals == [1, 6, 15, 38]
+    assert reps == 4 and ease == pytest.approx(2.5)
+
+
+def test_sm2_wrong_answer_resets():
+    ease, interval, reps = next_schedule(2.5, 15, 3, 1)
+    assert (interval, reps) == (1, 0)
+    assert ease == pytest.approx(1.96)
+
+
+def test_sm2_ease_floor():
+    ease = 1.4
+    for _ in range(5):
+        ease, _, _ = next_schedule(ease, 1, 0, 0)
+    assert ease == MIN_EASE
+
+
+def _schedule(content_id):
+    conn = get_user_connection(1)
+    row = conn.execute('''
+        SELECT interval_days, next_review, mastery_level, review_count FROM learning_history
+        WHERE content_type = 'word' AND content_id = ?
+    ''', (content_id,)).fetchone()
+    conn.close()
+    return tuple(row)
+
+
+def test_record_reviews_applies_answers_in_order(db):
+    mark_items_learned([('word', 1), ('word', 2)])
+
+    assert record_reviews([('word', 1, True), ('word', 1, True), ('word', 2, False), ('word', 9, True)],
+                          today=TODAY) == 2
+    assert _schedule(1) == (6, (TODAY + timedelta(days=6)).isoformat(), 2, 2)
+    assert _schedule(2) == (1, (TODAY + timedelta(days=1)).isoformat(), 0, 1)
+
+
+def test_mastery_stops_at_max(db):
+    mark_items_learned([('word', 1)])
+    record_reviews([('word', 1, True)] * (MAX_MASTERY + 3), today=TODAY)
+    assert _schedule(1)[2] == MAX_MASTERY
+
+
+def test_due_items_most_overdue_first(db):
+    mark_items_learned([('word', 1), ('word', 2), ('word', 3), ('grammar', 1)])
+    record_reviews([('word', 1, True), ('word', 1, True)], today=TODAY - timedelta(days=10))  # 4일 전
+    record_reviews([('word', 2, False)], today=TODAY - timedelta(days=3))                    # 2일 전
+    record_reviews([('word', 3, True), ('grammar', 1, True)], today=TODAY + timedelta(days=5))  # 아직
+
+    due = get_due_items(10, content_type='word', today=TODAY)
+    assert [item['content_id'] for item in due] == [1, 2]
+    assert get_due_items(1, content_type='word', today=TODAY)[0]['content_id'] == 1
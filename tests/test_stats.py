@@ -0,0 +1,208 @@
+import sqlite3
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from database.connection import get_connection
+from database.init_db import add_study_minutes, check_attendance_today
+from database.migrations import HISTORY_TRIGGER_EVENTS, ROLLUP_COLUMNS, SCHEMA_VERSION, run_migrations
+from database.router import create_user, get_user_connection
+from database.stats import get_stats_snapshot, get_streaks, rebuild_stats
+from utils.quiz_generator import UPSERT_LEARNING_SQL, add_words, complete_quiz, delete_word, mark_items_learned
+
+SNAPSHOT_COLUMNS = ('user_id', 'learned_words', 'quiz_count', 'scored_quiz_count',
+                    'score_pct_sum', 'best_score', 'study_days')
+
+
+def _workload(user_id):
+    """트리거를 거치는 여러 종류의 쓰기"""
+    mark_items_learned([('word', 1), ('word', 2), ('word', 3), ('grammar', 1)], user_id)
+    mark_items_learned([('word', 1)], user_id)
+    complete_quiz(uuid.uuid4().hex, 'today', 8, 10, user_id=user_id)
+    complete_quiz(uuid.uuid4().hex, 'all', 10, 10, user_id=user_id)
+    complete_quiz(uuid.uuid4().hex, 'all', 0, 0, user_id=user_id)
+    check_attendance_today(user_id)
+    add_study_minutes([('2026-01-05', 10), ('2026-01-06', 5)], user_id)
+
+    conn = get_user_connection(user_id)
+    conn.execute("DELETE FROM quiz_results WHERE user_id = ? AND score = 10", (user_id,))
+    conn.execute("DELETE FROM learning_history WHERE user_id = ? AND content_id = 3", (user_id,))
+    conn.execute("DELETE FROM attendance WHERE user_id = ? AND date = '2026-01-06'", (user_id,))
+    conn.commit()
+    conn.close()
+
+
+def _snapshots(user_ids):
+    rows = []
+    for user_id in user_ids:
+        conn = get_user_connection(user_id)
+        rows.extend(tuple(row) for row in conn.execute(
+            f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM stats_snapshot WHERE user_id = ?", (user_id,)))
+        conn.close()
+    return rows
+
+
+def _word_counts():
+    conn = get_connection()
+    counts = dict(conn.execute(
+        "SELECT key, value FROM app_meta WHERE key IN ('word_count', 'user_added_word_count')").fetchall())
+    conn.close()
+    return counts
+
+
+def _newest_word():
+    conn = get_connection()
+    word_id = conn.execute("SELECT MAX(id) FROM words").fetchone()[0]
+    conn.close()
+    return word_id
+
+
+def _all_word_ids():
+    conn = get_connection()
+    ids = [row[0] for row in conn.execute("SELECT id FROM words")]
+    conn.close()
+    return ids
+
+
+@pytest.mark.parametrize('backend', ['shared', 'per_user'])
+def test_triggers_match_rebuild(request, backend):
+    request.getfixturevalue('per_user' if backend == 'per_user' else 'db')
+    users = [1, create_user('학습자 2')]
+    for user_id in users:
+        _workload(user_id)
+    add_words([{'japanese': 'テスト', 'korean': '테스트'}, {'japanese': 'ケーキ', 'korean': '케이크'}])
+    delete_word(_newest_word())
+
+    incremental = _snapshots(users)
+    counts = _word_counts()
+    rebuild_stats()
+    assert _snapshots(users) == incremental
+    assert _word_counts() == counts
+
+
+def _rollups(user_ids):
+    """기록이 있는 일/주 집계 행 (삭제로 0 이 된 행은 refresh_rollups 가 만들지 않으므로 뺌)"""
+    rows = []
+    for user_id in user_ids:
+        conn = get_user_connection(user_id)
+        for table in ('daily_rollup', 'weekly_rollup'):
+            rows.extend((table,) + tuple(row) for row in conn.execute(
+                f"SELECT * FROM {table} WHERE user_id = ? AND ({' OR '.join(ROLLUP_COLUMNS)}) ORDER BY 2",
+                (user_id,)))
+        conn.close()
+    return rows
+
+
+@pytest.mark.parametrize('backend', ['shared', 'per_user'])
+def test_rollup_triggers_match_refresh(request, backend):
+    request.getfixturevalue('per_user' if backend == 'per_user' else 'db')
+    users = [1, create_user('학습자 2')]
+    for user_id in users:
+        _workload(user_id)
+        # 예전에 배운 항목을 다시 학습하면 learned_at 이 오늘로 바뀜
+        conn = get_user_connection(user_id)
+        conn.execute("""
+            UPDATE learning_history SET learned_at = '2026-01-05 09:00:00'
+            WHERE user_id = ? AND content_type = 'word' AND content_id IN (1, 2)
+        """, (user_id,))
+        conn.execute("""
+            UPDATE learning_history SET learned_at = '2025-12-28 09:00:00'
+            WHERE user_id = ? AND content_type = 'grammar'
+        """, (user_id,))
+        conn.commit()
+        conn.close()
+        mark_items_learned([('word', 1), ('grammar', 1)], user_id)
+
+    incremental = _rollups(users)
+    assert ('daily_rollup', 1, '2026-01-05', 0, 0, 0, 1, 10, 1) in incremental
+    rebuild_stats()
+    assert _rollups(users) == incremental
+
+
+def test_snapshot_values(db):
+    _workload(1)
+    snapshot = get_stats_snapshot(1)
+    assert snapshot['learned_words'] == 2
+    assert snapshot['quiz_count'] == 2
+    assert snapshot['scored_quiz_count'] == 1
+    assert snapshot['best_score'] == 80.0
+    assert snapshot['study_days'] == 2
+    assert snapshot['total_words'] == len(_all_word_ids())
+
+
+def test_snapshot_for_new_learner_is_empty(db):
+    snapshot = get_stats_snapshot(create_user('새 학습자'))
+    assert snapshot['learned_words'] is None and snapshot['total_words'] > 0
+
+
+def _attend(user_id, *days_ago):
+    conn = get_user_connection(user_id)
+    conn.executemany("INSERT INTO attendance (user_id, date) VALUES (?, ?)",
+                     [(user_id, (date.today() - timedelta(days=n)).isoformat()) for n in days_ago])
+    conn.commit()
+    conn.close()
+
+
+def test_streaks_from_islands(db):
+    _attend(1, 0, 1, 2, 10, 11, 12, 13, 20)
+    streaks = get_streaks(1)
+    assert streaks['current_streak'] == 3
+    assert streaks['current_start'] == (date.today() - timedelta(days=2)).isoformat()
+    assert streaks['longest_streak'] == 4
+    assert streaks['longest_end'] == (date.today() - timedelta(days=10)).isoformat()
+
+
+def test_streak_broken_today(db):
+    _attend(1, 1, 2)
+    streaks = get_streaks(1)
+    assert streaks['current_streak'] == 0 and streaks['current_start'] is None
+    assert streaks['longest_streak'] == 2
+
+
+def test_streak_cache_follows_new_attendance(db):
+    _attend(1, 1)
+    assert get_streaks(1)['current_streak'] == 0
+    check_attendance_today(1)
+    assert get_streaks(1)['current_streak'] == 2
+
+
+def test_streaks_without_attendance(db):
+    assert get_streaks(1) == {'current_streak': 0, 'current_start': None, 'longest_streak': 0,
+                              'longest_start': None, 'longest_end': None}
+
+
+def test_upgrade_replaces_insert_or_ignore_snapshot_triggers(empty_db):
+    run_migrations()
+    # v15 이전 DB 의 트리거 (INSERT OR IGNORE 로 스냅샷 행 생성)
+    conn = get_connection()
+    for event, row in HISTORY_TRIGGER_EVENTS:
+        conn.execute(f"DROP TRIGGER stats_history_{event.lower()}")
+        conn.execute(f'''
+            CREATE TRIGGER stats_history_{event.lower()} AFTER {event} ON learning_history BEGIN
+                INSERT OR IGNORE INTO stats_snapshot (user_id) VALUES ({row}.user_id);
+                UPDATE stats_snapshot SET history_version = history_version + 1 WHERE user_id = {row}.user_id;
+            END
+        ''')
+    conn.execute("PRAGMA user_version = 14")
+    conn.commit()
+    conn.close()
+
+    raw = sqlite3.connect(empty_db)
+    raw.execute(UPSERT_LEARNING_SQL, (1, 'word', 1))
+    with pytest.raises(sqlite3.IntegrityError):
+        raw.execute(UPSERT_LEARNING_SQL, (1, 'word', 1))
+    raw.rollback()
+    raw.close()
+
+    assert run_migrations() == SCHEMA_VERSION - 14
+    mark_items_learned([('word', 1)])
+    mark_items_learned([('word', 1)])
+    assert get_stats_snapshot(1)['learned_words'] == 1
+
+
+def test_learning_same_word_twice_updates_snapshot(db):
+    mark_items_learned([('word', 1)])
+    mark_items_learned([('word', 1)])
+    snapshot = get_stats_snapshot(1)
+    assert snapshot['learned_words'] == 1 and snapshot['history_version'] == 2
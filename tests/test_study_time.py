@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+
+import pytest
+
+import utils.study_time as study_time
+from utils.study_time import StudyClock
+
+TODAY = date(2026, 3, 2)
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    events = []
+
+    class Recorder:
+        def submit(self, kind, payload):
+            events.append((kind, payload))
+
+    monkeypatch.setattr(study_time, 'get_answer_writer', lambda: Recorder())
+    return events
+
+
+def test_minutes_are_submitted_after_flush_seconds(submitted):
+    clock = StudyClock(idle_gap=600, flush_seconds=300)
+    assert clock.beat('s1', 1, now=0, today=TODAY) == 0
+    assert clock.beat('s1', 1, now=200, today=TODAY) == 0
+    assert submitted == []
+
+    # 200 + 130 = 330초 -> 5분 기록, 30초는 남겨 둠
+    assert clock.beat('s1', 1, now=330, today=TODAY) == 5
+    assert submitted == [('study_time', (1, '2026-03-02', 5))]
+
+
+def test_idle_gap_is_not_counted(submitted):
+    clock = StudyClock(idle_gap=600, flush_seconds=60)
+    clock.beat('s1', 1, now=0, today=TODAY)
+    assert clock.beat('s1', 1, now=2000, today=TODAY) == 0
+    assert clock.beat('s1', 1, now=2090, today=TODAY) == 1
+
+
+def test_sessions_of_one_learner_are_summed(submitted):
+    clock = StudyClock(idle_gap=600, flush_seconds=600)
+    for session in ('s1', 's2'):
+        clock.beat(session, 1, now=0, today=TODAY)
+        clock.beat(session, 1, now=150, today=TODAY)
+    clock.beat('s3', 2, now=0, today=TODAY)
+    clock.beat('s3', 2, now=59, today=TODAY)
+    assert submitted == []
+
+    assert clock.flush() == 1
+    assert submitted == [('study_time', (1, '2026-03-02', 5))]
+
+
+def test_idle_sessions_are_evicted(submitted):
+    clock = StudyClock(idle_gap=600, flush_seconds=300)
+    for i in range(100):
+        clock.beat(f'closed-{i}', 1, now=i, today=TODAY)
+    assert clock.session_count() == 100
+
+    clock.beat('open', 1, now=1000, today=TODAY)
+    assert clock.session_count() == 1
+    # 정리된 세션이 다시 신호를 보내면 처음처럼 0 부터 잼
+    assert clock.beat('closed-0', 1, now=1010, today=TODAY) == 0
+
+
+def test_short_session_is_written_when_swept(submitted):
+    clock = StudyClock(idle_gap=600, flush_seconds=300)
+    clock.beat('s1', 1, now=0, today=TODAY)
+    clock.beat('s1', 1, now=100, today=TODAY)
+    clock.beat('s2', 2, now=550, today=TODAY)
+    assert submitted == []
+
+    # s1 이 정리되면 1 분 40 초가 반올림되어 기록됨 (학습자 2 는 세션이 남아 있어 그대로)
+    clock.beat('s2', 2, now=800, today=TODAY)
+    assert submitted == [('study_time', (1, '2026-03-02', 2))]
+
+
+def test_past_day_is_written_on_rollover(submitted):
+    clock = StudyClock(idle_gap=600, flush_seconds=300)
+    clock.beat('s1', 1, now=0, today=TODAY)
+    clock.beat('s1', 1, now=100, today=TODAY)
+    clock.beat('s1', 1, now=650, today=TODAY + timedelta(days=1))
+    assert submitted == [('study_time', (1, '2026-03-02', 2)), ('study_time', (1, '2026-03-03', 9))]
+
+
+def test_attendance_checked_once_per_day(db):
+    from database.connection import get_connection
+    from database.init_db import check_attendance_today
+
+    assert check_attendance_today(1)
+    conn = get_connection()
+    conn.execute("DELETE FROM attendance")
+    conn.commit()
+    conn.close()
+
+    # 같은 날에는 DB 에 다시 묻지 않음
+    assert check_attendance_today(1)
+    conn = get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM attendance").fetchone()[0] == 0
+    conn.close()
@@ -0,0 +1,37 @@
+from database.connection import get_connection
+from utils.quiz_generator import add_words, count_words, get_all_words, get_words_page
+
+
+def _walk(limit, **filters):
+    ids, cursor = [], None
+    while True:
+        words, cursor = get_words_page(after=cursor, limit=limit, **filters)
+        ids.extend(w['id'] for w in words)
+        if cursor is None:
+            return ids
+
+
+def test_pages_cover_catalog_in_order(db):
+    add_words([{'japanese': 'テスト', 'korean': '테스트'}, {'japanese': 'ケーキ', 'korean': '케이크'}])
+    expected = [w['id'] for w in get_all_words()]
+
+    for limit in (1, 7, len(expected), len(expected) + 5):
+        assert _walk(limit) == expected
+
+
+def test_filters_match_count(db):
+    ids = _walk(4, category='동사', level='N5')
+    assert len(ids) == count_words(category='동사', level='N5') > 0
+    assert _walk(4, category='없는 카테고리') == []
+    assert count_words() == len(get_all_words())
+
+
+def test_filtered_page_uses_index(db):
+    conn = get_connection()
+    plan = ' '.join(row[3] for row in conn.execute('''
+        EXPLAIN QUERY PLAN
+        SELECT id FROM words WHERE category = ? AND (is_user_added, id) < (?, ?)
+        ORDER BY is_user_added DESC, id DESC LIMIT 11
+    ''', ('동사', 0, 100)))
+    conn.close()
+    assert 'ix_words_category_page' in plan and 'TEMP B-TREE' not in plan
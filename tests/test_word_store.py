@@ -0,0 +1,54 @@
+from utils.word_store import WORD_COLUMNS, WordStore
+
+
+def _word(word_id, user_added=0, **values):
+    row = {col: None for col in WORD_COLUMNS}
+    row.update(japanese=f'w{word_id}', korean=f'k{word_id}', level='N5', category='명사')
+    row.update(values, id=word_id, is_user_added=user_added)
+    return row
+
+
+def _store_rows():
+    return [_word(1), _word(2, user_added=1), _word(3, category='동사'), _word(4, user_added=1)]
+
+
+def _store():
+    return WordStore(_store_rows())
+
+
+def test_rows_put_user_added_and_newest_first():
+    store = _store()
+    assert list(store.ids) == [4, 2, 3, 1]
+    assert len(store) == 4
+    assert store.row_of(3) == 2 and store.row_of(99) is None
+    assert 2 in store and 99 not in store
+
+
+def test_user_added_bitmap():
+    store = _store()
+    assert store.user_added_rows() == [0, 1]
+    assert store.count_user_added() == 2
+    assert [store.is_user_added(i) for i in range(4)] == [True, True, False, False]
+
+
+def test_category_and_level_indexes():
+    store = WordStore(_store_rows() + [_word(5, level='N4')])
+    assert store.categories() == ['동사', '명사']
+    assert store.levels() == ['N4', 'N5']
+    assert [store.ids[i] for i in store.filter_rows(category='명사')] == [4, 2, 5, 1]
+    assert [store.ids[i] for i in store.filter_rows(category='명사', level='N5', user_added=False)] == [1]
+    assert store.filter_rows(category='없음') == []
+    assert len(store.filter_rows()) == 5
+
+
+def test_dicts_match_source_rows():
+    store = _store()
+    assert store.get(3) == _word(3, category='동사')
+    assert store.get(99) is None
+    assert [w['id'] for w in store.get_many([1, 99, 4])] == [1, 4]
+    assert store.value(store.row_of(3), 'category') == '동사'
+
+
+def test_empty_store():
+    store = WordStore([])
+    assert len(store) == 0 and store.user_added_rows() == [] and store.get_many([1]) == []
@@ -0,0 +1,186 @@
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.router import DEFAULT_USER_ID, get_users, get_user_connection
+
+# answer_events 의 정수 코드 (순서를 바꾸지 말고 뒤에만 추가)
+QUIZ_KINDS = ('today', 'all')
+ITEM_KINDS = ('word', 'grammar')
+QUESTION_KINDS = ('jp_to_kr', 'kr_to_jp', 'grammar')
+
+EVENT_COLUMNS = (
+    'id', 'user_id', 'session', 'quiz_kind', 'position', 'item_kind', 'item_id',
+    'question_kind', 'chosen', 'chosen_id', 'correct', 'response_ms', 'answered_at',
+)
+# 코드 -> 이름 (내보낼 때 decode=True 이면 이름으로 바꿈)
+_DECODERS = {
+    'quiz_kind': QUIZ_KINDS,
+    'item_kind': ITEM_KINDS,
+    'question_kind': QUESTION_KINDS,
+}
+
+EXPORT_CHUNK_ROWS = 100000   # 파일 하나에 담는 행 수
+READ_BATCH_ROWS = 5000       # DB 에서 한 번에 읽는 행 수
+
+
+def session_key(token):
+    """퀴즈 토큰(uuid hex)을 정수 세션 번호로 (60비트)"""
+    return int(token[:15], 16)
+
+
+def encode_answer_event(session, quiz_type, position, entry, option_index, response_ms=None, answered_at=None):
+    """compact_quiz 한 문제와 고른 보기를 answer_events 한 행(정수 튜플)으로
+
+    user_id 는 기록할 때 붙이므로 포함하지 않습니다.
+    """
+    if entry[0] == 'w':
+        item_kind, question_kind = 0, QUESTION_KINDS.index(entry[2])
+    else:
+        item_kind, question_kind = 1, QUESTION_KINDS.index('grammar')
+    option_ids = entry[-1]
+    return (
+        session,
+        QUIZ_KINDS.index(quiz_type),
+        position,
+        item_kind,
+        entry[1],
+        question_kind,
+        option_index,
+        option_ids[option_index],
+        int(option_ids[option_index] == entry[1]),
+        None if response_ms is None else int(response_ms),
+        int(answered_at if answered_at is not None else time.time()),
+    )
+
+
+def append_answer_events(rows, user_id=DEFAULT_USER_ID):
+    """encode_answer_event 로 만든 행들을 한 트랜잭션으로 추가"""
+    if not rows:
+        return 0
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.executemany('''
+        INSERT INTO answer_events (
+            user_id, session, quiz_kind, position, item_kind, item_id,
+            question_kind, chosen, chosen_id, correct, response_ms, answered_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(user_id,) + tuple(row) for row in rows])
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+
+def _to_epoch(value):
+    """날짜 문자열(YYYY-MM-DD) / datetime / 정수를 유닉스 초로"""
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.timestamp())
+
+
+def iter_answer_events(user_id=DEFAULT_USER_ID, since=None, until=None, batch_rows=READ_BATCH_ROWS):
+    """학습자의 답안 이벤트를 시간순으로 하나씩 (batch_rows 개씩 나눠 읽음)
+
+    (answered_at, id) 로 이어서 읽으므로 메모리에는 한 묶음만 올라갑니다.
+    since 는 포함, until 은 제외하는 범위입니다.
+    """
+    since = _to_epoch(since)
+    until = _to_epoch(until)
+    # id 는 1 부터이므로 (since, 0) 다음부터 읽으면 since 시각의 이벤트도 포함됨
+    last = (since if since is not None else -1, 0)
+    until_filter = '' if until is None else 'AND answered_at < ?'
+
+    while True:
+        params = [user_id, last[0], last[1]] + ([] if until is None else [until]) + [batch_rows]
+        conn = get_user_connection(user_id)
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT {', '.join(EVENT_COLUMNS)} FROM answer_events
+            WHERE user_id = ? AND (answered_at, id) > (?, ?) {until_filter}
+            ORDER BY answered_at, id
+            LIMIT ?
+        ''', params)
+        rows = [tuple(row) for row in cursor.fetchall()]
+        conn.close()
+
+        yield from rows
+        if len(rows) < batch_rows:
+            return
+        last = (rows[-1][-1], rows[-1][0])
+
+
+def _decode(row):
+    """정수 코드를 이름으로 바꾼 dict"""
+    record = dict(zip(EVENT_COLUMNS, row))
+    for column, names in _DECODERS.items():
+        record[column] = names[record[column]]
+    record['correct'] = bool(record['correct'])
+    record['answered_at'] = datetime.fromtimestamp(record['answered_at']).isoformat(timespec='seconds')
+    return record
+
+
+def export_answer_events(out_dir, fmt='csv', user_ids=None, since=None, until=None,
+                         chunk_rows=EXPORT_CHUNK_ROWS, decode=False):
+    """답안 이벤트를 chunk_rows 행씩 나눈 CSV/JSONL 파일로 내보내기
+
+    파일 이름은 answer_events_00001.csv 처럼 번호가 붙으며, 학습자별로 순서대로 이어 씁니다.
+    쓴 파일 경로 리스트를 반환합니다.
+    """
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    if user_ids is None:
+        user_ids = [u['id'] for u in get_users()]
+    os.makedirs(out_dir, exist_ok=True)
+
+    paths = []
+    out = writer = None
+    rows_in_file = 0
+    try:
+        for user_id in user_ids:
+            for row in iter_answer_events(user_id, since, until):
+                if out is None or rows_in_file >= chunk_rows:
+                    if out is not None:
+                        out.close()
+                    path = os.path.join(out_dir, f"answer_events_{len(paths) + 1:05d}.{fmt}")
+                    out = open(path, 'w', encoding='utf-8', newline='')
+                    paths.append(path)
+                    rows_in_file = 0
+                    if fmt == 'csv':
+                        writer = csv.writer(out)
+                        writer.writerow(EVENT_COLUMNS)
+
+                if fmt == 'csv':
+                    writer.writerow(_decode(row).values() if decode else row)
+                else:
+                    record = _decode(row) if decode else dict(zip(EVENT_COLUMNS, row))
+                    out.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+                rows_in_file += 1
+    finally:
+        if out is not None:
+            out.close()
+    return paths
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="답안 이벤트 내보내기")
+    parser.add_argument('out_dir')
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default='csv')
+    parser.add_argument('--user', type=int, action='append', help="학습자 id (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument('--since', help="YYYY-MM-DD (포함)")
+    parser.add_argument('--until', help="YYYY-MM-DD (제외)")
+    parser.add_argument('--chunk-rows', type=int, default=EXPORT_CHUNK_ROWS)
+    parser.add_argument('--decode', action='store_true', help="정수 코드 대신 이름으로")
+    args = parser.parse_args()
+
+    paths = export_answer_events(args.out_dir, args.format, args.user, args.since, args.until,
+                                 args.chunk_rows, args.decode)
+    print(f"✅ 답안 이벤트 파일 {len(paths)}개 내보내기 완료!")
@@ -0,0 +1,316 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from database.init_db import add_study_minutes
+from utils.answer_log import append_answer_events
+from utils.quiz_generator import save_wrong_answers
+from utils.srs import record_reviews
+
+FLUSH_INTERVAL = 2.0    # 초 - 첫 이벤트 이후 이 시간 안에 기록
+MAX_QUEUE_SIZE = 10000
+MAX_BATCH_SIZE = 500
+MAX_WRITE_ATTEMPTS = 3  # 이만큼 연달아 실패한 이벤트는 파일로 옮겨 두고 다음 실행 때 다시 기록
+FAILED_EVENTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'database', 'failed_answers.jsonl')
+
+_FLUSH = object()
+_STOP = object()
+
+
+class PartialWriteError(Exception):
+    """배치 일부만 기록하지 못함 - failed 는 기록되지 않은 [(payload 리스트, 오류), ...]
+
+    기록 함수가 학습자별로 따로 커밋할 때 실패한 학습자 몫만 알리려고 사용합니다.
+    (다른 예외는 배치 전체가 기록되지 않은 것으로 봄)
+    """
+
+    def __init__(self, failed):
+        super().__init__('; '.join(str(error) for _, error in failed))
+        self.failed = failed
+
+
+class AnswerWriter:
+    """퀴즈 답안 이벤트를 모아 백그라운드 스레드에서 일괄 기록
+
+    handlers 는 {이벤트 종류: 배치 기록 함수} 형태이며,
+    기록 함수는 같은 종류의 payload 리스트를 받아 한 트랜잭션으로 쓰거나,
+    나눠서 커밋했다면 기록하지 못한 부분만 PartialWriteError 로 알립니다.
+    기록하지 못한 묶음은 새 이벤트와 섞지 않고 그대로 다음 기록 때 다시 시도하며,
+    max_attempts 번 실패하면 하나씩 기록해 보고 그래도 실패한 이벤트만
+    failed_path 에 JSON 한 줄씩 남겨 replay_failed() 로 다시 기록합니다.
+    """
+
+    def __init__(self, handlers, flush_interval=FLUSH_INTERVAL,
+                 maxsize=MAX_QUEUE_SIZE, max_batch=MAX_BATCH_SIZE,
+                 max_attempts=MAX_WRITE_ATTEMPTS, failed_path=FAILED_EVENTS_PATH):
+        self._handlers = dict(handlers)
+        self._flush_interval = flush_interval
+        self._max_batch = max_batch
+        self._max_attempts = max_attempts
+        self._failed_path = failed_path
+        self._queue = queue.Queue(maxsize)
+        self._retry = []   # [(이벤트 종류, 실패 횟수, payload 리스트), ...]
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+
+        self.flush_count = 0
+        self.event_count = 0
+        self.overflow_count = 0
+        self.error_count = 0
+        self.saved_count = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="answer-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, kind, payload):
+        """이벤트 등록 - 큐가 가득 차면 호출한 스레드에서 바로 기록"""
+        if kind not in self._handlers:
+            raise ValueError(f"알 수 없는 이벤트 종류: {kind}")
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((kind, payload))
+        except queue.Full:
+            with self._metrics_lock:
+                self.overflow_count += 1
+            self._write({kind: [payload]})
+
+    def _signal(self, marker, timeout):
+        """큐에 표시를 넣고 스레드가 처리할 때까지 대기 (큐가 timeout 동안 가득 차 있으면 False)"""
+        deadline = time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            self._queue.put((marker, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(max(0.0, deadline - time.monotonic()))
+
+    def flush(self, timeout=5.0):
+        """지금까지 등록된 이벤트를 모두 기록할 때까지 대기 (timeout 안에 끝나지 않으면 False)"""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        return self._signal(_FLUSH, timeout)
+
+    def stop(self, timeout=5.0):
+        """남은 이벤트를 기록하고 스레드 종료 - 다시 시도할 배치가 남아 있으면 파일로 옮김"""
+        if self._thread is not None and self._thread.is_alive():
+            self._signal(_STOP, timeout)
+            self._thread.join(timeout)
+        with self._write_lock:
+            retry, self._retry = self._retry, []
+            if retry:
+                self._save_failed([(kind, payload) for kind, _, payloads in retry for payload in payloads])
+
+    def replay_failed(self):
+        """파일로 옮겨 둔 실패 이벤트를 다시 기록 요청 - 요청한 이벤트 수 반환"""
+        if not self._failed_path or not os.path.exists(self._failed_path):
+            return 0
+        # 읽는 동안 새로 실패한 이벤트가 같은 파일에 섞이지 않도록 옮긴 뒤 읽음
+        replaying = self._failed_path + '.replay'
+        with self._write_lock:
+            os.replace(self._failed_path, replaying)
+        count = 0
+        with open(replaying, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    kind, payload = json.loads(line)
+                    self.submit(kind, tuple(payload))
+                    count += 1
+        os.remove(replaying)
+        return count
+
+    def get_metrics(self):
+        """큐 깊이 및 기록 지연 시간 통계"""
+        with self._metrics_lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'flush_count': self.flush_count,
+                'event_count': self.event_count,
+                'overflow_count': self.overflow_count,
+                'error_count': self.error_count,
+                'saved_count': self.saved_count,
+                'retry_depth': sum(len(payloads) for _, _, payloads in self._retry),
+                'last_flush_ms': round(self.last_flush_ms, 2),
+                'max_flush_ms': round(self.max_flush_ms, 2),
+                'avg_flush_ms': round(self._total_flush_ms / self.flush_count, 2)
+                                if self.flush_count else 0.0,
+            }
+
+    def _run(self):
+        pending = defaultdict(list)
+        pending_count = 0
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                kind, payload = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                kind, payload = None, None
+
+            if kind is _FLUSH or kind is _STOP or kind is None:
+                if pending or self._retry:
+                    self._write(pending)
+                    pending = defaultdict(list)
+                    pending_count = 0
+                deadline = None
+                if kind is not None:
+                    payload.set()
+                if kind is _STOP:
+                    return
+                continue
+
+            if deadline is None:
+                deadline = time.monotonic() + self._flush_interval
+            pending[kind].append(payload)
+            pending_count += 1
+
+            if pending_count >= self._max_batch:
+                self._write(pending)
+                pending = defaultdict(list)
+                pending_count = 0
+                deadline = None
+
+    def _attempt(self, kind, payloads):
+        """배치 기록 - 기록하지 못한 [(payload 리스트, 오류), ...] 반환 (모두 기록했으면 빈 리스트)"""
+        try:
+            self._handlers[kind](payloads)
+        except PartialWriteError as e:
+            return e.failed
+        except Exception as e:
+            return [(payloads, e)]
+        return []
+
+    def _write(self, pending):
+        start = time.perf_counter()
+        written = 0
+        with self._write_lock:
+            # 지난번에 실패한 묶음을 먼저, 새 이벤트와 섞지 않고 따로 씀
+            # (섞으면 묶음 일부가 기록된 뒤 실패했을 때 기록된 이벤트까지 다시 쓰게 됨)
+            batches = self._retry + [(kind, 0, list(payloads))
+                                     for kind, payloads in pending.items() if payloads]
+            self._retry = []
+
+            give_up = []
+            for kind, attempts, payloads in batches:
+                failures = self._attempt(kind, payloads)
+                written += len(payloads) - sum(len(failed) for failed, _ in failures)
+                for failed, error in failures:
+                    with self._metrics_lock:
+                        self.error_count += 1
+                    print(f"❌ 답안 기록 실패 ({kind}, {len(failed)}건, {attempts + 1}번째): {error}")
+                    if attempts + 1 < self._max_attempts:
+                        self._retry.append((kind, attempts + 1, failed))
+                        continue
+                    # 마지막 시도 - 하나씩 기록해 보고 그래도 실패한 이벤트만 파일로
+                    for payload in failed:
+                        if len(failed) > 1 and not self._attempt(kind, [payload]):
+                            written += 1
+                        else:
+                            give_up.append((kind, payload))
+            if give_up:
+                self._save_failed(give_up)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._metrics_lock:
+            self.flush_count += 1
+            self.event_count += written
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+
+    def _save_failed(self, events):
+        """다시 시도해도 실패한 [(이벤트 종류, payload), ...] 를 파일에 추가 (_write_lock 안에서 호출)"""
+        count = len(events)
+        if not self._failed_path:
+            print(f"❌ 답안 {count}건을 기록하지 못했습니다.")
+            return
+        os.makedirs(os.path.dirname(self._failed_path), exist_ok=True)
+        with open(self._failed_path, 'a', encoding='utf-8') as f:
+            for kind, payload in events:
+                f.write(json.dumps([kind, payload], ensure_ascii=False) + '\n')
+        with self._metrics_lock:
+            self.saved_count += count
+        print(f"ℹ️ 기록하지 못한 답안 {count}건을 {self._failed_path} 에 보관했습니다.")
+
+
+def _write_by_user(payloads, write):
+    """(user_id, ...) payload 를 학습자별로 나눠 write(user_id, payload 리스트) 로 기록
+
+    학습자마다 따로 커밋하므로 실패한 학습자의 payload 만 PartialWriteError 로 알립니다.
+    """
+    by_user = defaultdict(list)
+    for payload in payloads:
+        by_user[payload[0]].append(payload)
+    failed = []
+    for user_id, user_payloads in by_user.items():
+        try:
+            write(user_id, user_payloads)
+        except Exception as e:
+            failed.append((user_payloads, e))
+    if failed:
+        raise PartialWriteError(failed)
+
+
+def _write_wrong_answers(payloads):
+    """(user_id, question_type, content_type, content_id) 이벤트를 학습자별로 기록"""
+    _write_by_user(payloads, lambda user_id, items: save_wrong_answers(
+        [tuple(item[1:]) for item in items], user_id))
+
+
+def _write_reviews(payloads):
+    """(user_id, content_type, content_id, 정답 여부) 이벤트로 학습자별 복습 일정 갱신"""
+    _write_by_user(payloads, lambda user_id, items: record_reviews(
+        [tuple(item[1:]) for item in items], user_id))
+
+
+def _write_answer_events(payloads):
+    """(user_id, encode_answer_event 행) 이벤트를 학습자별로 answer_events 에 추가"""
+    _write_by_user(payloads, lambda user_id, items: append_answer_events(
+        [row for _, row in items], user_id))
+
+
+def _write_study_minutes(payloads):
+    """(user_id, 날짜, 분) 이벤트를 학습자별로 출석의 학습 시간에 더함"""
+    _write_by_user(payloads, lambda user_id, items: add_study_minutes(
+        [tuple(item[1:]) for item in items], user_id))
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_answer_writer():
+    """프로세스 공용 AnswerWriter 반환"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AnswerWriter({
+                    'wrong_answer': _write_wrong_answers,
+                    'review': _write_reviews,
+                    'study_time': _write_study_minutes,
+                    'answer_event': _write_answer_events,
+                })
+                # 프로세스 종료 시 남은 이벤트 기록
+                atexit.register(_writer.stop)
+                # 지난 실행에서 기록하지 못하고 남긴 이벤트
+                _writer.replay_failed()
+    return _writer
@@ -0,0 +1,179 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.quiz_generator import build_word_question, generate_word_quiz, get_word_store
+from utils.sampling import normalize_option, sample_distinct
+from utils.word_store import WORD_COLUMNS, WordStore
+
+# 문제 유형 번호 (배열에는 번호로 보관)
+QUESTION_TYPES = ('jp_to_kr', 'kr_to_jp')
+ANSWER_KEYS = ('korean', 'japanese')
+
+# 중복 문제/보기를 다시 뽑는 최대 횟수 (넘으면 해당 문제만 sample_distinct 로 채움)
+MAX_REDRAWS = 16
+
+
+def _text_keys(store, rows, col):
+    """row 마다 정규화한 보기 글자의 번호 - 같은 글자면 같은 번호"""
+    texts = np.array([normalize_option(store.value(row, col)) for row in rows.tolist()])
+    _, keys = np.unique(texts, return_inverse=True)
+    return keys.reshape(-1)
+
+
+def _has_duplicates(values):
+    """마지막 축에 같은 값이 있는 행 (bool 배열)"""
+    ordered = np.sort(values, axis=-1)
+    return (ordered[..., 1:] == ordered[..., :-1]).any(axis=-1)
+
+
+class QuizBatch:
+    """여러 퀴즈의 문제/보기를 pool 위치 번호 배열로 보관 - dict 는 꺼낼 때 만듦
+
+    questions[i, j]      i 번째 퀴즈 j 번째 문제의 정답 위치
+    options[i, j, :]     보기 순서대로의 위치 (정답 포함)
+    question_types[i, j] QUESTION_TYPES 의 번호
+    """
+
+    def __init__(self, store, rows, questions, options, question_types):
+        self.store = store
+        self.rows = rows.tolist()
+        self.questions = questions
+        self.options = options
+        self.question_types = question_types
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.quiz(i)
+
+    def quiz(self, i):
+        """i 번째 퀴즈의 문제 dict 리스트 (generate_word_quiz 와 같은 형식)"""
+        to_dict = self.store.to_dict
+        rows = self.rows
+        return [
+            build_word_question(to_dict(rows[q]), QUESTION_TYPES[t], [to_dict(rows[o]) for o in opts])
+            for q, opts, t in zip(self.questions[i].tolist(), self.options[i].tolist(),
+                                  self.question_types[i].tolist())
+        ]
+
+    def compact(self, i):
+        """i 번째 퀴즈의 compact_quiz 형식 (dict 를 만들지 않음)"""
+        ids = self.store.ids
+        return [
+            ['w', ids[self.rows[q]], QUESTION_TYPES[t], [ids[self.rows[o]] for o in opts]]
+            for q, opts, t in zip(self.questions[i].tolist(), self.options[i].tolist(),
+                                  self.question_types[i].tolist())
+        ]
+
+
+def generate_word_quiz_batch(num_quizzes, num_questions=10, num_options=4, rows=None, store=None, rng=None):
+    """단어 퀴즈 여러 개를 한 번에 생성 (QuizBatch)
+
+    rows 는 출제 범위인 WordStore row 번호 배열이며 (기본: 전체), 모든 퀴즈의 문제와 오답을
+    NumPy 호출 몇 번으로 뽑습니다. 오답은 정답 위치를 제외한 범위에서 뽑고, 정답과 보기 글자가
+    겹치는 문제만 다시 뽑습니다.
+    """
+    store = store or get_word_store()
+    rows = np.arange(len(store)) if rows is None else np.asarray(rows, dtype=np.int64)
+    rng = rng or np.random.default_rng()
+    n = len(rows)
+    if n < num_options:
+        raise ValueError(f"출제 범위가 보기 수({num_options})보다 작습니다: {n}")
+    num_questions = min(num_questions, n)
+
+    # 문제: 퀴즈 안에서 겹치지 않게 (겹친 퀴즈만 다시 뽑음)
+    questions = rng.integers(0, n, size=(num_quizzes, num_questions))
+    for _ in range(MAX_REDRAWS):
+        bad = _has_duplicates(questions)
+        if not bad.any():
+            break
+        questions[bad] = rng.integers(0, n, size=(bad.sum(), num_questions))
+    else:
+        for i in np.flatnonzero(_has_duplicates(questions)):
+            questions[i] = rng.choice(n, size=num_questions, replace=False)
+
+    question_types = rng.integers(0, len(QUESTION_TYPES), size=questions.shape)
+    keys = np.stack([_text_keys(store, rows, col) for col in ANSWER_KEYS])
+
+    # 오답: [0, n-1) 에서 뽑아 정답 위치 이상이면 1 을 더해 정답을 건너뜀
+    def draw_wrong(correct):
+        wrong = rng.integers(0, n - 1, size=correct.shape + (num_options - 1,))
+        return wrong + (wrong >= correct[..., None])
+
+    options = np.concatenate([questions[..., None], draw_wrong(questions)], axis=-1)
+    type_index = question_types[..., None]
+    for _ in range(MAX_REDRAWS):
+        bad = _has_duplicates(keys[type_index, options])
+        if not bad.any():
+            break
+        options[bad, 1:] = draw_wrong(questions[bad])
+    else:
+        for i, j in zip(*np.nonzero(_has_duplicates(keys[type_index, options]))):
+            col = ANSWER_KEYS[question_types[i, j]]
+            wrong = sample_distinct(range(n), lambda p: store.value(int(rows[p]), col),
+                                    exclude=[store.value(int(rows[questions[i, j]]), col)],
+                                    k=num_options - 1)
+            # 서로 다른 글자가 모자라면 정답을 반복하지 않도록 그대로 둠
+            if len(wrong) == num_options - 1:
+                options[i, j, 1:] = wrong
+
+    # 보기 순서 섞기
+    order = np.argsort(rng.random(options.shape), axis=-1)
+    options = np.take_along_axis(options, order, axis=-1)
+
+    return QuizBatch(store, rows, questions, options, question_types)
+
+
+def _synthetic_store(size):
+    """벤치마크용 가상 단어 저장소"""
+    rows = []
+    for i in range(size):
+        row = {col: f"{col}-{i}" for col in WORD_COLUMNS}
+        row.update(id=i + 1, level='N1', category='기타', is_user_added=0)
+        rows.append(row)
+    return WordStore(rows)
+
+
+def benchmark(num_quizzes=1000, num_questions=10, bank_size=10000, seed=0):
+    """generate_word_quiz 와 일괄 생성의 처리량 비교 (초당 퀴즈 수)"""
+    store = _synthetic_store(bank_size)
+    words = store.to_dicts(range(len(store)))
+    rng = np.random.default_rng(seed)
+
+    start = time.perf_counter()
+    for _ in range(num_quizzes):
+        generate_word_quiz(words, num_questions)
+    loop_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = generate_word_quiz_batch(num_quizzes, num_questions, store=store, rng=rng)
+    batch_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for quiz in batch:
+        pass
+    materialize_sec = time.perf_counter() - start
+
+    results = {
+        'bank_size': bank_size,
+        'num_quizzes': num_quizzes,
+        'loop_quizzes_per_sec': round(num_quizzes / loop_sec),
+        'batch_quizzes_per_sec': round(num_quizzes / batch_sec),
+        'batch_with_dicts_per_sec': round(num_quizzes / (batch_sec + materialize_sec)),
+    }
+    print(f"📊 단어 {bank_size}개, 퀴즈 {num_quizzes}개 x {num_questions}문제")
+    print(f"  generate_word_quiz 반복  : {results['loop_quizzes_per_sec']:>10,} 퀴즈/초")
+    print(f"  일괄 생성 (id 배열)      : {results['batch_quizzes_per_sec']:>10,} 퀴즈/초")
+    print(f"  일괄 생성 + dict 변환    : {results['batch_with_dicts_per_sec']:>10,} 퀴즈/초")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
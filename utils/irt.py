@@ -0,0 +1,321 @@
+import math
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import get_connection
+from database.router import DEFAULT_USER_ID, PROGRESS_BACKEND, get_users, get_user_connection
+from utils.answer_log import ITEM_KINDS
+
+# Rasch 모형: P(정답) = 1 / (1 + exp(-(실력 - 난이도)))
+#   실력/난이도 모두 평균 0, 표준편차 PRIOR_SD 인 정규 사전분포로 묶어 (MAP)
+#   모두 맞히거나 모두 틀린 학습자/문항도 유한한 값이 나오게 함
+PRIOR_SD = 2.0
+MAX_ITER = 100
+TOLERANCE = 1e-4
+MAX_STEP = 1.0
+
+# 문제를 고를 때 목표로 하는 예상 정답률
+TARGET_SUCCESS = 0.7
+
+_refresh_lock = threading.Lock()
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def fit_rasch(users, items, attempts, correct, ability=None, difficulty=None):
+    """학습자 x 문항 응답 집계로 실력/난이도를 한 번에 추정
+
+    users, items 는 0 부터의 번호 배열, attempts/correct 는 같은 길이의 응답 수/정답 수입니다.
+    ability/difficulty 를 주면 그 값에서 시작합니다 (이전 추정값으로 이어서 계산).
+    (실력, 실력 표준오차, 난이도, 난이도 표준오차, 반복 횟수) 를 반환합니다.
+    """
+    users = np.asarray(users, dtype=np.int64)
+    items = np.asarray(items, dtype=np.int64)
+    n = np.asarray(attempts, dtype=np.float64)
+    k = np.asarray(correct, dtype=np.float64)
+    num_users = int(users.max()) + 1 if len(users) else 0
+    num_items = int(items.max()) + 1 if len(items) else 0
+    precision = 1.0 / PRIOR_SD ** 2
+
+    theta = np.zeros(num_users) if ability is None else np.array(ability, dtype=np.float64)
+    b = np.zeros(num_items) if difficulty is None else np.array(difficulty, dtype=np.float64)
+
+    # 실력 한 번, 난이도 한 번씩 번갈아 뉴턴 갱신 (각각은 학습자/문항별로 독립이라 bincount 한 번)
+    iterations = 0
+    for iterations in range(1, MAX_ITER + 1):
+        p = _sigmoid(theta[users] - b[items])
+        grad = np.bincount(users, k - n * p, num_users) - precision * theta
+        info = np.bincount(users, n * p * (1 - p), num_users) + precision
+        theta_step = np.clip(grad / info, -MAX_STEP, MAX_STEP)
+        theta += theta_step
+
+        p = _sigmoid(theta[users] - b[items])
+        grad = -np.bincount(items, k - n * p, num_items) - precision * b
+        info = np.bincount(items, n * p * (1 - p), num_items) + precision
+        b_step = np.clip(grad / info, -MAX_STEP, MAX_STEP)
+        b += b_step
+
+        if max(np.abs(theta_step).max(initial=0), np.abs(b_step).max(initial=0)) < TOLERANCE:
+            break
+
+    p = _sigmoid(theta[users] - b[items])
+    theta_se = 1.0 / np.sqrt(np.bincount(users, n * p * (1 - p), num_users) + precision)
+    b_se = 1.0 / np.sqrt(np.bincount(items, n * p * (1 - p), num_items) + precision)
+    return theta, theta_se, b, b_se, iterations
+
+
+def _progress_connections():
+    """(학습자 id 또는 None, 진도 DB 연결) - 공용 DB 면 연결 하나"""
+    if PROGRESS_BACKEND == 'per_user':
+        return [(u['id'], get_user_connection(u['id'])) for u in get_users()]
+    return [(None, get_connection())]
+
+
+def _load_counts():
+    """모든 학습자의 item_response_counts 행"""
+    rows = []
+    for _, conn in _progress_connections():
+        cursor = conn.cursor()
+        cursor.execute("SELECT user_id, item_kind, item_id, attempts, correct FROM item_response_counts")
+        rows.extend(tuple(row) for row in cursor.fetchall())
+        conn.close()
+    return rows
+
+
+def _answer_total():
+    """모든 학습자의 답안 수 (트리거가 갱신하는 answer_totals - 학습자당 한 행)"""
+    total = 0
+    for _, conn in _progress_connections():
+        cursor = conn.cursor()
+        cursor.execute("SELECT COALESCE(SUM(attempts), 0) FROM answer_totals")
+        total += cursor.fetchone()[0]
+        conn.close()
+    return total
+
+
+def refresh_estimates(force=False):
+    """응답이 늘었으면 난이도/실력 다시 추정 (이전 추정값에서 이어서 계산)
+
+    item_response_counts 는 answer_events 트리거가 갱신하므로 이벤트를 다시 읽지 않으며,
+    전체 응답 수가 지난번 추정 때와 같으면 집계를 읽지 않고 끝냅니다. 다시 추정했으면 True.
+    화면에서는 바로 부르지 말고 request_refresh() 로 백그라운드에 맡깁니다.
+    """
+    with _refresh_lock:
+        total = _answer_total()
+
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM app_meta WHERE key = 'irt_response_count'")
+        row = cursor.fetchone()
+        if not total or (not force and row is not None and row[0] == total):
+            conn.close()
+            return False
+
+        rows = _load_counts()
+        total = sum(row[3] for row in rows)
+
+        data = np.array(rows, dtype=np.int64)
+        user_ids, users = np.unique(data[:, 0], return_inverse=True)
+        item_keys, items = np.unique(data[:, 1:3], axis=0, return_inverse=True)
+        users = users.reshape(-1)
+        items = items.reshape(-1)
+
+        # 이전 추정값에서 시작 (새 학습자/문항은 0)
+        cursor.execute("SELECT item_kind, item_id, difficulty FROM item_difficulty")
+        previous = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+        difficulty = np.array([previous.get((kind, item_id), 0.0) for kind, item_id in item_keys.tolist()])
+        abilities = {}
+        for _, user_conn in _progress_connections():
+            user_cursor = user_conn.cursor()
+            user_cursor.execute("SELECT user_id, ability FROM learner_ability")
+            abilities.update((row[0], row[1]) for row in user_cursor.fetchall())
+            user_conn.close()
+        ability = np.array([abilities.get(user_id, 0.0) for user_id in user_ids.tolist()])
+
+        theta, theta_se, b, b_se, _ = fit_rasch(users, items, data[:, 3], data[:, 4], ability, difficulty)
+
+        item_attempts = np.bincount(items, data[:, 3], len(item_keys)).astype(np.int64)
+        item_correct = np.bincount(items, data[:, 4], len(item_keys)).astype(np.int64)
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DELETE FROM item_difficulty")
+        cursor.executemany("""
+            INSERT INTO item_difficulty (item_kind, item_id, difficulty, se, attempts, correct)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, zip(item_keys[:, 0].tolist(), item_keys[:, 1].tolist(), b.tolist(), b_se.tolist(),
+                 item_attempts.tolist(), item_correct.tolist()))
+        cursor.execute("""
+            INSERT INTO app_meta (key, value) VALUES ('irt_response_count', ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+        """, (total,))
+        conn.commit()
+        conn.close()
+
+        user_attempts = np.bincount(users, data[:, 3], len(user_ids)).astype(np.int64)
+        estimates = {
+            user_id: (ability_value, se, attempts)
+            for user_id, ability_value, se, attempts
+            in zip(user_ids.tolist(), theta.tolist(), theta_se.tolist(), user_attempts.tolist())
+        }
+        for owner, user_conn in _progress_connections():
+            user_cursor = user_conn.cursor()
+            user_cursor.executemany("""
+                INSERT INTO learner_ability (user_id, ability, se, attempts) VALUES (?, ?, ?, ?)
+                ON CONFLICT (user_id) DO UPDATE
+                SET ability = excluded.ability, se = excluded.se, attempts = excluded.attempts,
+                    fitted_at = CURRENT_TIMESTAMP
+            """, [(user_id,) + values for user_id, values in estimates.items()
+                  if owner is None or user_id == owner])
+            user_conn.commit()
+            user_conn.close()
+        return True
+
+
+def estimates_stale(user_id=DEFAULT_USER_ID):
+    """학습자의 답안 수가 마지막 실력 추정 때보다 늘었는지 (두 행만 읽음)"""
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT COALESCE((SELECT attempts FROM answer_totals WHERE user_id = ?), 0)
+             > COALESCE((SELECT attempts FROM learner_ability WHERE user_id = ?), 0)
+    """, (user_id, user_id))
+    stale = bool(cursor.fetchone()[0])
+    conn.close()
+    return stale
+
+
+class EstimateRefresher:
+    """재추정 요청을 백그라운드 스레드에서 처리 (처리 전에 여러 번 들어온 요청은 한 번으로)"""
+
+    def __init__(self):
+        self._requested = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.error_count = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="irt-refresher", daemon=True)
+                self._thread.start()
+
+    def request(self):
+        """재추정 예약 (바로 반환)"""
+        self._ensure_started()
+        self._requested.set()
+
+    def _run(self):
+        while True:
+            self._requested.wait()
+            # 처리 중에 들어온 요청은 한 번 더 처리되도록 먼저 지움
+            self._requested.clear()
+            try:
+                refresh_estimates()
+            except Exception as e:
+                self.error_count += 1
+                print(f"❌ 문항 난이도 / 실력 추정 실패: {e}")
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_estimate_refresher():
+    """프로세스 공용 EstimateRefresher 반환"""
+    global _refresher
+    if _refresher is None:
+        with _refresher_lock:
+            if _refresher is None:
+                _refresher = EstimateRefresher()
+    return _refresher
+
+
+def request_refresh(user_id=DEFAULT_USER_ID):
+    """화면용 - 학습자의 응답이 늘었으면 백그라운드 재추정 예약 (바로 반환, 예약했으면 True)
+
+    재추정이 끝나기 전까지는 지난 추정값을 그대로 보여 줍니다.
+    """
+    if not estimates_stale(user_id):
+        return False
+    get_estimate_refresher().request()
+    return True
+
+
+def get_learner_ability(user_id=DEFAULT_USER_ID):
+    """학습자 실력 추정값 dict (아직 없으면 None)"""
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute("SELECT ability, se, attempts, fitted_at FROM learner_ability WHERE user_id = ?", (user_id,))
+    row = cursor.fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def get_item_estimates(user_id=DEFAULT_USER_ID, item_kind=None, limit=None):
+    """학습자가 풀어 본 문항의 난이도와 예상 정답률 - 예상 정답률이 낮은 것부터
+
+    item_kind 는 'word' / 'grammar' 이며, 결과의 p_correct 는 현재 실력 추정값 기준입니다.
+    """
+    kind_filter = '' if item_kind is None else 'AND c.item_kind = ?'
+    params = [user_id] + ([] if item_kind is None else [ITEM_KINDS.index(item_kind)])
+
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute("SELECT ability FROM learner_ability WHERE user_id = ?", (user_id,))
+    row = cursor.fetchone()
+    ability = row[0] if row else 0.0
+    cursor.execute(f"""
+        SELECT c.item_kind, c.item_id, c.attempts, c.correct, d.difficulty, d.se
+        FROM item_response_counts c
+        JOIN item_difficulty d ON d.item_kind = c.item_kind AND d.item_id = c.item_id
+        WHERE c.user_id = ? {kind_filter}
+        ORDER BY d.difficulty DESC
+    """, params)
+    estimates = []
+    for kind, item_id, attempts, correct, difficulty, se in cursor.fetchall():
+        estimates.append({
+            'item_kind': ITEM_KINDS[kind],
+            'item_id': item_id,
+            'attempts': attempts,
+            'correct': correct,
+            'difficulty': difficulty,
+            'se': se,
+            'p_correct': 1.0 / (1.0 + math.exp(difficulty - ability)),
+        })
+    conn.close()
+    return estimates[:limit] if limit is not None else estimates
+
+
+def pick_targeted_items(item_ids, n, item_kind='word', user_id=DEFAULT_USER_ID, target=TARGET_SUCCESS):
+    """item_ids 중 예상 정답률이 target 에 가장 가까운 n 개 (난이도 추정값이 있는 문항만)"""
+    if n <= 0 or not item_ids:
+        return []
+
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute("SELECT ability FROM learner_ability WHERE user_id = ?", (user_id,))
+    row = cursor.fetchone()
+    ability = row[0] if row else 0.0
+    cursor.execute("SELECT item_id, difficulty FROM item_difficulty WHERE item_kind = ?",
+                   (ITEM_KINDS.index(item_kind),))
+    difficulty = {row[0]: row[1] for row in cursor.fetchall()}
+    conn.close()
+
+    scored = []
+    for item_id in item_ids:
+        if item_id in difficulty:
+            p = 1.0 / (1.0 + math.exp(difficulty[item_id] - ability))
+            scored.append((abs(p - target), item_id))
+    scored.sort()
+    return [item_id for _, item_id in scored[:n]]
+
+
+if __name__ == "__main__":
+    refresh_estimates(force=True)
+    print("✅ 문항 난이도 / 학습자 실력 추정 완료!")
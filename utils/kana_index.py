@@ -0,0 +1,201 @@
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+# 로마자 → 히라가나 (긴 표기부터 매칭)
+_ROMAJI = {
+    'a': 'あ', 'i': 'い', 'u': 'う', 'e': 'え', 'o': 'お',
+    'ka': 'か', 'ki': 'き', 'ku': 'く', 'ke': 'け', 'ko': 'こ',
+    'sa': 'さ', 'si': 'し', 'shi': 'し', 'su': 'す', 'se': 'せ', 'so': 'そ',
+    'ta': 'た', 'ti': 'ち', 'chi': 'ち', 'tu': 'つ', 'tsu': 'つ', 'te': 'て', 'to': 'と',
+    'na': 'な', 'ni': 'に', 'nu': 'ぬ', 'ne': 'ね', 'no': 'の',
+    'ha': 'は', 'hi': 'ひ', 'hu': 'ふ', 'fu': 'ふ', 'he': 'へ', 'ho': 'ほ',
+    'ma': 'ま', 'mi': 'み', 'mu': 'む', 'me': 'め', 'mo': 'も',
+    'ya': 'や', 'yu': 'ゆ', 'yo': 'よ',
+    'ra': 'ら', 'ri': 'り', 'ru': 'る', 're': 'れ', 'ro': 'ろ',
+    'wa': 'わ', 'wo': 'を', "n'": 'ん',
+    'ga': 'が', 'gi': 'ぎ', 'gu': 'ぐ', 'ge': 'げ', 'go': 'ご',
+    'za': 'ざ', 'zi': 'じ', 'ji': 'じ', 'zu': 'ず', 'ze': 'ぜ', 'zo': 'ぞ',
+    'da': 'だ', 'di': 'ぢ', 'du': 'づ', 'de': 'で', 'do': 'ど',
+    'ba': 'ば', 'bi': 'び', 'bu': 'ぶ', 'be': 'べ', 'bo': 'ぼ',
+    'pa': 'ぱ', 'pi': 'ぴ', 'pu': 'ぷ', 'pe': 'ぺ', 'po': 'ぽ',
+    'kya': 'きゃ', 'kyu': 'きゅ', 'kyo': 'きょ',
+    'sha': 'しゃ', 'shu': 'しゅ', 'sho': 'しょ', 'sya': 'しゃ', 'syu': 'しゅ', 'syo': 'しょ',
+    'cha': 'ちゃ', 'chu': 'ちゅ', 'cho': 'ちょ', 'tya': 'ちゃ', 'tyu': 'ちゅ', 'tyo': 'ちょ',
+    'nya': 'にゃ', 'nyu': 'にゅ', 'nyo': 'にょ',
+    'hya': 'ひゃ', 'hyu': 'ひゅ', 'hyo': 'ひょ',
+    'mya': 'みゃ', 'myu': 'みゅ', 'myo': 'みょ',
+    'rya': 'りゃ', 'ryu': 'りゅ', 'ryo': 'りょ',
+    'gya': 'ぎゃ', 'gyu': 'ぎゅ', 'gyo': 'ぎょ',
+    'ja': 'じゃ', 'ju': 'じゅ', 'jo': 'じょ', 'zya': 'じゃ', 'zyu': 'じゅ', 'zyo': 'じょ',
+    'bya': 'びゃ', 'byu': 'びゅ', 'byo': 'びょ',
+    'pya': 'ぴゃ', 'pyu': 'ぴゅ', 'pyo': 'ぴょ',
+    'fa': 'ふぁ', 'fi': 'ふぃ', 'fe': 'ふぇ', 'fo': 'ふぉ',
+    'je': 'じぇ', 'che': 'ちぇ', 'she': 'しぇ',
+    '-': 'ー',
+}
+_ROMAJI_MAX = max(len(k) for k in _ROMAJI)
+
+# 장음 기호 'ー' 를 앞 글자의 모음으로 바꾸기 위한 표
+_VOWEL_OF = {}
+for _row, _vowels in (
+    ('あかさたなはまやらわがざだばぱぁゃ', 'あ'),
+    ('いきしちにひみりぎじぢびぴぃ', 'い'),
+    ('うくすつぬふむゆるぐずづぶぷぅゅっ', 'う'),
+    ('えけせてねへめれげぜでべぺぇ', 'え'),
+    ('おこそとのほもよろをごぞどぼぽぉょ', 'お'),
+):
+    for _kana in _row:
+        _VOWEL_OF[_kana] = _vowels
+
+# 장모음 로마자 표기 (kōhī, tôkyô) → 모음 두 번
+_MACRONS = str.maketrans({
+    'ā': 'aa', 'ī': 'ii', 'ū': 'uu', 'ē': 'ee', 'ō': 'oo',
+    'â': 'aa', 'î': 'ii', 'û': 'uu', 'ê': 'ee', 'ô': 'oo',
+})
+
+_ASCII_RUN = re.compile(r"[a-z'\-]+")
+
+
+def romaji_to_kana(text):
+    """로마자(헵번/훈령식)를 히라가나로 변환 - 변환할 수 없는 글자는 그대로 둠"""
+    text = text.lower()
+    out = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        nxt = text[i + 1] if i + 1 < len(text) else ''
+
+        # 촉음: 같은 자음 두 번 (n 제외)
+        if ch == nxt and ch.isalpha() and ch not in 'aiueon':
+            out.append('っ')
+            i += 1
+            continue
+
+        # 'nn' 은 ん (뒤에 모음/y 가 오면 두 번째 n 은 다음 글자의 자음)
+        if ch == 'n' and nxt == 'n':
+            after = text[i + 2] if i + 2 < len(text) else ''
+            out.append('ん')
+            i += 1 if after and after in 'aiueoy' else 2
+            continue
+
+        # 'n' 뒤에 모음/y 가 오지 않으면 ん
+        if ch == 'n' and (not nxt or nxt not in "aiueoy'"):
+            out.append('ん')
+            i += 1
+            continue
+
+        for size in range(min(_ROMAJI_MAX, len(text) - i), 0, -1):
+            kana = _ROMAJI.get(text[i:i + size])
+            if kana:
+                out.append(kana)
+                i += size
+                break
+        else:
+            out.append(ch)
+            i += 1
+    return ''.join(out)
+
+
+def normalize_kana(text, transliterate=False):
+    """검색 키 정규화
+
+    NFKC 폭 통일 → 소문자 → (선택) 장음 부호 풀기 + 로마자 → 히라가나 → 가타카나 → 히라가나 →
+    장모음을 모음 두 번으로 통일하고 공백을 제거합니다.
+    (せんせー / せんせい → せんせえ, とうきょう / とーきょー → とおきょお)
+    """
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKC', text).lower()
+
+    if transliterate:
+        text = text.translate(_MACRONS)
+        text = _ASCII_RUN.sub(lambda m: romaji_to_kana(m.group()), text)
+
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        # 가타카나 (ァ-ヶ) → 히라가나
+        if 0x30A1 <= code <= 0x30F6:
+            ch = chr(code - 0x60)
+        if chars:
+            vowel = _VOWEL_OF.get(chars[-1])
+            # 장음 기호와 え단 뒤의 い, お단 뒤의 う 는 앞 글자의 모음으로
+            if ch == 'ー' or (ch == 'い' and vowel == 'え') or (ch == 'う' and vowel == 'お'):
+                ch = vowel or ch
+        if not ch.isspace():
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def _grams(text):
+    """1-gram + 2-gram"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def _query_grams(text):
+    if len(text) == 1:
+        return [text]
+    return list({text[i:i + 2] for i in range(len(text) - 1)})
+
+
+def _contains(postings, row):
+    i = bisect_left(postings, row)
+    return i < len(postings) and postings[i] == row
+
+
+class KanaIndex:
+    """japanese / hiragana / kanji 의 정규화된 문자 n-gram 역색인
+
+    WordStore 의 row 번호를 posting 으로 가지며, 조회는 가장 짧은 posting list 에서 출발해
+    나머지 list 를 이진 탐색으로 교집합한 뒤 정규화 문자열 포함 여부로 최종 확인합니다.
+    """
+
+    FIELDS = ('japanese', 'hiragana', 'kanji')
+
+    def __init__(self, store):
+        self.store = store
+        self.keys = []
+        postings = {}
+        for row in range(len(store)):
+            keys = {normalize_kana(store.value(row, f)) for f in self.FIELDS} - {''}
+            self.keys.append(tuple(keys))
+            for key in keys:
+                for gram in _grams(key):
+                    postings.setdefault(gram, set()).add(row)
+
+        self._postings = {g: array('I', sorted(rows)) for g, rows in postings.items()}
+
+    def lookup(self, query):
+        """검색어와 일치하는 row 번호 - 정확히 일치, 앞부분 일치, 짧은 단어 순"""
+        key = normalize_kana(query, transliterate=True)
+        if not key:
+            return []
+
+        lists = []
+        for gram in _query_grams(key):
+            postings = self._postings.get(gram)
+            if postings is None:
+                return []
+            lists.append(postings)
+        lists.sort(key=len)
+
+        smallest, others = lists[0], lists[1:]
+        candidates = [r for r in smallest if all(_contains(p, r) for p in others)]
+
+        ranked = []
+        for row in candidates:
+            best = None
+            for k in self.keys[row]:
+                if key not in k:
+                    continue
+                rank = (0 if k == key else 1 if k.startswith(key) else 2, len(k))
+                if best is None or rank < best:
+                    best = rank
+            if best is not None:
+                ranked.append((best, row))
+        ranked.sort()
+        return [row for _, row in ranked]
@@ -0,0 +1,53 @@
+import uuid
+
+import streamlit as st
+
+from database.router import DEFAULT_USER_ID, get_users, create_user, resolve_user_id
+from utils.study_time import get_study_clock
+
+
+def get_current_user_id():
+    """현재 세션의 학습자 id (URL 의 ?user= 값이 등록된 학습자면 우선)"""
+    if 'user_id' not in st.session_state:
+        st.session_state.user_id = resolve_user_id(st.query_params.get('user'))
+    return st.session_state.user_id
+
+
+def track_study_time(user_id):
+    """학습 시간 신호 - 화면이 다시 그려질 때마다 호출 (DB 기록은 모아서 나중에)"""
+    if 'study_session_id' not in st.session_state:
+        st.session_state.study_session_id = uuid.uuid4().hex
+    get_study_clock().beat(st.session_state.study_session_id, user_id)
+
+
+def render_learner_selector():
+    """사이드바 학습자 선택 / 추가"""
+    user_id = get_current_user_id()
+    users = get_users()
+    ids = [u['id'] for u in users]
+    names = {u['id']: u['name'] for u in users}
+
+    if user_id not in names:
+        user_id = st.session_state.user_id = DEFAULT_USER_ID
+
+    st.markdown("### 👤 학습자")
+    selected = st.selectbox(
+        "학습자 선택",
+        ids,
+        index=ids.index(user_id) if user_id in ids else 0,
+        format_func=lambda i: names.get(i, str(i)),
+        label_visibility="collapsed"
+    )
+    if selected != user_id:
+        st.session_state.user_id = selected
+        st.query_params['user'] = str(selected)
+        st.rerun()
+
+    with st.expander("➕ 학습자 추가"):
+        new_name = st.text_input("이름", key="new_learner_name")
+        if st.button("추가", key="add_learner") and new_name.strip():
+            st.session_state.user_id = create_user(new_name)
+            st.query_params['user'] = str(st.session_state.user_id)
+            st.rerun()
+
+    return st.session_state.user_id
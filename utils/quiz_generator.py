@@ -1,88 +1,95 @@
+import json
 import random
-import sqlite3
-import os
+from collections import Counter
 from datetime import date
+from itertools import islice
 
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'nihongo.db')
+from database.catalog import bump_catalog_version, cached_catalog
+from database.connection import get_connection
+from database.router import DEFAULT_USER_ID, get_user_connection
+from database.stats import get_stats_snapshot, get_streaks
+from utils.irt import pick_targeted_items
+from utils.sampling import keyed_permutation, sample_distinct
+from utils.srs import get_due_items
+from utils.word_store import WORD_COLUMNS, WordStore
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def get_today_words(limit=5):
+def get_today_words(limit=5, user_id=DEFAULT_USER_ID):
     """오늘의 학습 단어 가져오기 (사용자 추가 단어 우선)"""
-    conn = get_connection()
+    conn = get_user_connection(user_id)
     cursor = conn.cursor()
     today = date.today().isoformat()
     
+    store = get_word_store()
+    
     # 오늘 할당된 단어 확인
     cursor.execute("""
-        SELECT w.* FROM words w
-        JOIN daily_assignment da ON w.id = da.content_id
-        WHERE da.date = ? AND da.content_type = 'word'
-    """, (today,))
+        SELECT content_id FROM daily_assignment
+        WHERE user_id = ? AND date = ? AND content_type = 'word'
+        ORDER BY id
+    """, (user_id, today))
     
-    assigned_words = [dict(row) for row in cursor.fetchall()]
+    assigned_ids = [row[0] for row in cursor.fetchall() if row[0] in store]
     
-    # 할당된 단어가 없으면 새로 할당
-    if not assigned_words:
-        # 1순위: 사용자가 추가한 단어 중 아직 학습하지 않은 것
-        cursor.execute("""
-            SELECT w.* FROM words w
-            LEFT JOIN learning_history lh ON w.id = lh.content_id AND lh.content_type = 'word'
-            WHERE lh.id IS NULL AND w.is_user_added = 1
-            ORDER BY RANDOM()
-            LIMIT ?
-        """, (limit,))
-        new_words = list(cursor.fetchall())
-        
-        # 2순위: 부족하면 일반 단어 중 학습하지 않은 것 추가
-        if len(new_words) < limit:
-            remaining = limit - len(new_words)
-            cursor.execute("""
-                SELECT w.* FROM words w
-                LEFT JOIN learning_history lh ON w.id = lh.content_id AND lh.content_type = 'word'
-                WHERE lh.id IS NULL AND (w.is_user_added = 0 OR w.is_user_added IS NULL)
-                ORDER BY RANDOM()
-                LIMIT ?
-            """, (remaining,))
-            new_words.extend(cursor.fetchall())
+    # 할당된 단어가 없으면 날짜/학습자로 정해지는 순서에서 새로 할당
+    if not assigned_ids:
+        # 1순위: 사용자가 추가한 단어, 2순위: 일반 단어 (각각 아직 학습하지 않은 것)
+        new_ids = _pick_unlearned(cursor, user_id, _daily_word_order(store, today, user_id), limit)
         
-        # 3순위: 그래도 부족하면 전체에서 랜덤
-        if len(new_words) < limit:
-            cursor.execute("""
-                SELECT w.* FROM words w
-                ORDER BY w.is_user_added DESC, RANDOM()
-                LIMIT ?
-            """, (limit,))
-            new_words = list(cursor.fetchall())
+        # 3순위: 그래도 부족하면 학습 여부와 관계없이 같은 순서에서
+        if len(new_ids) < limit:
+            new_ids = list(islice(_daily_word_order(store, today, user_id), limit))
         
         # 오늘 할당에 추가
-        for word in new_words:
-            cursor.execute("""
-                INSERT INTO daily_assignment (date, content_type, content_id)
-                VALUES (?, 'word', ?)
-            """, (today, word['id']))
+        cursor.executemany("""
+            INSERT OR IGNORE INTO daily_assignment (user_id, date, content_type, content_id)
+            VALUES (?, ?, 'word', ?)
+        """, [(user_id, today, word_id) for word_id in new_ids])
         
         conn.commit()
-        assigned_words = [dict(row) for row in new_words]
+        assigned_ids = new_ids
     
     conn.close()
-    return assigned_words
+    return store.get_many(assigned_ids)
 
-def get_learned_words():
+def _daily_word_order(store, today, user_id):
+    """오늘의 단어 후보 id 순서 - 사용자 추가 단어 먼저, 그룹마다 (날짜, 학습자) 로 섞은 순서
+
+    WordStore 는 사용자 추가 단어가 앞쪽 row 에 모여 있으므로 두 구간을 각각 섞습니다.
+    """
+    user_added = store.count_user_added()
+    for offset, size, group in ((0, user_added, 'user'), (user_added, len(store) - user_added, 'base')):
+        for i in keyed_permutation(size, f"{today}:{user_id}:{group}"):
+            yield store.ids[offset + i]
+
+def _pick_unlearned(cursor, user_id, candidate_ids, limit):
+    """후보 id 를 순서대로 보며 학습하지 않은 것 limit 개 (학습 기록은 묶음 단위로 색인 조회)"""
+    candidate_ids = iter(candidate_ids)
+    picked = []
+    batch_size = max(limit * 2, 16)
+    while len(picked) < limit:
+        batch = list(islice(candidate_ids, batch_size))
+        if not batch:
+            break
+        cursor.execute(f"""
+            SELECT content_id FROM learning_history
+            WHERE user_id = ? AND content_type = 'word'
+              AND content_id IN ({', '.join('?' for _ in batch)})
+        """, [user_id] + batch)
+        learned = {row[0] for row in cursor.fetchall()}
+        picked.extend(word_id for word_id in batch if word_id not in learned)
+    return picked[:limit]
+
+def get_learned_words(user_id=DEFAULT_USER_ID):
     """지금까지 학습한 모든 단어"""
-    conn = get_connection()
+    conn = get_user_connection(user_id)
     cursor = conn.cursor()
     
     cursor.execute("""
-        SELECT DISTINCT w.* FROM words w
-        JOIN learning_history lh ON w.id = lh.content_id
-        WHERE lh.content_type = 'word'
-    """)
+        SELECT content_id FROM learning_history
+        WHERE user_id = ? AND content_type = 'word'
+    """, (user_id,))
     
-    words = [dict(row) for row in cursor.fetchall()]
+    words = get_word_store().get_many(row[0] for row in cursor.fetchall())
     conn.close()
     
     # 학습 기록이 없으면 모든 단어 반환
@@ -91,29 +98,93 @@ def get_learned_words():
     
     return words
 
-def get_all_words():
-    """모든 단어 (사용자 추가 단어 우선)"""
+def _load_word_store():
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM words ORDER BY is_user_added DESC, id DESC")
-    words = [dict(row) for row in cursor.fetchall()]
+    cursor.execute(f"SELECT id, {', '.join(WORD_COLUMNS)}, is_user_added FROM words")
+    store = WordStore(cursor.fetchall())
     conn.close()
-    return words
+    return store
+
+def get_word_store():
+    """단어 카탈로그 WordStore (카탈로그 버전이 바뀔 때만 다시 만듦)"""
+    return cached_catalog('word_store', _load_word_store)
+
+def get_all_words():
+    """모든 단어 (사용자 추가 단어 우선)"""
+    store = get_word_store()
+    return store.to_dicts(range(len(store)))
 
 def get_user_added_words():
     """사용자가 추가한 단어만"""
+    store = get_word_store()
+    return store.to_dicts(store.user_added_rows())
+
+def _load_word_categories():
     conn = get_connection()
     cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT * FROM words WHERE is_user_added = 1 ORDER BY id DESC")
-        words = [dict(row) for row in cursor.fetchall()]
-    except:
-        words = []
+    cursor.execute("SELECT DISTINCT category FROM words WHERE category IS NOT NULL AND category != '' ORDER BY category")
+    categories = [row[0] for row in cursor.fetchall()]
     conn.close()
-    return words
+    return categories
+
+def get_word_categories():
+    """단어 카테고리 목록 (카탈로그 버전이 바뀔 때만 다시 조회)"""
+    return cached_catalog('word_categories', _load_word_categories)
+
+def _word_filter(category=None, level=None):
+    conditions = []
+    params = []
+    if category is not None:
+        conditions.append("category = ?")
+        params.append(category)
+    if level is not None:
+        conditions.append("level = ?")
+        params.append(level)
+    return conditions, params
+
+def count_words(category=None, level=None):
+    """조건에 맞는 단어 수"""
+    conditions, params = _word_filter(category, level)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
 
-def get_all_grammars():
-    """모든 문법"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM words {where}", params)
+    total = cursor.fetchone()[0]
+    conn.close()
+    return total
+
+def get_words_page(category=None, level=None, after=None, limit=10):
+    """단어 목록 한 페이지 - (단어 리스트, 다음 페이지 커서)
+
+    사용자 추가 단어 우선, 최신 id 우선 순서입니다. after 에 이전 페이지가 돌려준 커서
+    (is_user_added, id) 를 주면 그 다음 행부터 limit 개만 읽고, 마지막 페이지면 커서는 None 입니다.
+    """
+    conditions, params = _word_filter(category, level)
+    if after is not None:
+        conditions.append("(is_user_added, id) < (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT id, {', '.join(WORD_COLUMNS)}, is_user_added
+        FROM words {where}
+        ORDER BY is_user_added DESC, id DESC
+        LIMIT ?
+    ''', params + [limit + 1])
+    words = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+
+    next_cursor = None
+    if len(words) > limit:
+        words = words[:limit]
+        next_cursor = (words[-1]['is_user_added'], words[-1]['id'])
+    return words, next_cursor
+
+def _load_all_grammars():
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM grammars")
@@ -121,172 +192,328 @@ def get_all_grammars():
     conn.close()
     return grammars
 
-def mark_word_learned(word_id):
-    """단어 학습 완료 표시"""
+def get_all_grammars():
+    """모든 문법"""
+    return cached_catalog('all_grammars', _load_all_grammars)
+
+def get_grammar_map():
+    """id → 문법 dict (읽기 전용으로 공유)"""
+    return cached_catalog('grammar_map', lambda: {g['id']: g for g in get_all_grammars()})
+
+def add_words(words, is_user_added=True):
+    """단어 추가 - 일본어와 한국어 뜻이 있는 항목만 한 트랜잭션으로 저장하고 추가된 수를 반환"""
+    rows = [
+        (
+            w.get('japanese', ''),
+            w.get('hiragana', ''),
+            w.get('kanji', ''),
+            w.get('korean', ''),
+            w.get('level', 'N5'),
+            w.get('category', '기타'),
+            w.get('example_sentence', ''),
+            w.get('example_korean', ''),
+            w.get('memo_tip', ''),
+            1 if is_user_added else 0
+        )
+        for w in words
+        if w.get('japanese') and w.get('korean')
+    ]
+    if not rows:
+        return 0
+    
     conn = get_connection()
     cursor = conn.cursor()
+    cursor.executemany(f"""
+        INSERT INTO words ({', '.join(WORD_COLUMNS)}, is_user_added)
+        VALUES ({', '.join('?' for _ in WORD_COLUMNS)}, ?)
+    """, rows)
+    bump_catalog_version(cursor)
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+def delete_word(word_id):
+    """단어 삭제"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM words WHERE id = ?", (word_id,))
+    if cursor.rowcount:
+        bump_catalog_version(cursor)
+    conn.commit()
+    conn.close()
+
+UPSERT_LEARNING_SQL = """
+    INSERT INTO learning_history (user_id, content_type, content_id, next_review)
+    VALUES (?, ?, ?, DATE('now', 'localtime'))
+    ON CONFLICT (user_id, content_type, content_id) DO UPDATE
+    SET review_count = review_count + 1, learned_at = CURRENT_TIMESTAMP
+"""
+
+def mark_word_learned(word_id, user_id=DEFAULT_USER_ID):
+    """단어 학습 완료 표시"""
+    mark_items_learned([('word', word_id)], user_id)
+
+def mark_items_learned(items, user_id=DEFAULT_USER_ID):
+    """여러 항목 학습 완료 표시 - [(content_type, content_id), ...] 를 한 트랜잭션으로"""
+    items = [(user_id, ct, cid) for ct, cid in items]
+    if not items:
+        return
     
-    # 기존 기록 확인
-    cursor.execute("""
-        SELECT id FROM learning_history
-        WHERE content_type = 'word' AND content_id = ?
-    """, (word_id,))
-    
-    existing = cursor.fetchone()
-    
-    if existing:
-        cursor.execute("""
-            UPDATE learning_history
-            SET review_count = review_count + 1, learned_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (existing['id'],))
-    else:
-        cursor.execute("""
-            INSERT INTO learning_history (content_type, content_id)
-            VALUES ('word', ?)
-        """, (word_id,))
-    
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.executemany(UPSERT_LEARNING_SQL, items)
     conn.commit()
     conn.close()
 
 def generate_word_quiz(words, num_questions=10):
     """단어 퀴즈 생성"""
-    if len(words) < 4:
+    return _word_questions(words, num_questions, lambda w, col: w[col], lambda w: w)
+
+def _item_key(item):
+    return item['id'] if isinstance(item, dict) else item
+
+def _word_questions(pool, num_questions, text_of, word_of, first=()):
+    """단어 문제 생성 - pool 은 단어 dict 또는 WordStore row 번호 목록
+    
+    text_of(항목, 컬럼) 으로 보기 글자만 읽고, word_of(항목) 으로 문제에 나온 단어만 dict 로 만듭니다.
+    first 에 준 항목(복습할 때가 된 단어 등)을 먼저 출제하고 남는 문제는 pool 에서 무작위로 고릅니다.
+    """
+    if len(pool) < 4:
         return []
     
     questions = []
-    quiz_words = random.sample(words, min(num_questions, len(words)))
+    quiz_items = list(first)[:num_questions]
+    # 단어 dict 는 id 로, row 번호는 그대로 비교
+    chosen = {_item_key(item) for item in quiz_items}
+    rest = [item for item in pool if _item_key(item) not in chosen]
+    quiz_items += random.sample(rest, min(num_questions - len(quiz_items), len(rest)))
     
-    for word in quiz_words:
-        # 오답 보기 생성
-        other_words = [w for w in words if w['id'] != word['id']]
-        wrong_answers = random.sample(other_words, min(3, len(other_words)))
-        
+    for item in quiz_items:
         # 문제 유형 결정 (일본어 → 한국어 / 한국어 → 일본어)
         question_type = random.choice(['jp_to_kr', 'kr_to_jp'])
+        answer_key = 'korean' if question_type == 'jp_to_kr' else 'japanese'
         
-        if question_type == 'jp_to_kr':
-            question = {
-                'type': 'word',
-                'question_type': 'jp_to_kr',
-                'question': f"「{word['japanese']}」의 뜻은?",
-                'correct_answer': word['korean'],
-                'options': [word['korean']] + [w['korean'] for w in wrong_answers],
-                'word_id': word['id'],
-                'hint': word.get('memo_tip', '')
-            }
-        else:
-            question = {
-                'type': 'word',
-                'question_type': 'kr_to_jp',
-                'question': f"「{word['korean']}」을(를) 일본어로?",
-                'correct_answer': word['japanese'],
-                'options': [word['japanese']] + [w['japanese'] for w in wrong_answers],
-                'word_id': word['id'],
-                'hint': word.get('memo_tip', '')
-            }
+        # 오답 보기 생성 (정답과도, 서로 간에도 글자가 겹치지 않게)
+        wrong_answers = sample_distinct(pool, lambda x: text_of(x, answer_key),
+                                        exclude=[text_of(item, answer_key)])
+        if not wrong_answers:
+            continue
         
-        random.shuffle(question['options'])
-        questions.append(question)
+        # 정답 + 오답 단어를 섞은 순서가 보기 순서
+        word = word_of(item)
+        option_words = [word] + [word_of(x) for x in wrong_answers]
+        random.shuffle(option_words)
+        questions.append(build_word_question(word, question_type, option_words))
     
     return questions
 
-def generate_grammar_quiz(grammars, num_questions=5):
-    """문법 퀴즈 생성"""
+def build_word_question(word, question_type, option_words):
+    """단어 문제 dict - option_words 는 보기 순서대로의 단어 (정답 포함)"""
+    answer_key = 'korean' if question_type == 'jp_to_kr' else 'japanese'
+    if question_type == 'jp_to_kr':
+        question_text = f"「{word['japanese']}」의 뜻은?"
+    else:
+        question_text = f"「{word['korean']}」을(를) 일본어로?"
+    
+    return {
+        'type': 'word',
+        'question_type': question_type,
+        'question': question_text,
+        'correct_answer': word[answer_key],
+        'options': [w[answer_key] for w in option_words],
+        'option_ids': [w['id'] for w in option_words],
+        'word_id': word['id'],
+        'hint': word.get('memo_tip', '')
+    }
+
+def generate_grammar_quiz(grammars, num_questions=5, first=()):
+    """문법 퀴즈 생성 - first 에 준 문법을 먼저 출제하고 남는 문제는 무작위로 고름"""
     if len(grammars) < 4:
         return []
     
     questions = []
-    quiz_grammars = random.sample(grammars, min(num_questions, len(grammars)))
+    quiz_grammars = list(first)[:num_questions]
+    chosen = {g['id'] for g in quiz_grammars}
+    rest = [g for g in grammars if g['id'] not in chosen]
+    quiz_grammars += random.sample(rest, min(num_questions - len(quiz_grammars), len(rest)))
     
     for grammar in quiz_grammars:
-        other_grammars = [g for g in grammars if g['id'] != grammar['id']]
-        wrong_answers = random.sample(other_grammars, min(3, len(other_grammars)))
-        
-        question = {
-            'type': 'grammar',
-            'question': f"「{grammar['pattern']}」의 의미는?",
-            'correct_answer': grammar['meaning'],
-            'options': [grammar['meaning']] + [g['meaning'] for g in wrong_answers],
-            'grammar_id': grammar['id'],
-            'hint': grammar.get('explanation', '')
-        }
+        wrong_answers = sample_distinct(grammars, lambda g: g['meaning'], exclude=[grammar['meaning']])
+        if not wrong_answers:
+            continue
         
-        random.shuffle(question['options'])
-        questions.append(question)
+        option_grammars = [grammar] + wrong_answers
+        random.shuffle(option_grammars)
+        questions.append(build_grammar_question(grammar, option_grammars))
     
     return questions
 
-def generate_full_quiz(quiz_type='today', word_count=7, grammar_count=3):
+def build_grammar_question(grammar, option_grammars):
+    """문법 문제 dict - option_grammars 는 보기 순서대로의 문법 (정답 포함)"""
+    return {
+        'type': 'grammar',
+        'question': f"「{grammar['pattern']}」의 의미는?",
+        'correct_answer': grammar['meaning'],
+        'options': [g['meaning'] for g in option_grammars],
+        'option_ids': [g['id'] for g in option_grammars],
+        'grammar_id': grammar['id'],
+        'hint': grammar.get('explanation', '')
+    }
+
+def compact_quiz(questions):
+    """퀴즈를 id 만 담은 JSON 호환 리스트로 - 단어 ['w', id, 유형, 보기 id], 문법 ['g', id, 보기 id]"""
+    compact = []
+    for q in questions:
+        if q['type'] == 'word':
+            compact.append(['w', q['word_id'], q['question_type'], q['option_ids']])
+        else:
+            compact.append(['g', q['grammar_id'], q['option_ids']])
+    return compact
+
+def expand_question(entry):
+    """compact_quiz 항목 하나를 현재 카탈로그로 문제 dict 로 (없어진 단어/문법이 있으면 None)"""
+    if entry[0] == 'w':
+        _, word_id, question_type, option_ids = entry
+        words = get_word_store().get_many([word_id] + option_ids)
+        if len(words) != len(option_ids) + 1:
+            return None
+        return build_word_question(words[0], question_type, words[1:])
+    
+    _, grammar_id, option_ids = entry
+    grammars = get_grammar_map()
+    items = [grammars.get(i) for i in [grammar_id] + option_ids]
+    if None in items:
+        return None
+    return build_grammar_question(items[0], items[1:])
+
+def describe_item(item_kind, item_id):
+    """단어/문법 id 를 화면에 보여줄 글자로 ('word' → 일본어 (뜻), 'grammar' → 패턴 (의미))"""
+    if item_kind == 'word':
+        words = get_word_store().get_many([item_id])
+        return f"{words[0]['japanese']} ({words[0]['korean']})" if words else None
+    grammar = get_grammar_map().get(item_id)
+    return f"{grammar['pattern']} ({grammar['meaning']})" if grammar else None
+
+def is_correct_option(entry, option_index):
+    """compact_quiz 항목에서 option_index 번째 보기가 정답인지"""
+    return entry[-1][option_index] == entry[1]
+
+def get_review_pool(user_id=DEFAULT_USER_ID):
+    """종합 복습 퀴즈 대상 단어 id - 사용자 추가 단어 먼저, 그다음 학습한 단어
+    
+    학습 기록이 없으면 모든 단어가 대상입니다. 단어마다 한 번만 나옵니다.
+    """
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT w.id FROM words w
+        LEFT JOIN learning_history lh
+            ON lh.user_id = ? AND lh.content_type = 'word' AND lh.content_id = w.id
+        WHERE w.is_user_added = 1 OR lh.id IS NOT NULL
+        ORDER BY w.is_user_added DESC, w.id DESC
+    """, (user_id,))
+    ids = [row[0] for row in cursor.fetchall()]
+    
+    cursor.execute("""
+        SELECT EXISTS (SELECT 1 FROM learning_history WHERE user_id = ? AND content_type = 'word')
+    """, (user_id,))
+    has_history = cursor.fetchone()[0]
+    conn.close()
+    
+    if not has_history:
+        return list(get_word_store().ids)
+    return ids
+
+def generate_full_quiz(quiz_type='today', word_count=7, grammar_count=3, user_id=DEFAULT_USER_ID):
     """전체 퀴즈 생성 (단어 + 문법) - 사용자 추가 단어 우선"""
     if quiz_type == 'today':
-        words = get_today_words(10)
+        word_questions = generate_word_quiz(get_today_words(10, user_id), word_count)
     else:
-        # 사용자 추가 단어 우선으로 가져오기
-        user_words = get_user_added_words()
-        learned_words = get_learned_words()
-        
-        # 사용자 추가 단어를 앞에 배치
-        words = user_words.copy()
-        for w in learned_words:
-            if w['id'] not in [uw['id'] for uw in user_words]:
-                words.append(w)
+        # 복습 범위는 id 로만 고르고, 문제와 보기에 쓰인 단어만 WordStore 에서 읽음
+        # 복습할 때가 된 단어를 가장 밀린 것부터 먼저 출제
+        store = get_word_store()
+        rows = [row for row in map(store.row_of, get_review_pool(user_id)) if row is not None]
+        due = [store.row_of(item['content_id']) for item in get_due_items(word_count, user_id, 'word')]
+        due = [row for row in due if row is not None]
+        # 남는 자리의 일부는 예상 정답률이 목표에 가까운 단어로 (문항 난이도 / 실력 추정값 기준)
+        targeted = pick_targeted_items([store.ids[row] for row in rows], word_count // 3, 'word', user_id)
+        targeted = [row for row in map(store.row_of, targeted) if row not in due]
+        word_questions = _word_questions(rows, word_count, store.value, store.to_dict, first=due + targeted)
     
     grammars = get_all_grammars()
     
-    word_questions = generate_word_quiz(words, word_count)
-    grammar_questions = generate_grammar_quiz(grammars, grammar_count)
+    if quiz_type == 'today':
+        grammar_questions = generate_grammar_quiz(grammars, grammar_count)
+    else:
+        grammar_map = get_grammar_map()
+        targeted = pick_targeted_items(list(grammar_map), grammar_count // 2, 'grammar', user_id)
+        grammar_questions = generate_grammar_quiz(grammars, grammar_count, first=[grammar_map[i] for i in targeted])
     
     all_questions = word_questions + grammar_questions
     random.shuffle(all_questions)
     
     return all_questions
 
-def save_quiz_result(quiz_type, score, total, details=None):
-    """퀴즈 결과 저장"""
-    import json
-    conn = get_connection()
+def complete_quiz(session_token, quiz_type, score, total, details=None, user_id=DEFAULT_USER_ID):
+    """퀴즈 완료 기록 - 결과 저장과 오늘 출석의 퀴즈 횟수 증가를 한 트랜잭션으로
+    
+    같은 session_token 으로 다시 호출하면 아무것도 쓰지 않고 False 를 반환합니다.
+    (결과 화면이 다시 그려져도 한 번만 기록)
+    """
+    conn = get_user_connection(user_id)
     cursor = conn.cursor()
     
     cursor.execute("""
-        INSERT INTO quiz_results (quiz_type, score, total_questions, details)
-        VALUES (?, ?, ?, ?)
-    """, (quiz_type, score, total, json.dumps(details) if details else None))
+        INSERT INTO quiz_results (user_id, quiz_type, score, total_questions, details, session_token)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, session_token) WHERE session_token IS NOT NULL DO NOTHING
+    """, (user_id, quiz_type, score, total, json.dumps(details) if details else None, session_token))
+    inserted = cursor.rowcount == 1
+    
+    if inserted:
+        cursor.execute("""
+            INSERT INTO attendance (user_id, date, quiz_taken) VALUES (?, ?, 1)
+            ON CONFLICT (user_id, date) DO UPDATE SET quiz_taken = quiz_taken + 1
+        """, (user_id, date.today().isoformat()))
     
     conn.commit()
     conn.close()
+    return inserted
 
-def save_wrong_answer(question_type, content_type, content_id):
+UPSERT_WRONG_ANSWER_SQL = """
+    INSERT INTO wrong_answers (user_id, question_type, content_type, content_id, wrong_count)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (user_id, question_type, content_type, content_id) DO UPDATE
+    SET wrong_count = wrong_count + excluded.wrong_count,
+        last_wrong_at = CURRENT_TIMESTAMP, resolved = 0
+"""
+
+def save_wrong_answer(question_type, content_type, content_id, user_id=DEFAULT_USER_ID):
     """오답 기록 저장"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # 기존 오답 기록 확인
-    cursor.execute("""
-        SELECT id, wrong_count FROM wrong_answers
-        WHERE question_type = ? AND content_type = ? AND content_id = ?
-    """, (question_type, content_type, content_id))
-    
-    existing = cursor.fetchone()
+    save_wrong_answers([(question_type, content_type, content_id)], user_id)
+
+def save_wrong_answers(items, user_id=DEFAULT_USER_ID):
+    """여러 오답 기록 저장 - [(question_type, content_type, content_id), ...] 를 한 트랜잭션으로
     
-    if existing:
-        cursor.execute("""
-            UPDATE wrong_answers
-            SET wrong_count = wrong_count + 1, last_wrong_at = CURRENT_TIMESTAMP, resolved = 0
-            WHERE id = ?
-        """, (existing['id'],))
-    else:
-        cursor.execute("""
-            INSERT INTO wrong_answers (question_type, content_type, content_id)
-            VALUES (?, ?, ?)
-        """, (question_type, content_type, content_id))
+    같은 항목이 여러 번 있으면 틀린 횟수를 합산해 한 행으로 씁니다.
+    """
+    counts = Counter(items)
+    if not counts:
+        return
     
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.executemany(
+        UPSERT_WRONG_ANSWER_SQL,
+        [(user_id, qt, ct, cid, n) for (qt, ct, cid), n in counts.items()]
+    )
     conn.commit()
     conn.close()
 
-def get_wrong_answers():
+def get_wrong_answers(user_id=DEFAULT_USER_ID):
     """오답 노트 조회"""
-    conn = get_connection()
+    conn = get_user_connection(user_id)
     cursor = conn.cursor()
     
     # 단어 오답
@@ -294,9 +521,9 @@ def get_wrong_answers():
         SELECT wa.*, w.japanese, w.korean, w.hiragana, w.memo_tip
         FROM wrong_answers wa
         JOIN words w ON wa.content_id = w.id
-        WHERE wa.content_type = 'word' AND wa.resolved = 0
+        WHERE wa.user_id = ? AND wa.content_type = 'word' AND wa.resolved = 0
         ORDER BY wa.wrong_count DESC, wa.last_wrong_at DESC
-    """)
+    """, (user_id,))
     word_wrongs = [dict(row) for row in cursor.fetchall()]
     
     # 문법 오답
@@ -304,117 +531,56 @@ def get_wrong_answers():
         SELECT wa.*, g.pattern, g.meaning, g.explanation
         FROM wrong_answers wa
         JOIN grammars g ON wa.content_id = g.id
-        WHERE wa.content_type = 'grammar' AND wa.resolved = 0
+        WHERE wa.user_id = ? AND wa.content_type = 'grammar' AND wa.resolved = 0
         ORDER BY wa.wrong_count DESC, wa.last_wrong_at DESC
-    """)
+    """, (user_id,))
     grammar_wrongs = [dict(row) for row in cursor.fetchall()]
     
     conn.close()
     return {'words': word_wrongs, 'grammars': grammar_wrongs}
 
-def resolve_wrong_answer(wrong_id):
+def resolve_wrong_answer(wrong_id, user_id=DEFAULT_USER_ID):
     """오답 해결 표시"""
-    conn = get_connection()
+    conn = get_user_connection(user_id)
     cursor = conn.cursor()
-    cursor.execute("UPDATE wrong_answers SET resolved = 1 WHERE id = ?", (wrong_id,))
+    cursor.execute("UPDATE wrong_answers SET resolved = 1 WHERE id = ? AND user_id = ?", (wrong_id, user_id))
     conn.commit()
     conn.close()
 
-def get_statistics():
-    """학습 통계 조회"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # 총 학습 단어 수
-    cursor.execute("SELECT COUNT(DISTINCT content_id) FROM learning_history WHERE content_type = 'word'")
-    learned_words = cursor.fetchone()[0]
+def get_statistics(user_id=DEFAULT_USER_ID):
+    """학습 통계 조회 (쓰기 시점에 갱신되는 스냅샷 한 행 + 하루 단위로 캐시되는 연속 출석일)"""
+    snapshot = get_stats_snapshot(user_id)
+    scored = snapshot['scored_quiz_count'] or 0
     
-    # 총 단어 수
-    cursor.execute("SELECT COUNT(*) FROM words")
-    total_words = cursor.fetchone()[0]
-    
-    # 사용자 추가 단어 수
-    try:
-        cursor.execute("SELECT COUNT(*) FROM words WHERE is_user_added = 1")
-        user_added_words = cursor.fetchone()[0]
-    except:
-        user_added_words = 0
-    
-    # 퀴즈 통계
-    cursor.execute("""
-        SELECT 
-            COUNT(*) as total_quizzes,
-            AVG(score * 100.0 / total_questions) as avg_score,
-            MAX(score * 100.0 / total_questions) as best_score
-        FROM quiz_results
-    """)
-    quiz_stats = dict(cursor.fetchone())
-    
-    # 출석 통계
-    cursor.execute("""
-        SELECT COUNT(*) as total_days,
-               SUM(words_learned) as total_words_learned,
-               SUM(quiz_taken) as total_quizzes_taken
-        FROM attendance
-    """)
-    attendance_stats = dict(cursor.fetchone())
-    
-    # 연속 출석일 계산
-    cursor.execute("""
-        SELECT date FROM attendance ORDER BY date DESC
-    """)
-    dates = [row['date'] for row in cursor.fetchall()]
-    
-    streak = 0
-    if dates:
-        from datetime import datetime, timedelta
-        today = date.today()
-        for i, d in enumerate(dates):
-            expected_date = (today - timedelta(days=i)).isoformat()
-            if d == expected_date:
-                streak += 1
-            else:
-                break
-    
-    conn.close()
+    streaks = get_streaks(user_id, snapshot['study_days'] or 0)
     
     return {
-        'learned_words': learned_words,
-        'total_words': total_words,
-        'user_added_words': user_added_words,
-        'quiz_count': quiz_stats['total_quizzes'] or 0,
-        'avg_score': round(quiz_stats['avg_score'] or 0, 1),
-        'best_score': round(quiz_stats['best_score'] or 0, 1),
-        'total_study_days': attendance_stats['total_days'] or 0,
-        'streak': streak
+        'learned_words': snapshot['learned_words'] or 0,
+        'total_words': snapshot['total_words'] or 0,
+        'user_added_words': snapshot['user_added_words'] or 0,
+        'quiz_count': snapshot['quiz_count'] or 0,
+        'avg_score': round(snapshot['score_pct_sum'] / scored, 1) if scored else 0,
+        'best_score': round(snapshot['best_score'] or 0, 1),
+        'total_study_days': snapshot['study_days'] or 0,
+        'streak': streaks['current_streak'],
+        'streak_start': streaks['current_start'],
+        'longest_streak': streaks['longest_streak'],
+        'longest_streak_start': streaks['longest_start'],
+        'longest_streak_end': streaks['longest_end']
     }
 
-def get_recent_quiz_results(limit=10):
+def get_recent_quiz_results(limit=10, user_id=DEFAULT_USER_ID):
     """최근 퀴즈 결과"""
-    conn = get_connection()
+    conn = get_user_connection(user_id)
     cursor = conn.cursor()
     
     cursor.execute("""
         SELECT * FROM quiz_results
+        WHERE user_id = ?
         ORDER BY completed_at DESC
         LIMIT ?
-    """, (limit,))
+    """, (user_id, limit))
     
     results = [dict(row) for row in cursor.fetchall()]
     conn.close()
     return results
-
-def get_attendance_history(days=30):
-    """출석 기록"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM attendance
-        ORDER BY date DESC
-        LIMIT ?
-    """, (days,))
-    
-    records = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return records
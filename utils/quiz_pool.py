@@ -0,0 +1,150 @@
+import json
+import queue
+import threading
+from datetime import date
+
+from database.catalog import get_catalog_version
+from database.router import DEFAULT_USER_ID, get_user_connection
+from utils.quiz_generator import compact_quiz, generate_full_quiz
+
+# 퀴즈 종류별 (단어 문제 수, 문법 문제 수)
+QUIZ_SIZES = {
+    'today': (14, 6),
+    'all': (14, 6),
+}
+
+
+def _quiz_stamp(cursor, quiz_type, user_id):
+    """미리 만든 퀴즈가 아직 유효한지 판단하는 값
+
+    카탈로그 버전이 바뀌면 모든 퀴즈가, 학습 기록이 바뀌면 복습 퀴즈가 무효가 됩니다.
+    (오늘의 퀴즈는 날짜별로 정해진 단어만 쓰므로 학습 기록과 무관)
+    """
+    history = 0
+    if quiz_type != 'today':
+        cursor.execute("SELECT history_version FROM stats_snapshot WHERE user_id = ?", (user_id,))
+        row = cursor.fetchone()
+        history = row[0] if row else 0
+
+    word_count, grammar_count = QUIZ_SIZES[quiz_type]
+    return f"{get_catalog_version(cursor)}:{history}:{word_count}x{grammar_count}"
+
+
+def take_quiz(quiz_type, user_id=DEFAULT_USER_ID):
+    """퀴즈 받기 (compact_quiz 형식)
+
+    미리 만든 퀴즈가 유효하면 바로 넘겨주고, 없으면 지금 만든 뒤 다음 퀴즈를 예약합니다.
+    """
+    today = date.today().isoformat()
+
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    stamp = _quiz_stamp(cursor, quiz_type, user_id)
+    cursor.execute("""
+        DELETE FROM quiz_pool
+        WHERE user_id = ? AND quiz_type = ? AND quiz_date = ?
+        RETURNING stamp, questions
+    """, (user_id, quiz_type, today))
+    row = cursor.fetchone()
+    conn.commit()
+    conn.close()
+
+    # stamp 가 같으면 카탈로그가 그대로이므로 id 를 다시 확인하지 않음
+    questions = []
+    if row is not None and row['stamp'] == stamp:
+        questions = json.loads(row['questions'])
+    if not questions:
+        word_count, grammar_count = QUIZ_SIZES[quiz_type]
+        questions = compact_quiz(generate_full_quiz(quiz_type, word_count, grammar_count, user_id=user_id))
+
+    get_quiz_prefetcher().request(quiz_type, user_id)
+    return questions
+
+
+def prefetch_quiz(quiz_type, user_id=DEFAULT_USER_ID):
+    """다음 퀴즈를 만들어 보관 (이미 유효한 퀴즈가 있으면 그대로 둠)"""
+    today = date.today().isoformat()
+
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    stamp = _quiz_stamp(cursor, quiz_type, user_id)
+    cursor.execute("""
+        SELECT stamp FROM quiz_pool WHERE user_id = ? AND quiz_type = ? AND quiz_date = ?
+    """, (user_id, quiz_type, today))
+    row = cursor.fetchone()
+    conn.close()
+    if row is not None and row['stamp'] == stamp:
+        return False
+
+    # 만드는 동안 기록이 바뀌면 stamp 가 달라져 받을 때 무효 처리됨
+    word_count, grammar_count = QUIZ_SIZES[quiz_type]
+    questions = generate_full_quiz(quiz_type, word_count, grammar_count, user_id=user_id)
+    if not questions:
+        return False
+
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM quiz_pool WHERE user_id = ? AND quiz_date < ?", (user_id, today))
+    cursor.execute("""
+        INSERT INTO quiz_pool (user_id, quiz_type, quiz_date, stamp, questions)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, quiz_type, quiz_date) DO UPDATE
+        SET stamp = excluded.stamp, questions = excluded.questions, created_at = CURRENT_TIMESTAMP
+    """, (user_id, quiz_type, today, stamp,
+          json.dumps(compact_quiz(questions), separators=(',', ':'))))
+    conn.commit()
+    conn.close()
+    return True
+
+
+class QuizPrefetcher:
+    """퀴즈 미리 만들기 요청을 백그라운드 스레드에서 하나씩 처리 (같은 요청은 한 번만)"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.error_count = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="quiz-prefetcher", daemon=True)
+                self._thread.start()
+
+    def request(self, quiz_type, user_id=DEFAULT_USER_ID):
+        """다음 퀴즈 만들기 예약 (바로 반환)"""
+        key = (quiz_type, user_id)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._ensure_started()
+        self._queue.put(key)
+
+    def _run(self):
+        while True:
+            quiz_type, user_id = self._queue.get()
+            # 처리 중에 들어온 요청은 다시 예약되도록 먼저 대기 목록에서 뺌
+            with self._lock:
+                self._pending.discard((quiz_type, user_id))
+            try:
+                prefetch_quiz(quiz_type, user_id)
+            except Exception as e:
+                self.error_count += 1
+                print(f"❌ 퀴즈 미리 만들기 실패 ({quiz_type}, 학습자 {user_id}): {e}")
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_quiz_prefetcher():
+    """프로세스 공용 QuizPrefetcher 반환"""
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = QuizPrefetcher()
+    return _prefetcher
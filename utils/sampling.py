@@ -0,0 +1,80 @@
+import hashlib
+import random
+import unicodedata
+
+# Feistel 라운드 수 (4 라운드면 순서가 충분히 섞임)
+_ROUNDS = 4
+
+# 보기 하나당 무작위 추출 시도 횟수 (넘으면 순서대로 훑어서 채움)
+REJECTION_TRIES = 8
+
+
+def _round_value(key, round_no, value, bits):
+    digest = hashlib.blake2b(f"{round_no}:{value}".encode(), key=key, digest_size=8).digest()
+    return int.from_bytes(digest, 'big') & ((1 << bits) - 1)
+
+
+def _permute(i, key, half_bits):
+    mask = (1 << half_bits) - 1
+    left, right = i >> half_bits, i & mask
+    for r in range(_ROUNDS):
+        left, right = right, left ^ _round_value(key, r, right, half_bits)
+    return (left << half_bits) | right
+
+
+def keyed_permutation(n, seed):
+    """0..n-1 을 seed 로 정해지는 순서로 하나씩 돌려주는 제너레이터
+
+    정렬하거나 전체를 섞지 않고 i 번째 값을 바로 계산하므로(Feistel + cycle walking),
+    앞의 k 개만 필요하면 O(k) 입니다. 같은 seed 면 항상 같은 순서입니다.
+    """
+    if n <= 0:
+        return
+    key = hashlib.blake2b(str(seed).encode(), digest_size=16).digest()
+    half_bits = max(1, ((n - 1).bit_length() + 1) // 2)
+
+    for i in range(n):
+        # 2^(2*half_bits) 범위의 순열에서 n 이상인 값은 다시 섞어 n 안으로 들어올 때까지 반복
+        x = _permute(i, key, half_bits)
+        while x >= n:
+            x = _permute(x, key, half_bits)
+        yield x
+
+
+def normalize_option(text):
+    """보기 비교용 문자열 - 전각/반각, 대소문자, 공백 차이를 무시"""
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return ' '.join(text.split())
+
+
+def sample_distinct(pool, key, exclude=(), k=3, rng=random):
+    """pool 에서 key(항목) 의 정규화 값이 서로 다르고 exclude 에도 없는 항목 k 개
+
+    무작위 위치를 뽑아 겹치면 버리는 rejection sampling 이라 비용이 pool 크기가 아닌
+    k 에 비례합니다. 같은 값이 많아 시도 횟수를 넘기면 임의 위치부터 한 바퀴 훑어 채우며,
+    서로 다른 값이 부족하면 k 개보다 적게 돌려줍니다.
+    """
+    seen = {normalize_option(text) for text in exclude}
+    picked = []
+    n = len(pool)
+    if n == 0:
+        return picked
+
+    def take(item):
+        text = normalize_option(key(item))
+        if text in seen:
+            return
+        seen.add(text)
+        picked.append(item)
+
+    for _ in range(k * REJECTION_TRIES):
+        if len(picked) >= k:
+            return picked
+        take(pool[rng.randrange(n)])
+
+    start = rng.randrange(n)
+    for j in range(n):
+        if len(picked) >= k:
+            break
+        take(pool[(start + j) % n])
+    return picked
@@ -0,0 +1,147 @@
+import re
+
+from database.catalog import cached_catalog
+from database.connection import get_connection
+from utils.kana_index import KanaIndex
+from utils.quiz_generator import get_word_store
+
+# trigram 색인은 3글자 이상부터 사용할 수 있음
+MIN_FTS_LENGTH = 3
+
+
+def _fts_phrase(query):
+    """검색어를 FTS5 구문 검색 문자열로 (따옴표 이스케이프)"""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _like_pattern(query):
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+_HANGUL = re.compile(r'[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3]')
+
+
+def get_kana_index():
+    """가나 정규화 n-gram 색인 (카탈로그 버전이 바뀔 때만 다시 만듦)"""
+    return cached_catalog('kana_index', lambda: KanaIndex(get_word_store()))
+
+
+def search_words(query, limit=20, offset=0, user_added=None, backend='auto'):
+    """단어 검색 - (결과 단어 dict 리스트, 전체 결과 수)
+
+    backend 는 'fts' (FTS5 부분 문자열), 'kana' (가나 정규화 n-gram) 또는 'auto' 입니다.
+    'auto' 는 한글이 없는 검색어를 먼저 kana 로 찾고, 한글이 있거나 결과가 없으면 fts 로 찾습니다.
+    user_added 를 주면 해당 단어만 찾습니다.
+    """
+    query = query.strip()
+    if not query:
+        return [], 0
+
+    if backend == 'auto':
+        if not _HANGUL.search(query):
+            words, total = _search_words_kana(query, limit, offset, user_added)
+            if total:
+                return words, total
+        backend = 'fts'
+    return WORD_SEARCH_BACKENDS[backend](query, limit, offset, user_added)
+
+
+def _search_words_kana(query, limit, offset, user_added):
+    """가나/로마자 검색 - 가타카나·히라가나, 전각·반각, 장음 표기 차이를 무시"""
+    index = get_kana_index()
+    store = index.store
+
+    rows = index.lookup(query)
+    if user_added is not None:
+        rows = [r for r in rows if store.is_user_added(r) == bool(user_added)]
+
+    return store.to_dicts(rows[offset:offset + limit]), len(rows)
+
+
+def _search_words_fts(query, limit, offset, user_added):
+    """FTS5 검색 - 일본어/히라가나/한자/한국어 뜻에서 부분 문자열을 찾고,
+    정확히 일치하는 단어를 먼저, 그다음 bm25 점수 순으로 정렬"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    user_filter = '' if user_added is None else 'AND w.is_user_added = :user_added'
+
+    exact = 'w.japanese = :q OR w.hiragana = :q OR w.kanji = :q OR w.korean = :q'
+
+    if len(query) >= MIN_FTS_LENGTH:
+        base = f'''
+            FROM words_fts f JOIN words w ON w.id = f.rowid
+            WHERE words_fts MATCH :match {user_filter}
+        '''
+        order = f"ORDER BY ({exact}) DESC, bm25(words_fts)"
+    else:
+        # 짧은 검색어는 색인을 쓸 수 없어 LIKE 로 찾음
+        base = f'''
+            FROM words w
+            WHERE (w.japanese LIKE :like ESCAPE '\\' OR w.hiragana LIKE :like ESCAPE '\\'
+                   OR w.kanji LIKE :like ESCAPE '\\' OR w.korean LIKE :like ESCAPE '\\')
+                  {user_filter}
+        '''
+        order = f"ORDER BY ({exact}) DESC, length(w.japanese), w.id"
+
+    params = {
+        'q': query,
+        'match': _fts_phrase(query),
+        'like': _like_pattern(query),
+        'user_added': 1 if user_added else 0,
+    }
+
+    cursor.execute(f"SELECT COUNT(*) {base}", params)
+    total = cursor.fetchone()[0]
+
+    cursor.execute(f"SELECT w.id {base} {order} LIMIT :limit OFFSET :offset",
+                   dict(params, limit=limit, offset=offset))
+    ids = [row[0] for row in cursor.fetchall()]
+    conn.close()
+
+    return get_word_store().get_many(ids), total
+
+
+WORD_SEARCH_BACKENDS = {
+    'fts': _search_words_fts,
+    'kana': _search_words_kana,
+}
+
+
+def search_grammars(query, limit=20, offset=0):
+    """문법 검색 - (결과 문법 dict 리스트, 전체 결과 수)"""
+    query = query.strip()
+    if not query:
+        return [], 0
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    exact = 'g.pattern = :q OR g.meaning = :q'
+
+    if len(query) >= MIN_FTS_LENGTH:
+        base = '''
+            FROM grammars_fts f JOIN grammars g ON g.id = f.rowid
+            WHERE grammars_fts MATCH :match
+        '''
+        order = f"ORDER BY ({exact}) DESC, bm25(grammars_fts)"
+    else:
+        base = '''
+            FROM grammars g
+            WHERE g.pattern LIKE :like ESCAPE '\\' OR g.meaning LIKE :like ESCAPE '\\'
+                  OR g.explanation LIKE :like ESCAPE '\\'
+        '''
+        order = f"ORDER BY ({exact}) DESC, g.id"
+
+    params = {'q': query, 'match': _fts_phrase(query), 'like': _like_pattern(query)}
+
+    cursor.execute(f"SELECT COUNT(*) {base}", params)
+    total = cursor.fetchone()[0]
+
+    cursor.execute(f"SELECT g.* {base} {order} LIMIT :limit OFFSET :offset",
+                   dict(params, limit=limit, offset=offset))
+    grammars = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+
+    return grammars, total
@@ -0,0 +1,104 @@
+from datetime import date, timedelta
+
+from database.router import DEFAULT_USER_ID, get_user_connection
+
+# SM-2 복습 일정
+#   quality 0~5 (3 이상이면 기억한 것), ease 는 1.3 이상
+#   mastery_level 은 연속으로 맞힌 횟수 (MAX_MASTERY 에서 멈춤)
+MIN_EASE = 1.3
+MAX_MASTERY = 5
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+
+def next_schedule(ease, interval, repetitions, quality):
+    """SM-2 한 단계 - (새 ease, 다음 간격(일), 연속 정답 횟수)"""
+    if quality < 3:
+        repetitions = 0
+        interval = 1
+    else:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = max(1, round(interval * ease))
+        repetitions += 1
+
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return ease, interval, repetitions
+
+
+def record_reviews(items, user_id=DEFAULT_USER_ID, today=None):
+    """퀴즈 결과로 복습 일정 갱신 - [(content_type, content_id, 정답 여부), ...]
+
+    학습 기록이 있는 항목만 일정을 잡으며, 같은 항목이 여러 번 있으면 순서대로 반영합니다.
+    """
+    if not items:
+        return 0
+    today = today or date.today()
+
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    states = {}
+    for content_type, content_id, correct in items:
+        key = (content_type, content_id)
+        if key not in states:
+            cursor.execute("""
+                SELECT ease_factor, interval_days, mastery_level, review_count
+                FROM learning_history
+                WHERE user_id = ? AND content_type = ? AND content_id = ?
+            """, (user_id, content_type, content_id))
+            row = cursor.fetchone()
+            states[key] = None if row is None else [
+                row['ease_factor'], row['interval_days'], row['mastery_level'] or 0, row['review_count'] or 0
+            ]
+
+        state = states[key]
+        if state is None:
+            continue
+        quality = QUALITY_CORRECT if correct else QUALITY_WRONG
+        ease, interval, repetitions = next_schedule(state[0], state[1], state[2], quality)
+        states[key] = [ease, interval, min(repetitions, MAX_MASTERY), state[3] + 1]
+
+    updates = []
+    for (content_type, content_id), state in states.items():
+        if state is None:
+            continue
+        ease, interval, mastery, reviews = state
+        next_review = (today + timedelta(days=interval)).isoformat()
+        updates.append((ease, interval, next_review, mastery, reviews, user_id, content_type, content_id))
+    cursor.executemany("""
+        UPDATE learning_history
+        SET ease_factor = ?, interval_days = ?, next_review = ?, mastery_level = ?, review_count = ?
+        WHERE user_id = ? AND content_type = ? AND content_id = ?
+    """, updates)
+
+    conn.commit()
+    conn.close()
+    return len(updates)
+
+
+def get_due_items(n=10, user_id=DEFAULT_USER_ID, content_type=None, today=None):
+    """복습할 때가 된 항목 - 가장 오래 밀린 것부터, 같은 날이면 숙련도가 낮은 것부터
+
+    (user_id, next_review, mastery_level) 인덱스 범위를 앞에서부터 n 개만 읽습니다.
+    """
+    today = (today or date.today()).isoformat()
+    type_filter = '' if content_type is None else 'AND content_type = ?'
+    params = [user_id, today] + ([] if content_type is None else [content_type]) + [n]
+
+    conn = get_user_connection(user_id)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT content_type, content_id, next_review, mastery_level
+        FROM learning_history
+        WHERE user_id = ? AND next_review <= ? {type_filter}
+        ORDER BY next_review, mastery_level
+        LIMIT ?
+    """, params)
+    items = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return items
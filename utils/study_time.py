@@ -0,0 +1,119 @@
+import atexit
+import threading
+import time
+from datetime import date
+
+from utils.answer_queue import get_answer_writer
+
+# 세션 신호(화면이 다시 그려질 때마다) 사이 간격이 이보다 길면 자리를 비운 것으로 보고 세지 않음 (초)
+IDLE_GAP_SECONDS = 600
+# 학습자별로 이만큼 모이면 한 번에 기록 (초) - 나머지는 다음 기록으로 넘어감
+FLUSH_SECONDS = 300
+
+
+class StudyClock:
+    """세션 신호로 학습 시간을 재고, 학습자/날짜별로 모아 분 단위로 기록 요청
+
+    기록은 AnswerWriter 의 'study_time' 이벤트로 넘기므로 신호마다 DB 에 쓰지 않습니다.
+    idle_gap 보다 오래 신호가 없는 세션은 (창을 닫은 세션 포함) 다음 신호 때 정리하며,
+    그때 남은 세션이 없는 학습자와 지난 날짜의 모아 둔 시간은 flush_seconds 를 기다리지 않고 기록합니다.
+    """
+
+    def __init__(self, idle_gap=IDLE_GAP_SECONDS, flush_seconds=FLUSH_SECONDS):
+        self._idle_gap = idle_gap
+        self._flush_seconds = flush_seconds
+        self._last_beat = {}   # {세션: (마지막 신호 시각, user_id)}
+        self._pending = {}
+        self._next_sweep = None
+        self._lock = threading.Lock()
+
+    def beat(self, session_id, user_id, now=None, today=None):
+        """세션 신호 - 같은 세션의 직전 신호 이후 시간을 학습자의 오늘 학습 시간에 더함"""
+        now = time.monotonic() if now is None else now
+        today = (today or date.today()).isoformat()
+
+        minutes = 0
+        with self._lock:
+            events = self._sweep(now, today)
+            last = self._last_beat.get(session_id)
+            self._last_beat[session_id] = (now, user_id)
+            if last is not None and now - last[0] <= self._idle_gap:
+                key = (user_id, today)
+                seconds = self._pending.get(key, 0.0) + (now - last[0])
+                minutes = int(seconds // 60) if seconds >= self._flush_seconds else 0
+                self._pending[key] = seconds - minutes * 60
+                if minutes:
+                    events.append((user_id, today, minutes))
+
+        if events:
+            writer = get_answer_writer()
+            for event in events:
+                writer.submit('study_time', event)
+        return minutes
+
+    def _sweep(self, now, today):
+        """idle_gap 보다 오래된 세션 신호 삭제 (idle_gap 마다 한 번, _lock 안에서 호출)
+
+        그런 세션은 다음 신호가 와도 시간을 더하지 않으므로 지워도 결과가 같습니다.
+        남은 세션이 없는 학습자와 지난 날짜의 모아 둔 시간은 분 단위로 반올림해
+        기록할 (user_id, 날짜, 분) 리스트로 돌려줍니다. (프로세스가 죽어도 짧은 세션이 남도록)
+        """
+        if self._next_sweep is not None and now < self._next_sweep:
+            return []
+        self._next_sweep = now + self._idle_gap
+        stale = [sid for sid, (last, _) in self._last_beat.items() if now - last > self._idle_gap]
+        for sid in stale:
+            del self._last_beat[sid]
+
+        active = {user_id for _, user_id in self._last_beat.values()}
+        events = []
+        for (user_id, day), seconds in list(self._pending.items()):
+            if user_id in active and day == today:
+                continue
+            del self._pending[(user_id, day)]
+            minutes = round(seconds / 60)
+            if minutes:
+                events.append((user_id, day, minutes))
+        return events
+
+    def session_count(self):
+        """신호를 기억하고 있는 세션 수"""
+        with self._lock:
+            return len(self._last_beat)
+
+    def flush(self):
+        """모아 둔 학습 시간 중 1분 이상인 것을 모두 기록 요청 (1분 미만은 남겨 둠)"""
+        today = date.today().isoformat()
+        with self._lock:
+            events = []
+            for (user_id, day), seconds in list(self._pending.items()):
+                minutes = int(seconds // 60)
+                if minutes:
+                    events.append((user_id, day, minutes))
+                    self._pending[(user_id, day)] = seconds - minutes * 60
+                # 지난 날짜의 1분 미만 나머지는 버림
+                if day != today:
+                    del self._pending[(user_id, day)]
+
+        writer = get_answer_writer()
+        for event in events:
+            writer.submit('study_time', event)
+        return len(events)
+
+
+_clock = None
+_clock_lock = threading.Lock()
+
+
+def get_study_clock():
+    """프로세스 공용 StudyClock 반환"""
+    global _clock
+    if _clock is None:
+        with _clock_lock:
+            if _clock is None:
+                # atexit 은 역순으로 실행되므로 AnswerWriter 를 먼저 만들어 두어야
+                # 남은 학습 시간이 writer 종료 전에 넘어감
+                get_answer_writer()
+                _clock = StudyClock()
+                atexit.register(_clock.flush)
+    return _clock
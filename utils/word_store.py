@@ -0,0 +1,125 @@
+import sys
+from array import array
+
+WORD_COLUMNS = ('japanese', 'hiragana', 'kanji', 'korean', 'level', 'category',
+                'example_sentence', 'example_korean', 'memo_tip')
+
+# 값 종류가 적어 intern 해두는 컬럼
+_INTERNED = ('level', 'category')
+
+
+class WordStore:
+    """단어 카탈로그를 컬럼 단위로 보관하는 읽기 전용 저장소
+
+    행은 '사용자 추가 단어 우선, 최신 id 우선' 순서이며 row 번호로 접근합니다.
+    id → row, category → rows, level → rows 색인과 사용자 추가 비트맵을 미리 만들어 두고,
+    dict 는 화면에 보여줄 행만 필요할 때 만듭니다.
+    """
+
+    __slots__ = ('ids', 'columns', 'user_added', '_row_of', '_by_category', '_by_level')
+
+    def __init__(self, rows):
+        rows = sorted(rows, key=lambda r: (-(r['is_user_added'] or 0), -r['id']))
+
+        self.ids = array('q', (r['id'] for r in rows))
+        self.columns = {}
+        for col in WORD_COLUMNS:
+            if col in _INTERNED:
+                self.columns[col] = [sys.intern(r[col]) if r[col] else r[col] for r in rows]
+            else:
+                self.columns[col] = [r[col] for r in rows]
+
+        # 사용자 추가 여부 비트맵 (row 번호 = 비트 위치)
+        self.user_added = 0
+        for i, r in enumerate(rows):
+            if r['is_user_added']:
+                self.user_added |= 1 << i
+
+        self._row_of = {word_id: i for i, word_id in enumerate(self.ids)}
+        self._by_category = self._build_index('category')
+        self._by_level = self._build_index('level')
+
+    def _build_index(self, col):
+        index = {}
+        for i, value in enumerate(self.columns[col]):
+            index.setdefault(value, array('I')).append(i)
+        return index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, word_id):
+        return word_id in self._row_of
+
+    def row_of(self, word_id):
+        """id 에 해당하는 row 번호 (없으면 None)"""
+        return self._row_of.get(word_id)
+
+    def is_user_added(self, row):
+        return bool(self.user_added >> row & 1)
+
+    def value(self, row, col):
+        return self.columns[col][row]
+
+    def categories(self):
+        """카테고리 목록 (빈 값 제외, 정렬)"""
+        return sorted(c for c in self._by_category if c)
+
+    def levels(self):
+        return sorted(l for l in self._by_level if l)
+
+    def user_added_rows(self):
+        """사용자 추가 단어의 row 번호 (row 순서)"""
+        mask = self.user_added
+        rows = []
+        while mask:
+            low = mask & -mask
+            rows.append(low.bit_length() - 1)
+            mask ^= low
+        return rows
+
+    def count_user_added(self):
+        return bin(self.user_added).count('1')
+
+    def filter_rows(self, category=None, level=None, user_added=None):
+        """조건에 맞는 row 번호 (row 순서) - 가장 작은 색인에서 출발해 나머지 조건만 확인"""
+        candidates = []
+        if category is not None:
+            candidates.append(self._by_category.get(category, ()))
+        if level is not None:
+            candidates.append(self._by_level.get(level, ()))
+
+        if candidates:
+            rows = min(candidates, key=len)
+        else:
+            rows = range(len(self.ids))
+
+        categories = self.columns['category']
+        levels = self.columns['level']
+        return [
+            i for i in rows
+            if (category is None or categories[i] == category)
+            and (level is None or levels[i] == level)
+            and (user_added is None or self.is_user_added(i) == user_added)
+        ]
+
+    def to_dict(self, row):
+        """row 하나를 단어 dict 로 만들기"""
+        word = {'id': self.ids[row]}
+        for col in WORD_COLUMNS:
+            word[col] = self.columns[col][row]
+        word['is_user_added'] = 1 if self.is_user_added(row) else 0
+        return word
+
+    def to_dicts(self, rows):
+        return [self.to_dict(i) for i in rows]
+
+    def get(self, word_id):
+        """id 로 단어 dict 조회 (없으면 None)"""
+        row = self._row_of.get(word_id)
+        return None if row is None else self.to_dict(row)
+
+    def get_many(self, word_ids):
+        """여러 id 의 단어 dict (주어진 순서, 없는 id 는 건너뜀)"""
+        rows = (self._row_of.get(word_id) for word_id in word_ids)
+        return [self.to_dict(i) for i in rows if i is not None]